@@ -0,0 +1,227 @@
+"""
+Account State - cached balances for every asset, kept current by the user data stream.
+Seeded once from get_account, then updated from outboundAccountPosition and
+balanceUpdate events; executionReport events are handed to order listeners
+(see add_order_listener). A background thread keeps the listenKey alive and
+re-syncs from REST periodically in case an event was missed.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+from csv_logger import logger
+from rate_limiter import api_priority, Priority
+from ws_stream import StreamWorker
+
+
+class AssetBalance:
+    """Free and locked amount of one asset."""
+
+    __slots__ = ('free', 'locked')
+
+    def __init__(self, free: float = 0.0, locked: float = 0.0):
+        self.free = free
+        self.locked = locked
+
+
+class AccountState(StreamWorker):
+    """All-asset balance cache driven by the Binance user data stream."""
+
+    def __init__(self, resync_seconds: int = 300, keepalive_seconds: int = 1800):
+        """
+        Initialize an empty account state.
+
+        Args:
+            resync_seconds: Re-seed balances from REST every N seconds
+            keepalive_seconds: Refresh the listenKey every N seconds (expires after 60 min)
+        """
+        super().__init__("User data stream")
+        self.resync_seconds = resync_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self._lock = threading.Lock()
+        self._balances: Dict[str, AssetBalance] = {}
+        self._synced_at = 0.0  # monotonic time of the last REST seed
+        self._client = None
+        self._listen_key: Optional[str] = None
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._order_listeners: List[Callable[[Dict], None]] = []
+
+        self.events = 0
+        self.resyncs = 0
+        self.keepalives = 0
+
+    # ----- seeding -----
+
+    def seed(self, account: Dict):
+        """
+        Replace all balances with a get_account response.
+
+        Args:
+            account: Response of client.get_account()
+        """
+        balances = {
+            b['asset']: AssetBalance(float(b['free']), float(b['locked']))
+            for b in account.get('balances', [])
+        }
+        with self._lock:
+            self._balances = balances
+            self._synced_at = time.monotonic()
+            self.resyncs += 1
+
+    def resync(self) -> bool:
+        """Re-seed balances from REST. Returns True on success."""
+        if self._client is None:
+            return False
+        account = self._client.get_account()
+        if account is None:
+            return False
+        self.seed(account)
+        return True
+
+    # ----- stream -----
+
+    def start(self, client):
+        """
+        Seed from REST, open the user data stream and start maintenance.
+
+        Args:
+            client: BinanceAPIClient used for get_account and listenKey calls
+        """
+        if self.running:
+            return
+        self._client = client
+        self.resync()
+        super().start()
+
+        self._maintenance_thread = threading.Thread(target=self._maintenance_loop, daemon=True)
+        self._maintenance_thread.start()
+
+    def stop(self):
+        """Stop the stream and maintenance thread."""
+        super().stop()
+        if self._maintenance_thread:
+            self._maintenance_thread.join(timeout=5)
+
+    async def get_url(self) -> str:
+        """Fetch the listenKey (REST, off the event loop) and build the stream URL."""
+        self._listen_key = await asyncio.to_thread(self._client.get_listen_key)
+        if not self._listen_key:
+            raise ConnectionError("Could not obtain listenKey")
+        base = Config.BINANCE_TESTNET_WS if Config.USE_TESTNET else Config.BINANCE_LIVE_WS
+        return f"{base}/ws/{self._listen_key}"
+
+    async def on_open(self):
+        """Events may have been missed while disconnected - resync without blocking the loop."""
+        if self.connects > 1:
+            await asyncio.get_running_loop().run_in_executor(None, self.resync)
+
+    def on_message(self, message: Dict):
+        """Apply outboundAccountPosition / balanceUpdate events."""
+        event = message.get('e')
+        if event == 'outboundAccountPosition':
+            with self._lock:
+                for b in message.get('B', []):
+                    self._balances[b['a']] = AssetBalance(float(b['f']), float(b['l']))
+            self.events += 1
+        elif event == 'balanceUpdate':
+            with self._lock:
+                balance = self._balances.setdefault(message['a'], AssetBalance())
+                balance.free += float(message['d'])
+            self.events += 1
+        elif event == 'executionReport':
+            for listener in self._order_listeners:
+                try:
+                    listener(message)
+                except Exception as e:
+                    logger.log_error(f"Order listener error for {message.get('s')}: {e}")
+        elif event == 'listenKeyExpired':
+            logger.log_info("listenKey expired - reconnecting user data stream")
+            if self._ws is not None:
+                asyncio.get_running_loop().create_task(self._ws.close())
+
+    def add_order_listener(self, callback: Callable[[Dict], None]):
+        """
+        Call callback(event) for every executionReport event. Callbacks run on the
+        stream's event loop and must not block.
+        """
+        if callback not in self._order_listeners:
+            self._order_listeners = self._order_listeners + [callback]
+
+    def remove_order_listener(self, callback: Callable[[Dict], None]):
+        """Stop delivering executionReport events to callback."""
+        self._order_listeners = [cb for cb in self._order_listeners if cb != callback]
+
+    def _maintenance_loop(self):
+        """Keep the listenKey alive and resync periodically - runs in background thread."""
+        last_keepalive = last_resync = time.monotonic()
+        with api_priority(Priority.POLL):
+            while self.running:
+                now = time.monotonic()
+                if self._listen_key and now - last_keepalive >= self.keepalive_seconds:
+                    if self._client.keepalive_listen_key(self._listen_key):
+                        self.keepalives += 1
+                    last_keepalive = now
+                if now - last_resync >= self.resync_seconds:
+                    self.resync()
+                    last_resync = now
+                time.sleep(1)
+
+    # ----- reads -----
+
+    def is_live(self) -> bool:
+        """True if balances are seeded and either streamed or recently resynced."""
+        if not self._synced_at:
+            return False
+        return self.connected or time.monotonic() - self._synced_at < self.resync_seconds
+
+    def get_free(self, asset: str) -> Optional[float]:
+        """
+        Get cached free balance for an asset.
+
+        Returns:
+            Free balance (0.0 if the account doesn't hold it), or None if the cache isn't live
+        """
+        if not self.is_live():
+            return None
+        with self._lock:
+            balance = self._balances.get(asset)
+            return balance.free if balance else 0.0
+
+    def get_balances(self) -> Dict[str, Dict[str, float]]:
+        """All non-zero balances as {asset: {'free': x, 'locked': y}}."""
+        with self._lock:
+            return {
+                asset: {'free': b.free, 'locked': b.locked}
+                for asset, b in self._balances.items()
+                if b.free or b.locked
+            }
+
+    def get_status(self) -> Dict:
+        """
+        Get account state counters for monitoring.
+
+        Returns:
+            Dictionary with stream state, asset count and event/resync counters
+        """
+        with self._lock:
+            assets = len(self._balances)
+            age = time.monotonic() - self._synced_at if self._synced_at else None
+        return {
+            'connected': self.connected,
+            'live': self.is_live(),
+            'assets': assets,
+            'last_resync_seconds_ago': round(age, 1) if age is not None else None,
+            'events': self.events,
+            'resyncs': self.resyncs,
+            'keepalives': self.keepalives,
+        }
+
+
+# Global account state instance
+account_state = AccountState(
+    resync_seconds=Config.ACCOUNT_RESYNC_SECONDS,
+    keepalive_seconds=Config.LISTEN_KEY_KEEPALIVE_SECONDS
+)
@@ -12,6 +12,7 @@ IMPORTANT: This bot does NOT guarantee profits. Trading is risky.
 Always start with testnet and small position sizes.
 """
 
+import asyncio
 from fastapi import FastAPI, Request, HTTPException, status
 from pydantic import BaseModel, Field, validator
 from typing import Optional, Dict, Any
@@ -21,9 +22,18 @@ import hashlib
 from config import Config, validate_config
 from csv_logger import logger
 from risk import risk_engine
-from binance_client import initialize_binance_client, get_binance_client
+from binance_client import initialize_binance_client, get_binance_client, size_buy_quantity
+from async_binance_client import (
+    initialize_async_binance_client, get_async_binance_client, close_async_binance_client
+)
+from pretrade import PreTradeContext, build_pretrade_context
 from positions import position_manager
 from exit_manager import exit_manager
+from brackets import bracket_manager
+from symbol_cache import symbol_cache
+from price_book import price_book
+from account_state import account_state
+from rate_limiter import rate_limiter
 
 
 # ============= DATA MODELS =============
@@ -89,9 +99,31 @@ async def startup_event():
             logger.log_warning(f"Binance connection failed: {str(e)}")
             logger.log_info("Continuing in webhook-only mode")
         
-        # Start exit manager (automatic stop-loss and take-profit)
+        # Async client for the request path (sync client stays with background threads)
+        await initialize_async_binance_client()
+        
+        # Seed balances once, then keep them current from the user data stream
+        binance = get_binance_client()
+        if Config.USE_USER_DATA_STREAM and binance is not None:
+            account_state.start(binance)
+        
+        # Release unfilled orders from the open-trade count as they fill or end
+        account_state.add_order_listener(risk_engine.on_execution_report)
+        
+        # Stream prices for symbols we already hold (new symbols subscribe on first lookup)
+        if Config.USE_PRICE_STREAM:
+            price_book.subscribe(p.symbol for p in position_manager.get_open_positions())
+            price_book.start()
+        
+        # Write position price updates behind the hot path
+        position_manager.start()
+        
+        # Start exit manager (automatic stop-loss and take-profit) as a task on this loop
         exit_manager.start()
         
+        # Track exchange-side OCO brackets (and protect open positions when enabled)
+        bracket_manager.start()
+        
         # Try to log startup info if client available
         try:
             binance = get_binance_client()
@@ -118,7 +150,14 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean shutdown."""
-    exit_manager.stop()
+    await exit_manager.stop()
+    await bracket_manager.stop()
+    account_state.remove_order_listener(risk_engine.on_execution_report)
+    position_manager.close()
+    symbol_cache.stop()
+    price_book.stop()
+    account_state.stop()
+    await close_async_binance_client()
     logger.log_info("Bot shutting down")
 
 
@@ -131,8 +170,8 @@ async def health_check():
     Use this to verify the bot is running and responsive.
     """
     try:
-        binance = get_binance_client()
-        balance = binance.get_account_balance("USDT")
+        binance = get_async_binance_client()
+        balance = await binance.get_account_balance("USDT")
         risk_status = risk_engine.get_status()
         
         return {
@@ -187,18 +226,40 @@ async def receive_signal(request: Request):
                 detail=f"Invalid payload: {e}"
             )
         
-        # Get current account state
-        binance = get_binance_client()
-        balance = binance.get_account_balance("USDT")
-        
-        # Check all risk constraints
-        allowed, reason = risk_engine.check_all_constraints(
+        # Rules that need no exchange data first - a rejected signal costs no lookups
+        allowed, reason = risk_engine.check_signal_constraints(
             symbol=payload.symbol,
             action=payload.side,
-            confidence=payload.confidence,
-            account_balance=balance
+            confidence=payload.confidence
         )
         
+        reservation = None
+        if allowed:
+            # Fetch balance, price and symbol filters concurrently - one snapshot per signal
+            binance = get_async_binance_client()
+            context = await build_pretrade_context(binance, payload.symbol, payload.side)
+            balance = context.balance
+            
+            # Calculate position size based on risk mode (the notional limits check it)
+            if Config.USE_PERCENTAGE_RISK:
+                # Auto-reinvestment: Use percentage of current balance
+                trade_amount = balance * Config.RISK_PERCENTAGE
+                # Ensure minimum notional ($5 for BTCUSDT)
+                trade_amount = max(trade_amount, 5.0)
+            else:
+                # Fixed risk mode
+                trade_amount = Config.MAX_RISK_PER_TRADE
+            
+            # Re-run every rule and reserve the trade in one step, so a concurrent
+            # signal sees it while the order is in flight (released below)
+            allowed, reason, reservation = risk_engine.admit(
+                symbol=payload.symbol,
+                action=payload.side,
+                confidence=payload.confidence,
+                account_balance=balance,
+                notional=trade_amount
+            )
+        
         # Log signal decision
         logger.log_signal(
             symbol=payload.symbol,
@@ -220,29 +281,21 @@ async def receive_signal(request: Request):
         
         # ============= EXECUTE TRADE =============
         try:
-            # Calculate position size based on risk mode
             if Config.USE_PERCENTAGE_RISK:
-                # Auto-reinvestment: Use percentage of current balance
-                trade_amount = balance * Config.RISK_PERCENTAGE
-                # Ensure minimum notional ($5 for BTCUSDT)
-                trade_amount = max(trade_amount, 5.0)
                 logger.log_info(f"Auto-reinvest mode: ${trade_amount:.2f} ({Config.RISK_PERCENTAGE*100:.0f}% of ${balance:.2f})")
             else:
-                # Fixed risk mode
-                trade_amount = Config.MAX_RISK_PER_TRADE
                 logger.log_info(f"Fixed risk mode: ${trade_amount:.2f}")
             
-            execution_result = execute_trade(
-                symbol=payload.symbol,
-                action=payload.side,
+            execution_result = await execute_trade(
+                context=context,
                 strategy=payload.strategy,
                 confidence=payload.confidence,
                 usdt_amount=trade_amount
             )
             
             if execution_result['success']:
-                # Record for cooldown tracking
-                risk_engine.record_signal(payload.symbol, payload.side)
+                # Record for cooldown tracking (state file write runs off the event loop)
+                await asyncio.to_thread(risk_engine.record_signal, payload.symbol, payload.side)
                 
                 return WebhookResponse(
                     success=True,
@@ -267,6 +320,9 @@ async def receive_signal(request: Request):
                 decision="REJECTED",
                 reason=str(e)
             )
+        finally:
+            # The trade is recorded (or abandoned) - it no longer needs holding
+            risk_engine.release(reservation)
     
     except HTTPException:
         # Re-raise HTTP exceptions (like 401 unauthorized)
@@ -283,14 +339,21 @@ async def receive_signal(request: Request):
 async def get_status():
     """Get current bot status and risk metrics."""
     try:
-        binance = get_binance_client()
-        balance = binance.get_account_balance("USDT")
+        binance = get_async_binance_client()
+        balance = await binance.get_account_balance("USDT")
         risk_status = risk_engine.get_status()
         
         return {
             "timestamp": str(__import__('datetime').datetime.utcnow()),
             "balance_usdt": round(balance, 2),
             "risk_engine": risk_status,
+            "symbol_cache": symbol_cache.get_status(),
+            "price_book": price_book.get_status(),
+            "account_state": account_state.get_status(),
+            "rate_limiter": rate_limiter.get_status(),
+            "exit_manager": exit_manager.get_status(),
+            "brackets": bracket_manager.get_status(),
+            "positions": position_manager.get_status(),
             "mode": "TESTNET" if Config.USE_TESTNET else "LIVE",
             "config": {
                 "max_risk_per_trade": Config.MAX_RISK_PER_TRADE,
@@ -309,19 +372,18 @@ async def get_status():
 
 # ============= HELPER FUNCTIONS =============
 
-def execute_trade(
-    symbol: str,
-    action: str,
+async def execute_trade(
+    context: PreTradeContext,
     strategy: str,
     confidence: float,
     usdt_amount: float
 ) -> Dict[str, Any]:
     """
     Execute a trade with proper order placement and logging.
+    Reads price and symbol filters from the pre-trade context - no extra lookups.
     
     Args:
-        symbol: Trading pair
-        action: BUY or SELL
+        context: Pre-trade snapshot (symbol, action, price, filters)
         strategy: Strategy name
         confidence: Confidence level
         usdt_amount: Amount in USDT to trade
@@ -329,13 +391,15 @@ def execute_trade(
     Returns:
         Dict with success status, reason, and order details
     """
-    binance = get_binance_client()
+    binance = get_async_binance_client()
+    symbol = context.symbol
+    action = context.action
     
     try:
         logger.log_info(f"Executing {action} order for {symbol} ({strategy})")
         
-        # Get current price for reference
-        current_price = binance.get_current_price(symbol)
+        # Price for reference and sizing
+        current_price = context.price
         if current_price is None:
             return {
                 'success': False,
@@ -344,7 +408,12 @@ def execute_trade(
         
         # Calculate correct quantity
         if action == "BUY":
-            quantity = binance.calculate_buy_quantity(symbol, usdt_amount)
+            if context.filters is None:
+                return {
+                    'success': False,
+                    'reason': f"No symbol filters for {symbol}"
+                }
+            quantity = size_buy_quantity(current_price, context.filters, usdt_amount)
             if quantity is None or quantity <= 0:
                 return {
                     'success': False,
@@ -352,7 +421,7 @@ def execute_trade(
                 }
             
             # Place buy order
-            order = binance.place_buy_order(symbol, quantity)
+            order = await binance.place_buy_order(symbol, quantity)
             if order is None:
                 return {
                     'success': False,
@@ -366,7 +435,7 @@ def execute_trade(
             quantity = round(quantity, 8)  # Standard precision
             
             # Place sell order
-            order = binance.place_sell_order(symbol, quantity)
+            order = await binance.place_sell_order(symbol, quantity)
             if order is None:
                 return {
                     'success': False,
@@ -395,22 +464,27 @@ def execute_trade(
             status=status
         )
         
-        # Record trade for daily limits
+        # Record trade for daily limits (risk state and journal writes run off the event loop)
         if status == "FILLED" or filled_qty > 0:
-            risk_engine.record_trade(symbol, action)
+            await asyncio.to_thread(risk_engine.record_trade, symbol, action)
             
             # RECORD OPEN POSITION for position management
             # This allows automatic stop-loss and take-profit
-            position_manager.open_position(
+            position_id = await asyncio.to_thread(
+                position_manager.open_position,
                 symbol=symbol,
                 side=action,
                 quantity=filled_qty,
                 entry_price=avg_price if avg_price > 0 else current_price
             )
+            
+            # Hand SL/TP to the exchange as an OCO bracket (stays local if placing fails)
+            if position_id and Config.USE_OCO_BRACKETS:
+                await bracket_manager.protect(position_id)
         
         # Track open position if not immediately filled
         if status != "FILLED" and filled_qty == 0:
-            risk_engine.add_open_trade(symbol, order_id, action, quantity)
+            await asyncio.to_thread(risk_engine.add_open_trade, symbol, order_id, action, quantity)
         
         return {
             'success': True,
@@ -0,0 +1,508 @@
+"""
+Async Binance API Client - asyncio counterpart of BinanceAPIClient for the FastAPI request path.
+Wraps python-binance's AsyncClient on one pooled aiohttp session so webhooks
+await exchange calls instead of blocking the event loop. Method names and return
+contracts match BinanceAPIClient; caches (symbols, prices, balances) are shared.
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException, BinanceOrderException
+
+from config import Config
+from csv_logger import logger
+from symbol_cache import symbol_cache, SymbolFilters
+from price_book import price_book
+from account_state import account_state
+from binance_client import BULK_TICKER_MAX_SYMBOLS, format_decimal, size_buy_quantity
+from rate_limiter import rate_limiter, request_weight, is_order_request, api_priority, Priority
+
+
+class RateLimitedAsyncClient(AsyncClient):
+    """python-binance AsyncClient that awaits the shared rate limiter before every request."""
+
+    async def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        await rate_limiter.acquire_async(
+            request_weight(method, uri, kwargs.get('data')),
+            orders=1 if is_order_request(method, uri) else 0
+        )
+        kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+        # Keep the response local (not self.response): concurrent tasks share the client
+        async with getattr(self.session, method)(uri, **kwargs) as response:
+            rate_limiter.record_response(response.status, response.headers)
+            return await self._handle_response(response)
+
+
+class AsyncBinanceAPIClient:
+    """
+    Async wrapper around Binance API for trading operations.
+    Create with `await AsyncBinanceAPIClient.create()`.
+    """
+
+    def __init__(self, client: RateLimitedAsyncClient):
+        """Wrap an already-connected AsyncClient (use create())."""
+        self.client = client
+        # REST ticker requests made by get_current_prices, and their weight
+        self.ticker_requests = 0
+        self.ticker_weight = 0
+
+    @classmethod
+    async def create(cls) -> "AsyncBinanceAPIClient":
+        """Open the pooled HTTP session and verify connectivity."""
+        try:
+            connector = aiohttp.TCPConnector(
+                limit=Config.HTTP_POOL_SIZE,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            client = RateLimitedAsyncClient(
+                api_key=Config.BINANCE_API_KEY,
+                api_secret=Config.BINANCE_API_SECRET,
+                testnet=Config.USE_TESTNET,
+                session_params={'connector': connector}
+            )
+            if getattr(Config, 'BINANCE_BASE_URL', None):
+                base = Config.BINANCE_BASE_URL.rstrip('/')
+                client.API_URL = base if base.endswith('/api') else base + '/api'
+
+            try:
+                await client.ping()
+            except BinanceAPIException as e:
+                await client.close_connection()
+                raise ValueError(f"Binance API authentication failed: {e}")
+            except Exception as e:
+                await client.close_connection()
+                raise ValueError(f"Cannot connect to Binance API: {e}")
+
+            logger.log_info(
+                f"Async Binance client initialized | "
+                f"Mode: {'TESTNET' if Config.USE_TESTNET else 'LIVE'} | "
+                f"Pool size: {Config.HTTP_POOL_SIZE}"
+            )
+            return cls(client)
+        except Exception as e:
+            logger.log_error(f"Failed to initialize async Binance client: {e}")
+            raise
+
+    async def close(self):
+        """Close the pooled HTTP session."""
+        await self.client.close_connection()
+
+    async def get_account(self) -> Optional[Dict]:
+        """
+        Get the full account snapshot (all asset balances) via REST.
+
+        Returns:
+            get_account response dict, or None if error
+        """
+        try:
+            return await self.client.get_account()
+        except BinanceAPIException as e:
+            logger.log_error(f"Failed to get account: {e}")
+            return None
+        except Exception as e:
+            logger.log_error(f"Unexpected error getting account: {e}")
+            return None
+
+    async def get_account_balance(self, asset: str = "USDT") -> float:
+        """
+        Get current balance for a specific asset (cache first, then REST).
+
+        Args:
+            asset: Asset symbol (default: USDT)
+
+        Returns:
+            Available balance as float, or 0.0 if not found or error
+        """
+        cached = account_state.get_free(asset)
+        if cached is not None:
+            return cached
+
+        account = await self.get_account()
+        if account is None:
+            return 0.0
+        if Config.USE_USER_DATA_STREAM:
+            account_state.seed(account)
+
+        for balance in account.get('balances', []):
+            if balance['asset'] == asset:
+                available = float(balance['free'])
+                logger.log_info(f"Account balance: {available:.2f} {asset}")
+                return available
+
+        logger.log_info(f"Asset {asset} not found in account")
+        return 0.0
+
+    async def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+        """
+        Get symbol information (min notional, precision, etc).
+
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+
+        Returns:
+            Symbol info dict, or None if error
+        """
+        filters = await self.get_symbol_filters(symbol)
+        return filters.raw if filters else None
+
+    async def get_symbol_filters(self, symbol: str) -> Optional[SymbolFilters]:
+        """
+        Get parsed symbol filters; a cache miss reloads exchange info without blocking the loop.
+
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+
+        Returns:
+            SymbolFilters, or None if symbol not found
+        """
+        try:
+            filters = symbol_cache.get(symbol, refresh_on_miss=False)
+            if filters is None and await symbol_cache.refresh_on_miss(self.client.get_exchange_info):
+                filters = symbol_cache.get(symbol, refresh_on_miss=False)
+            if filters is None:
+                logger.log_error(f"Symbol {symbol} not found on exchange")
+            return filters
+
+        except Exception as e:
+            logger.log_error(f"Error getting symbol info for {symbol}: {e}")
+            return None
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the current price for a symbol (price book first, then REST ticker).
+
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+
+        Returns:
+            Current price as float, or None if error
+        """
+        price = price_book.get_price(symbol)
+        if price is not None:
+            return price
+
+        try:
+            ticker = await self.client.get_symbol_ticker(symbol=symbol)
+            price = float(ticker['price'])
+            price_book.update_from_rest(symbol, price)
+            return price
+        except BinanceAPIException as e:
+            logger.log_error(f"Failed to get price for {symbol}: {e}")
+            return None
+        except Exception as e:
+            logger.log_error(f"Unexpected error getting price: {e}")
+            return None
+
+    async def get_current_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Get current prices for many symbols with at most one REST request
+        (price book first, then one bulk ticker request for the rest).
+
+        Args:
+            symbols: Trading pairs (duplicates are ignored)
+
+        Returns:
+            Price per symbol; symbols whose price could not be fetched are missing
+        """
+        prices: Dict[str, float] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            price = price_book.get_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+            else:
+                missing.append(symbol)
+        if not missing:
+            return prices
+
+        self.ticker_requests += 1
+        self.ticker_weight += 2 if len(missing) == 1 else 4
+        try:
+            if len(missing) > BULK_TICKER_MAX_SYMBOLS:
+                tickers = await self.client.get_all_tickers()
+            elif len(missing) == 1:
+                tickers = [await self.client.get_symbol_ticker(symbol=missing[0])]
+            else:
+                tickers = await self.client.get_symbol_ticker(symbols=json.dumps(missing, separators=(',', ':')))
+
+            wanted = set(missing)
+            for ticker in tickers:
+                symbol = ticker['symbol']
+                if symbol in wanted:
+                    price = float(ticker['price'])
+                    price_book.update_from_rest(symbol, price)
+                    prices[symbol] = price
+        except BinanceAPIException as e:
+            logger.log_error(f"Failed to get prices for {len(missing)} symbols: {e}")
+        except Exception as e:
+            logger.log_error(f"Unexpected error getting prices: {e}")
+        return prices
+
+    async def calculate_buy_quantity(self, symbol: str, usdt_amount: float) -> Optional[float]:
+        """
+        Calculate the correct quantity for a buy order based on USDT amount.
+
+        Args:
+            symbol: Trading pair
+            usdt_amount: Amount in USDT to spend
+
+        Returns:
+            Quantity to order, or None if validation fails
+        """
+        try:
+            price = await self.get_current_price(symbol)
+            if price is None or price == 0:
+                logger.log_error(f"Cannot get price for {symbol}")
+                return None
+
+            filters = await self.get_symbol_filters(symbol)
+            if filters is None:
+                return None
+
+            return size_buy_quantity(price, filters, usdt_amount)
+
+        except Exception as e:
+            logger.log_error(f"Error calculating buy quantity: {e}")
+            return None
+
+    async def _place_order(
+        self,
+        side: str,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> Optional[Dict]:
+        """Place a MARKET order, or a LIMIT order if price is given."""
+        try:
+            quantity_str = format_decimal(quantity)
+
+            if price is None:
+                logger.log_info(f"Placing MARKET {side} order: {quantity_str} {symbol}")
+                order = await self.client.create_order(
+                    symbol=symbol,
+                    side=side,
+                    type=AsyncClient.ORDER_TYPE_MARKET,
+                    quantity=quantity_str
+                )
+            else:
+                price_str = format_decimal(price)
+                logger.log_info(f"Placing LIMIT {side} order: {quantity_str} {symbol} @ ${price_str}")
+                order = await self.client.create_order(
+                    symbol=symbol,
+                    side=side,
+                    type=AsyncClient.ORDER_TYPE_LIMIT,
+                    timeInForce=AsyncClient.TIME_IN_FORCE_GTC,
+                    quantity=quantity_str,
+                    price=price_str
+                )
+
+            order_id = order.get('orderId')
+            logger.log_info(f"Order placed successfully: ID {order_id}")
+            return order
+
+        except BinanceOrderException as e:
+            logger.log_error(f"Binance order error for {symbol}: {e}")
+            return None
+        except BinanceAPIException as e:
+            logger.log_error(f"Binance API error placing order: {e}")
+            return None
+        except Exception as e:
+            logger.log_error(f"Unexpected error placing {side.lower()} order: {e}")
+            return None
+
+    async def place_buy_order(
+        self,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place a buy order on Binance (MARKET, or LIMIT if price specified).
+
+        Returns:
+            Order dict with details, or None if failed
+        """
+        return await self._place_order(AsyncClient.SIDE_BUY, symbol, quantity, price)
+
+    async def place_sell_order(
+        self,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Place a sell order on Binance (MARKET, or LIMIT if price specified).
+
+        Returns:
+            Order dict with details, or None if failed
+        """
+        return await self._place_order(AsyncClient.SIDE_SELL, symbol, quantity, price)
+
+    async def get_order_status(self, symbol: str, order_id: int) -> Optional[str]:
+        """
+        Check the status of an order.
+
+        Returns:
+            Order status (NEW, PARTIALLY_FILLED, FILLED, CANCELED, etc), or None if error
+        """
+        try:
+            with api_priority(Priority.POLL):
+                order = await self.client.get_order(symbol=symbol, orderId=order_id)
+            return order.get('status')
+        except Exception as e:
+            logger.log_error(f"Error checking order status: {e}")
+            return None
+
+    async def cancel_order(self, symbol: str, order_id: int) -> bool:
+        """
+        Cancel an open order.
+
+        Returns:
+            True if cancelled successfully, False otherwise
+        """
+        try:
+            await self.client.cancel_order(symbol=symbol, orderId=order_id)
+            logger.log_info(f"Order {order_id} cancelled successfully")
+            return True
+        except Exception as e:
+            logger.log_error(f"Error cancelling order {order_id}: {e}")
+            return False
+
+    async def place_oco_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: str,
+        limit_price: str,
+        stop_price: str,
+        stop_limit_price: str
+    ) -> Optional[Dict]:
+        """
+        Place an OCO pair: a LIMIT_MAKER take-profit and a STOP_LOSS_LIMIT stop.
+        Prices and quantity are pre-formatted strings on the symbol's tick/step grid.
+
+        Args:
+            symbol: Trading pair
+            side: SELL (protects a long) or BUY (protects a short)
+            quantity: Amount for both legs
+            limit_price: Take-profit limit price
+            stop_price: Stop trigger price
+            stop_limit_price: Limit price of the stop leg once triggered
+
+        Returns:
+            OCO response (orderListId, orders, orderReports), or None if failed
+        """
+        try:
+            logger.log_info(
+                f"Placing OCO {side} {quantity} {symbol}: TP {limit_price} | "
+                f"stop {stop_price} (limit {stop_limit_price})"
+            )
+            order_list = await self.client.create_oco_order(
+                symbol=symbol,
+                side=side,
+                quantity=quantity,
+                price=limit_price,
+                stopPrice=stop_price,
+                stopLimitPrice=stop_limit_price,
+                stopLimitTimeInForce=AsyncClient.TIME_IN_FORCE_GTC
+            )
+            logger.log_info(f"OCO placed successfully: list ID {order_list.get('orderListId')}")
+            return order_list
+        except BinanceOrderException as e:
+            logger.log_error(f"Binance OCO error for {symbol}: {e}")
+            return None
+        except BinanceAPIException as e:
+            logger.log_error(f"Binance API error placing OCO: {e}")
+            return None
+        except Exception as e:
+            logger.log_error(f"Unexpected error placing OCO for {symbol}: {e}")
+            return None
+
+    async def cancel_order_list(self, symbol: str, order_list_id: int) -> bool:
+        """
+        Cancel both legs of an OCO order list.
+
+        Returns:
+            True if cancelled successfully, False otherwise
+        """
+        try:
+            await self.client._delete('orderList', True, data={'symbol': symbol, 'orderListId': order_list_id})
+            logger.log_info(f"Order list {order_list_id} cancelled successfully")
+            return True
+        except Exception as e:
+            logger.log_error(f"Error cancelling order list {order_list_id}: {e}")
+            return False
+
+    async def get_open_order_lists(self) -> Optional[List[Dict]]:
+        """
+        Get all open OCO order lists (one request, weight 6).
+
+        Returns:
+            List of order lists, or None if error
+        """
+        try:
+            return await self.client.get_open_oco_orders()
+        except Exception as e:
+            logger.log_error(f"Error getting open order lists: {e}")
+            return None
+
+    async def get_order_list(self, order_list_id: int) -> Optional[Dict]:
+        """
+        Get one OCO order list (status and the ids of its orders).
+
+        Returns:
+            Order list dict, or None if error
+        """
+        try:
+            return await self.client._get('orderList', True, data={'orderListId': order_list_id})
+        except Exception as e:
+            logger.log_error(f"Error getting order list {order_list_id}: {e}")
+            return None
+
+    async def get_order(self, symbol: str, order_id: int) -> Optional[Dict]:
+        """
+        Get an order's full state (status, type, executedQty, cummulativeQuoteQty).
+
+        Returns:
+            Order dict, or None if error
+        """
+        try:
+            return await self.client.get_order(symbol=symbol, orderId=order_id)
+        except Exception as e:
+            logger.log_error(f"Error getting order {order_id}: {e}")
+            return None
+
+
+# Global async Binance client instance
+async_binance_client: Optional[AsyncBinanceAPIClient] = None
+
+
+async def initialize_async_binance_client() -> bool:
+    """
+    Initialize the global async Binance client (call from the running event loop).
+    Returns True on success, False on failure.
+    """
+    global async_binance_client
+    try:
+        async_binance_client = await AsyncBinanceAPIClient.create()
+        return True
+    except Exception as e:
+        logger.log_error(f"Failed to initialize async Binance client: {e}")
+        return False
+
+
+async def close_async_binance_client():
+    """Close the global async client's HTTP session."""
+    global async_binance_client
+    if async_binance_client is not None:
+        await async_binance_client.close()
+        async_binance_client = None
+
+
+def get_async_binance_client() -> Optional[AsyncBinanceAPIClient]:
+    """Get the global async Binance client instance."""
+    return async_binance_client
@@ -0,0 +1,115 @@
+"""
+Benchmark: blocking BinanceAPIClient vs AsyncBinanceAPIClient under concurrent webhooks.
+
+Both clients run against the mock_exchange REST stand-in (fixed latency per request)
+doing the webhook's exchange calls: balance, price, quantity sizing, market buy.
+The sync client is called from coroutines exactly as the webhook used to call it,
+so concurrent webhooks queue behind each other on the event loop.
+
+Usage:
+  python bench_exchange_clients.py [concurrency] [latency_ms]
+"""
+
+import os
+import sys
+import threading
+import asyncio
+import time
+
+# Point everything at the local stand-in before config is imported
+os.environ.update({
+    'BINANCE_API_KEY': 'bench', 'BINANCE_API_SECRET': 'bench',
+    'USE_TESTNET': 'false', 'BINANCE_BASE_URL': 'http://localhost:8766',
+    'USE_PRICE_STREAM': 'false', 'USE_USER_DATA_STREAM': 'false',
+    'PRICE_STALE_SECONDS': '0',
+})
+
+from binance.client import BaseClient
+
+import mock_exchange
+from binance_client import BinanceAPIClient
+from async_binance_client import AsyncBinanceAPIClient
+from symbol_cache import symbol_cache
+
+SYMBOL = 'BTCUSDT'
+
+
+def start_mock(latency: float) -> mock_exchange.MockRestAPI:
+    """Run the REST stand-in on its own thread so blocking calls can't stall it."""
+    api = mock_exchange.MockRestAPI(latency=latency)
+    ready = threading.Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(mock_exchange.start_rest(api))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return api
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run_webhooks(flow, concurrency: int):
+    """Start `concurrency` webhook flows at once; return per-webhook latencies."""
+    start = time.perf_counter()
+    latencies = []
+
+    async def one():
+        await flow()
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def report(name, total, latencies, requests):
+    print(
+        f"{name:<6} total {total * 1000:8.1f} ms | "
+        f"p50 {percentile(latencies, 50) * 1000:8.1f} ms | "
+        f"p95 {percentile(latencies, 95) * 1000:8.1f} ms | "
+        f"{len(latencies) / total:7.1f} webhooks/s | {requests} requests"
+    )
+
+
+async def main(concurrency: int, latency: float):
+    api = start_mock(latency)
+    BaseClient.API_URL = 'http://localhost:8766/api'  # Client() pings during construction
+
+    sync_client = BinanceAPIClient()
+    symbol_cache.stop()
+    async_client = await AsyncBinanceAPIClient.create()
+
+    async def sync_flow():
+        sync_client.get_account_balance("USDT")
+        sync_client.get_current_price(SYMBOL)
+        quantity = sync_client.calculate_buy_quantity(SYMBOL, 50)
+        sync_client.place_buy_order(SYMBOL, quantity)
+
+    async def async_flow():
+        await async_client.get_account_balance("USDT")
+        await async_client.get_current_price(SYMBOL)
+        quantity = await async_client.calculate_buy_quantity(SYMBOL, 50)
+        await async_client.place_buy_order(SYMBOL, quantity)
+
+    print(f"\n{concurrency} concurrent webhooks, {latency * 1000:.0f} ms per exchange request\n")
+    before = api.requests
+    total, latencies = await run_webhooks(sync_flow, concurrency)
+    report("sync", total, latencies, api.requests - before)
+
+    before = api.requests
+    total, latencies = await run_webhooks(async_flow, concurrency)
+    report("async", total, latencies, api.requests - before)
+
+    await async_client.close()
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(concurrency, latency_ms / 1000))
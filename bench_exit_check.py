@@ -0,0 +1,120 @@
+"""
+Benchmark: one full SL/TP exit-check pass over N open positions.
+
+  per-row loop  - the original _check_all_positions: a Python loop testing
+                  every position against its symbol's price
+  trigger index - trigger_index.TriggerIndex.crossed, once per symbol
+  vectorized    - position_columns.PositionColumns.crossed, one pass over
+                  the column arrays for all symbols
+
+Prices are drawn near entry so only a small fraction of positions fire, as
+in steady state (triggered positions are closed and leave the book).
+
+Usage:
+  python bench_exit_check.py [sizes...] [--symbols N]
+  python bench_exit_check.py 10 1000 100000 --symbols 50
+"""
+
+import random
+import sys
+import time
+
+from models import Position
+from position_columns import PositionColumns
+from trigger_index import TriggerIndex
+
+
+def make_positions(n: int, symbols: int):
+    random.seed(15)
+    bases = {f"SYM{i}USDT": random.uniform(1, 50000) for i in range(symbols)}
+    names = list(bases)
+    positions = []
+    for i in range(n):
+        symbol = names[i % symbols]
+        entry = bases[symbol] * random.uniform(0.99, 1.01)
+        side = random.choice(("BUY", "SELL"))
+        stop, target = (entry * 0.99, entry * 1.025) if side == "BUY" else (entry * 1.01, entry * 0.975)
+        positions.append(Position(
+            position_id=f"{i:016x}", symbol=symbol, side=side, quantity=0.01,
+            entry_price=entry, stop_loss_price=stop, take_profit_price=target,
+            entry_time="2026-01-01T00:00:00", current_price=entry
+        ))
+    return positions, bases
+
+
+def check_loop(positions, prices):
+    hits = []
+    for position in positions:
+        price = prices.get(position.symbol)
+        if price is None:
+            continue
+        if position.side == "BUY":
+            if price <= position.stop_loss_price:
+                hits.append((position, "STOP_LOSS"))
+            elif price >= position.take_profit_price:
+                hits.append((position, "TAKE_PROFIT"))
+        else:
+            if price >= position.stop_loss_price:
+                hits.append((position, "STOP_LOSS"))
+            elif price <= position.take_profit_price:
+                hits.append((position, "TAKE_PROFIT"))
+    return hits
+
+
+def check_index(index, prices):
+    hits = []
+    for symbol, price in prices.items():
+        hits.extend(index.crossed(symbol, price))
+    return hits
+
+
+def check_columns(columns, prices):
+    return columns.crossed(prices)
+
+
+def timed(fn, *args, passes: int) -> float:
+    """Mean milliseconds per pass."""
+    fn(*args)  # warm up
+    start = time.perf_counter()
+    for _ in range(passes):
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / passes
+
+
+def run(n: int, symbols: int):
+    positions, bases = make_positions(n, symbols)
+    index, columns = TriggerIndex(), PositionColumns()
+    for position in positions:
+        index.add(position)
+        columns.add(position)
+    prices = {symbol: base * random.uniform(0.998, 1.002) for symbol, base in bases.items()}
+
+    expected = len(check_loop(positions, prices))
+    assert len(check_index(index, prices)) == expected
+    assert len(check_columns(columns, prices)) == expected
+
+    passes = max(5, min(2000, 200000 // n))
+    results = [
+        ("per-row loop", timed(check_loop, positions, prices, passes=passes)),
+        ("trigger index", timed(check_index, index, prices, passes=passes)),
+        ("vectorized", timed(check_columns, columns, prices, passes=passes)),
+    ]
+    print(f"{n} positions, {symbols} symbols, {expected} triggered ({passes} passes)")
+    baseline = results[0][1]
+    for name, ms in results:
+        print(f"  {name:<14} {ms:10.3f} ms/pass   x{baseline / ms:7.1f}")
+
+
+def main():
+    args = sys.argv[1:]
+    symbols = 50
+    if "--symbols" in args:
+        i = args.index("--symbols")
+        symbols = int(args[i + 1])
+        del args[i:i + 2]
+    for n in [int(a) for a in args] or [10, 1000, 100000]:
+        run(n, min(symbols, n))
+
+
+if __name__ == "__main__":
+    main()
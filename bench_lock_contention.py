@@ -0,0 +1,122 @@
+"""
+Benchmark: lock contention under a mixed-symbol signal burst.
+
+Writer threads play the webhook: each signal runs the risk checks, records
+the signal, opens a position and closes an earlier one (journal writes with
+fsync). One reader thread plays the exit path: a price tick every
+millisecond (update + per-symbol position lookup), each timed.
+
+  global lock - one lock around every call, readers included: the book and
+                risk engine as they were before lock striping
+  striped     - the current risk engine and position manager (per-symbol
+                stripes; the book lock is never held across file I/O)
+
+Usage:
+  python bench_lock_contention.py [signals] [--threads N] [--symbols N]
+  python bench_lock_contention.py 2000 --threads 8 --symbols 20
+"""
+
+import io
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+
+from config import Config
+from positions import PositionManager
+from risk import RiskEngine
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def run(mode: str, signals: int, threads: int, symbols: int) -> str:
+    log_dir = Path(tempfile.mkdtemp(prefix="bench_locks_"))
+    Config.LOCK_STRIPES = 1 if mode == "global lock" else 16
+    Config.MIN_CONFIDENCE = 0
+    Config.MAX_OPEN_TRADES = 10 ** 9
+    Config.MAX_TRADES_PER_DAY = 10 ** 9
+    Config.SIGNAL_COOLDOWN_SECONDS = 0
+    book = PositionManager(log_dir=log_dir, store=None)
+    risk = RiskEngine(state_file=log_dir / "risk_state.json", exposure=book.exposure)
+    big_lock = threading.Lock() if mode == "global lock" else nullcontext()
+    names = [f"SYM{i}USDT" for i in range(symbols)]
+    done = threading.Event()
+
+    def writer(seed: int, count: int):
+        rng = random.Random(seed)
+        held = []
+        for _ in range(count):
+            symbol = rng.choice(names)
+            with big_lock:
+                allowed, _ = risk.check_all_constraints(symbol, "BUY", 100, 1000)
+            if not allowed:
+                continue
+            with big_lock:
+                risk.record_signal(symbol, "BUY")
+                held.append(book.open_position(symbol, "BUY", 0.01, 100.0))
+            if len(held) > 4:
+                with big_lock:
+                    book.close_position(held.pop(0), 101.0, "TAKE_PROFIT")
+
+    reader_ms = []
+
+    def reader():
+        rng = random.Random(0)
+        while not done.is_set():
+            symbol = rng.choice(names)
+            started = time.perf_counter()
+            with big_lock:
+                book.update_position_price(symbol, 100.5)
+                book.get_open_positions(symbol)
+            reader_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.001)
+
+    per_thread = signals // threads
+    workers = [threading.Thread(target=writer, args=(seed, per_thread)) for seed in range(threads)]
+    exit_path = threading.Thread(target=reader)
+    started = time.perf_counter()
+    exit_path.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    exit_path.join()
+    shutil.rmtree(log_dir, ignore_errors=True)
+
+    return (
+        f"{mode:>12}: {per_thread * threads / elapsed:9.0f} signals/s | "
+        f"exit-path lookup p50 {percentile(reader_ms, 0.50):7.3f} ms  "
+        f"p99 {percentile(reader_ms, 0.99):7.3f} ms  max {max(reader_ms, default=0):8.3f} ms"
+    )
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"--threads": 8, "--symbols": 20}
+    for name in options:
+        if name in args:
+            i = args.index(name)
+            options[name] = int(args[i + 1])
+            del args[i:i + 2]
+    signals = int(args[0]) if args else 2000
+    print(
+        f"{signals} signals, {options['--threads']} writer threads, {options['--symbols']} symbols, "
+        f"journal fsync {'on' if Config.POSITION_JOURNAL_FSYNC else 'off'}"
+    )
+    for mode in ("global lock", "striped"):
+        with redirect_stdout(io.StringIO()):  # position open/close log lines
+            result = run(mode, signals, options["--threads"], options["--symbols"])
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
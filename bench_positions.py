@@ -0,0 +1,130 @@
+"""
+Microbenchmark: one exit-check pass over N open positions, three representations.
+
+  csv rows   - what get_open_positions used to do: DictReader over positions.csv text,
+               float() on five columns, then string-keyed threshold checks
+  dicts      - already-parsed dicts with float values, string-keyed checks
+  Position   - models.Position (__slots__ dataclass), attribute checks
+
+Also reports bytes allocated per position for dicts vs Position records.
+
+Usage:
+  python bench_positions.py [positions] [passes]
+"""
+
+import csv
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+from models import Position
+from position_archive import CSV_FIELDS, to_csv_row
+
+
+def make_positions(n: int):
+    random.seed(7)
+    positions = []
+    for i in range(n):
+        entry = random.uniform(10, 50000)
+        side = random.choice(("BUY", "SELL"))
+        stop, target = (entry * 0.99, entry * 1.025) if side == "BUY" else (entry * 1.01, entry * 0.975)
+        positions.append(Position(
+            position_id=f"{i:016x}", symbol=f"SYM{i % 20}USDT", side=side, quantity=0.01,
+            entry_price=entry, stop_loss_price=stop, take_profit_price=target,
+            entry_time="2026-01-01T00:00:00", current_price=entry
+        ))
+    return positions
+
+
+def check_csv(text: str, prices) -> int:
+    hits = 0
+    for row in csv.DictReader(io.StringIO(text)):
+        if row['Status'] != 'OPEN':
+            continue
+        row['Quantity'] = float(row['Quantity'])
+        row['EntryPrice'] = float(row['EntryPrice'])
+        row['StopLossPrice'] = float(row['StopLossPrice'])
+        row['TakeProfitPrice'] = float(row['TakeProfitPrice'])
+        row['CurrentPrice'] = float(row['CurrentPrice'])
+        price = prices[row['Symbol']]
+        if row['Side'] == "BUY":
+            hits += price <= row['StopLossPrice'] or price >= row['TakeProfitPrice']
+        else:
+            hits += price >= row['StopLossPrice'] or price <= row['TakeProfitPrice']
+    return hits
+
+
+def check_dicts(rows, prices) -> int:
+    hits = 0
+    for row in rows:
+        price = prices[row['Symbol']]
+        if row['Side'] == "BUY":
+            hits += price <= row['StopLossPrice'] or price >= row['TakeProfitPrice']
+        else:
+            hits += price >= row['StopLossPrice'] or price <= row['TakeProfitPrice']
+    return hits
+
+
+def check_positions(positions, prices) -> int:
+    hits = 0
+    for p in positions:
+        price = prices[p.symbol]
+        if p.side == "BUY":
+            hits += price <= p.stop_loss_price or price >= p.take_profit_price
+        else:
+            hits += price >= p.stop_loss_price or price <= p.take_profit_price
+    return hits
+
+
+def timed(fn, *args, passes: int) -> float:
+    """Mean milliseconds per pass."""
+    fn(*args)  # warm up
+    start = time.perf_counter()
+    for _ in range(passes):
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / passes
+
+
+def bytes_per_item(build, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    passes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    positions = make_positions(n)
+    records = [p.to_record() for p in positions]
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    writer.writerows(to_csv_row(r) for r in records)
+    text = buf.getvalue()
+    prices = {p.symbol: p.entry_price for p in positions}
+
+    results = [
+        ("csv rows (old)", timed(check_csv, text, prices, passes=passes)),
+        ("dicts", timed(check_dicts, records, prices, passes=passes)),
+        ("Position", timed(check_positions, positions, prices, passes=passes)),
+    ]
+
+    print(f"Exit-check pass over {n} positions ({passes} passes)")
+    baseline = results[0][1]
+    for name, ms in results:
+        print(f"  {name:<16} {ms:9.3f} ms/pass   {ms * 1000 / n:7.3f} us/position   x{baseline / ms:6.1f}")
+
+    dict_bytes = bytes_per_item(lambda: [dict(r) for r in records], n)
+    slot_bytes = bytes_per_item(lambda: [Position.from_record(r) for r in records], n)
+    print(f"Memory per position: dict {dict_bytes:.0f} B, Position {slot_bytes:.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,68 @@ from binance.exceptions import BinanceAPIException, BinanceOrderException
 
 from config import Config
 from csv_logger import logger
+from symbol_cache import symbol_cache, SymbolFilters
+from price_book import price_book
+from account_state import account_state
+from rate_limiter import rate_limiter, request_weight, is_order_request, api_priority, Priority
+
+# Above this many symbols one all-tickers request replaces the symbols list (same weight;
+# used by AsyncBinanceAPIClient.get_current_prices)
+BULK_TICKER_MAX_SYMBOLS = 100
+
+
+def format_decimal(value: float) -> str:
+    """Format a quantity or price for the API, avoiding scientific notation."""
+    return f"{value:.8f}".rstrip('0').rstrip('.')
+
+
+def size_buy_quantity(price: float, filters: SymbolFilters, usdt_amount: float) -> Optional[float]:
+    """
+    Round a USDT amount at a given price to a valid order quantity.
+    
+    Args:
+        price: Current price
+        filters: Symbol filters (LOT_SIZE precision, MIN_NOTIONAL)
+        usdt_amount: Amount in USDT to spend
+    
+    Returns:
+        Quantity to order, or None if below minimum notional
+    """
+    # Calculate quantity
+    raw_quantity = usdt_amount / price
+    
+    # Round to precision
+    precision = filters.quantity_precision
+    quantity = round(raw_quantity, precision)
+    
+    # Validate minimum notional
+    min_notional = filters.min_notional
+    
+    if (quantity * price) < min_notional:
+        logger.log_error(
+            f"Order size ${quantity * price:.2f} below minimum ${min_notional:.2f}"
+        )
+        return None
+    
+    # Convert to string with proper decimal formatting (avoid scientific notation)
+    # Format with sufficient decimal places, then strip trailing zeros
+    quantity_str = f"{quantity:.{precision}f}"
+    return float(quantity_str)  # Return as float, but ensure proper formatting
+
+
+class RateLimitedClient(BinanceClient):
+    """python-binance Client that passes every request through the shared rate limiter."""
+    
+    def _request(self, method, uri: str, signed: bool, force_params: bool = False, **kwargs):
+        rate_limiter.acquire(
+            request_weight(method, uri, kwargs.get('data')),
+            orders=1 if is_order_request(method, uri) else 0
+        )
+        kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+        # Keep the response local (not self.response): the client is shared across threads
+        response = getattr(self.session, method)(uri, **kwargs)
+        rate_limiter.record_response(response.status_code, response.headers)
+        return self._handle_response(response)
 
 
 class BinanceAPIClient:
@@ -22,7 +84,7 @@ class BinanceAPIClient:
         """Initialize Binance client with configured API credentials."""
         try:
             # Initialize the Binance client
-            self.client = BinanceClient(
+            self.client = RateLimitedClient(
                 api_key=Config.BINANCE_API_KEY,
                 api_secret=Config.BINANCE_API_SECRET,
                 testnet=Config.USE_TESTNET
@@ -43,6 +105,9 @@ class BinanceAPIClient:
             # Test connection and credentials
             self._test_connection()
             
+            # Load exchange info once; refreshed in the background on a TTL
+            symbol_cache.start(self.client.get_exchange_info)
+            
             logger.log_info(
                 f"Binance client initialized | "
                 f"Mode: {'TESTNET' if Config.USE_TESTNET else 'LIVE'}"
@@ -61,9 +126,27 @@ class BinanceAPIClient:
         except Exception as e:
             raise ValueError(f"Cannot connect to Binance API: {e}")
     
+    def get_account(self) -> Optional[Dict]:
+        """
+        Get the full account snapshot (all asset balances) via REST.
+        
+        Returns:
+            get_account response dict, or None if error
+        """
+        try:
+            return self.client.get_account()
+        except BinanceAPIException as e:
+            logger.log_error(f"Failed to get account: {e}")
+            return None
+        except Exception as e:
+            logger.log_error(f"Unexpected error getting account: {e}")
+            return None
+    
     def get_account_balance(self, asset: str = "USDT") -> float:
         """
         Get current balance for a specific asset.
+        Served from the user-data-stream account cache when it is live,
+        otherwise fetched with a full get_account request.
         
         Args:
             asset: Asset symbol (default: USDT)
@@ -71,29 +154,47 @@ class BinanceAPIClient:
         Returns:
             Available balance as float, or 0.0 if not found or error
         """
-        try:
-            account = self.client.get_account()
-            
-            # Find the asset in balances
-            for balance in account.get('balances', []):
-                if balance['asset'] == asset:
-                    available = float(balance['free'])
-                    logger.log_info(f"Account balance: {available:.2f} {asset}")
-                    return available
-            
-            logger.log_info(f"Asset {asset} not found in account")
-            return 0.0
+        cached = account_state.get_free(asset)
+        if cached is not None:
+            return cached
         
-        except BinanceAPIException as e:
-            logger.log_error(f"Failed to get account balance: {e}")
+        account = self.get_account()
+        if account is None:
             return 0.0
+        if Config.USE_USER_DATA_STREAM:
+            account_state.seed(account)
+        
+        # Find the asset in balances
+        for balance in account.get('balances', []):
+            if balance['asset'] == asset:
+                available = float(balance['free'])
+                logger.log_info(f"Account balance: {available:.2f} {asset}")
+                return available
+        
+        logger.log_info(f"Asset {asset} not found in account")
+        return 0.0
+    
+    def get_listen_key(self) -> Optional[str]:
+        """Create (or fetch the active) user data stream listenKey."""
+        try:
+            return self.client.stream_get_listen_key()
         except Exception as e:
-            logger.log_error(f"Unexpected error getting balance: {e}")
-            return 0.0
+            logger.log_error(f"Failed to get listenKey: {e}")
+            return None
+    
+    def keepalive_listen_key(self, listen_key: str) -> bool:
+        """Extend a listenKey's validity by 60 minutes. Returns True on success."""
+        try:
+            self.client.stream_keepalive(listen_key)
+            return True
+        except Exception as e:
+            logger.log_error(f"Failed to keep listenKey alive: {e}")
+            return False
     
     def get_symbol_info(self, symbol: str) -> Optional[Dict]:
         """
         Get symbol information (min notional, precision, etc).
+        Served from the exchange info cache - no API call on a hit.
         
         Args:
             symbol: Trading pair (e.g., BTCUSDT)
@@ -101,16 +202,24 @@ class BinanceAPIClient:
         Returns:
             Symbol info dict, or None if error
         """
+        filters = self.get_symbol_filters(symbol)
+        return filters.raw if filters else None
+    
+    def get_symbol_filters(self, symbol: str) -> Optional[SymbolFilters]:
+        """
+        Get parsed LOT_SIZE, PRICE_FILTER and MIN_NOTIONAL values for a symbol.
+        
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+        
+        Returns:
+            SymbolFilters, or None if symbol not found
+        """
         try:
-            # Get exchange info which contains all symbols
-            exchange_info = self.client.get_exchange_info()
-            
-            for sym_info in exchange_info.get('symbols', []):
-                if sym_info['symbol'] == symbol:
-                    return sym_info
-            
-            logger.log_error(f"Symbol {symbol} not found on exchange")
-            return None
+            filters = symbol_cache.get(symbol)
+            if filters is None:
+                logger.log_error(f"Symbol {symbol} not found on exchange")
+            return filters
         
         except Exception as e:
             logger.log_error(f"Error getting symbol info for {symbol}: {e}")
@@ -119,6 +228,8 @@ class BinanceAPIClient:
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
         Get the current price for a symbol.
+        Served from the streaming price book; falls back to a REST ticker
+        request when the symbol is unknown or its quote is stale.
         
         Args:
             symbol: Trading pair (e.g., BTCUSDT)
@@ -126,9 +237,15 @@ class BinanceAPIClient:
         Returns:
             Current price as float, or None if error
         """
+        price = price_book.get_price(symbol)
+        if price is not None:
+            return price
+        
         try:
             ticker = self.client.get_symbol_ticker(symbol=symbol)
-            return float(ticker['price'])
+            price = float(ticker['price'])
+            price_book.update_from_rest(symbol, price)
+            return price
         except BinanceAPIException as e:
             logger.log_error(f"Failed to get price for {symbol}: {e}")
             return None
@@ -155,45 +272,12 @@ class BinanceAPIClient:
                 logger.log_error(f"Cannot get price for {symbol}")
                 return None
             
-            # Get symbol info for precision
-            symbol_info = self.get_symbol_info(symbol)
-            if symbol_info is None:
-                return None
-            
-            # Calculate quantity
-            raw_quantity = usdt_amount / price
-            
-            # Get base asset precision
-            base_precision = next(
-                (f['stepSize'] for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'),
-                None
-            )
-            
-            if base_precision is None:
-                logger.log_error(f"Cannot determine precision for {symbol}")
-                return None
-            
-            # Round to precision
-            precision = len(base_precision.rstrip('0').split('.')[-1]) if '.' in base_precision else 0
-            quantity = round(raw_quantity, precision)
-            
-            # Validate minimum notional
-            min_notional = next(
-                (float(f['minNotional']) for f in symbol_info['filters'] 
-                 if f['filterType'] == 'MIN_NOTIONAL'),
-                0
-            )
-            
-            if (quantity * price) < min_notional:
-                logger.log_error(
-                    f"Order size ${quantity * price:.2f} below minimum ${min_notional:.2f}"
-                )
+            # Get cached symbol filters for precision
+            filters = self.get_symbol_filters(symbol)
+            if filters is None:
                 return None
             
-            # Convert to string with proper decimal formatting (avoid scientific notation)
-            # Format with sufficient decimal places, then strip trailing zeros
-            quantity_str = f"{quantity:.{precision}f}"
-            return float(quantity_str)  # Return as float, but ensure proper formatting
+            return size_buy_quantity(price, filters, usdt_amount)
         
         except Exception as e:
             logger.log_error(f"Error calculating buy quantity: {e}")
@@ -219,7 +303,7 @@ class BinanceAPIClient:
         """
         try:
             # Convert quantity to string to avoid scientific notation issues
-            quantity_str = f"{quantity:.8f}".rstrip('0').rstrip('.')
+            quantity_str = format_decimal(quantity)
             
             if price is None:
                 # Market order - executes immediately at best available price
@@ -230,7 +314,7 @@ class BinanceAPIClient:
                 )
             else:
                 # Limit order - executes only at specified price or better
-                price_str = f"{price:.8f}".rstrip('0').rstrip('.')
+                price_str = format_decimal(price)
                 logger.log_info(f"Placing LIMIT BUY order: {quantity_str} {symbol} @ ${price_str}")
                 order = self.client.order_limit_buy(
                     symbol=symbol,
@@ -272,7 +356,7 @@ class BinanceAPIClient:
         """
         try:
             # Convert quantity to string to avoid scientific notation issues
-            quantity_str = f"{quantity:.8f}".rstrip('0').rstrip('.')
+            quantity_str = format_decimal(quantity)
             
             if price is None:
                 # Market order
@@ -283,7 +367,7 @@ class BinanceAPIClient:
                 )
             else:
                 # Limit order
-                price_str = f"{price:.8f}".rstrip('0').rstrip('.')
+                price_str = format_decimal(price)
                 logger.log_info(f"Placing LIMIT SELL order: {quantity_str} {symbol} @ ${price_str}")
                 order = self.client.order_limit_sell(
                     symbol=symbol,
@@ -317,7 +401,8 @@ class BinanceAPIClient:
             Order status (NEW, PARTIALLY_FILLED, FILLED, CANCELED, etc), or None if error
         """
         try:
-            order = self.client.get_order(symbol=symbol, orderId=order_id)
+            with api_priority(Priority.POLL):
+                order = self.client.get_order(symbol=symbol, orderId=order_id)
             return order.get('status')
         except Exception as e:
             logger.log_error(f"Error checking order status: {e}")
@@ -0,0 +1,267 @@
+"""
+Brackets - exchange-side OCO stop-loss / take-profit for open positions.
+A bracketed position leaves the local trigger index; fills arrive on the user
+data stream, with a periodic REST reconcile as the fallback.
+"""
+
+import asyncio
+import time
+from decimal import ROUND_CEILING, ROUND_FLOOR
+from typing import Dict, Optional, Set
+
+from config import Config
+from csv_logger import logger
+from account_state import account_state
+from async_binance_client import get_async_binance_client
+from exit_manager import exit_manager
+from positions import position_manager
+from rate_limiter import api_priority, Priority
+
+
+class BracketManager:
+    """Places OCO brackets after entry and closes positions when a leg fills."""
+
+    def __init__(self, enabled: bool = False, stop_limit_offset: float = 0.005, reconcile_seconds: int = 30):
+        """
+        Initialize bracket manager.
+
+        Args:
+            enabled: Place an OCO bracket for every new position
+            stop_limit_offset: Stop leg limit price beyond the stop trigger (fraction, e.g. 0.005 = 0.5%)
+            reconcile_seconds: Check bracket state over REST every N seconds
+        """
+        self.enabled = enabled
+        self.stop_limit_offset = stop_limit_offset
+        self.reconcile_seconds = reconcile_seconds
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # orderListId -> position id of every live bracket
+        self._by_list: Dict[int, str] = {}
+        self._resolving: Set[int] = set()
+        self._closing: Set[asyncio.Task] = set()  # stream fills being recorded
+
+        self.placed = 0
+        self.place_failures = 0
+        self.fills = {'stream': 0, 'rest': 0}
+        self.released = 0  # brackets that ended without a fill
+        self.last_reconcile: Optional[float] = None
+
+    # ----- lifecycle -----
+
+    def start(self):
+        """Start tracking brackets as a task on the running event loop (call from the app's loop)."""
+        if self.running:
+            return
+        self.running = True
+        self._by_list = {
+            p.oco_list_id: p.position_id
+            for p in position_manager.get_open_positions() if p.is_bracketed
+        }
+        account_state.add_order_listener(self._on_execution_report)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.log_info(
+            f"Bracket manager started (OCO brackets {'on' if self.enabled else 'off'}, "
+            f"{len(self._by_list)} live brackets)"
+        )
+
+    async def stop(self):
+        """Stop tracking (live brackets stay on the exchange and are picked up on the next start)."""
+        self.running = False
+        account_state.remove_order_listener(self._on_execution_report)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    async def _run(self):
+        """Protect positions left unbracketed, then reconcile periodically."""
+        if self.enabled:
+            for position in position_manager.get_open_positions():
+                if not position.is_bracketed:
+                    await self.protect(position.position_id)
+        while self.running:
+            try:
+                with api_priority(Priority.POLL):
+                    await self.reconcile()
+            except Exception as e:
+                logger.log_error(f"Error reconciling brackets: {e}")
+            await asyncio.sleep(self.reconcile_seconds)
+
+    # ----- placing -----
+
+    async def protect(self, position_id: str) -> bool:
+        """
+        Place an OCO bracket at a position's stop-loss / take-profit levels.
+
+        Args:
+            position_id: Open position
+
+        Returns:
+            True if the bracket is live on the exchange
+        """
+        position = position_manager.get_position(position_id)
+        binance = get_async_binance_client()
+        if position is None or not position.is_open or binance is None:
+            return False
+        if exit_manager.exit_pending(position_id):
+            # A local exit order is in flight; a bracket now could sell the position twice
+            return False
+
+        filters = await binance.get_symbol_filters(position.symbol)
+        if filters is None:
+            self.place_failures += 1
+            return False
+
+        # Long positions are protected by a SELL OCO, shorts by a BUY OCO; the stop
+        # leg's limit sits stop_limit_offset beyond its trigger so it can still fill
+        if position.side == "BUY":
+            side = "SELL"
+            stop_limit = filters.price_on_tick(position.stop_loss_price * (1 - self.stop_limit_offset), ROUND_FLOOR)
+        else:
+            side = "BUY"
+            stop_limit = filters.price_on_tick(position.stop_loss_price * (1 + self.stop_limit_offset), ROUND_CEILING)
+
+        with api_priority(Priority.EXIT):
+            order_list = await binance.place_oco_order(
+                symbol=position.symbol,
+                side=side,
+                quantity=filters.quantity_on_step(position.quantity),
+                limit_price=filters.price_on_tick(position.take_profit_price),
+                stop_price=filters.price_on_tick(position.stop_loss_price),
+                stop_limit_price=stop_limit
+            )
+        if not order_list:
+            self.place_failures += 1
+            logger.log_error(
+                f"OCO bracket failed for {position.symbol} [{position_id}] - "
+                f"position stays under local SL/TP monitoring"
+            )
+            return False
+
+        list_id = order_list['orderListId']
+        if exit_manager.exit_pending(position_id):
+            # Triggered locally while the OCO was being placed - don't leave it behind
+            await binance.cancel_order_list(position.symbol, list_id)
+            return False
+        if not await asyncio.to_thread(position_manager.set_bracket, position_id, list_id):
+            # Closed locally while the OCO was being placed - don't leave it behind
+            await binance.cancel_order_list(position.symbol, list_id)
+            return False
+        if exit_manager.exit_pending(position_id):
+            # Triggered while the bracket was being recorded: the exit may already be
+            # past its bracket check, so withdraw the OCO rather than risk a second sale
+            await binance.cancel_order_list(position.symbol, list_id)
+            await asyncio.to_thread(position_manager.set_bracket, position_id, None)
+            return False
+        self._by_list[list_id] = position_id
+        self.placed += 1
+        return True
+
+    # ----- fills -----
+
+    def _on_execution_report(self, event: Dict):
+        """Close the position when a bracket leg fills (user data stream, on the event loop)."""
+        list_id = event.get('g', -1)
+        position_id = self._by_list.get(list_id)
+        if position_id is None or event.get('X') != 'FILLED':
+            return
+        filled_qty = float(event.get('z', 0))
+        exit_price = float(event.get('Z', 0)) / filled_qty if filled_qty > 0 else float(event.get('L', 0))
+        # Claimed here, before the close task runs, so a concurrent reconcile skips it
+        self._by_list.pop(list_id, None)
+        task = asyncio.get_running_loop().create_task(
+            self._close(position_id, event.get('o'), exit_price, "stream")
+        )
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, position_id: str, order_type: Optional[str], exit_price: float, source: str):
+        """Record a filled bracket leg as the position's exit (the caller has removed its list)."""
+        exit_type = "TAKE_PROFIT" if order_type == "LIMIT_MAKER" else "STOP_LOSS"
+        pnl = await asyncio.to_thread(position_manager.close_position, position_id, exit_price, exit_type)
+        if pnl is not None:
+            self.fills[source] += 1
+            logger.log_info(f"OCO {exit_type} filled ({source}): P&L = {pnl:.2f} USDT [{position_id}]")
+
+    async def reconcile(self):
+        """
+        Resolve brackets that are no longer open on the exchange (one request when nothing changed).
+        Also catches fills that happened while the bot was down; a bracket that ended
+        without a fill puts its position back under local monitoring.
+        """
+        if not self._by_list:
+            return
+        binance = get_async_binance_client()
+        if binance is None:
+            return
+        open_lists = await binance.get_open_order_lists()
+        if open_lists is None:
+            return
+        self.last_reconcile = time.time()
+        open_ids = {order_list['orderListId'] for order_list in open_lists}
+        for list_id, position_id in list(self._by_list.items()):
+            if list_id not in open_ids and list_id not in self._resolving:
+                self._resolving.add(list_id)
+                try:
+                    await self._resolve(binance, list_id, position_id)
+                finally:
+                    self._resolving.discard(list_id)
+
+    async def _resolve(self, binance, list_id: int, position_id: str):
+        """Find which leg of a finished bracket filled, or hand the position back to local monitoring."""
+        order_list = await binance.get_order_list(list_id)
+        if order_list is None or order_list.get('listOrderStatus') == 'EXECUTING':
+            return
+        if list_id not in self._by_list:  # closed from the stream meanwhile
+            return
+
+        for leg in order_list.get('orders', []):
+            order = await binance.get_order(leg['symbol'], leg['orderId'])
+            if order and order.get('status') == 'FILLED':
+                filled_qty = float(order.get('executedQty', 0))
+                quote_qty = float(order.get('cummulativeQuoteQty', 0))
+                exit_price = quote_qty / filled_qty if filled_qty > 0 else float(order.get('price', 0))
+                if self._by_list.pop(list_id, None) is not None:
+                    await self._close(position_id, order.get('type'), exit_price, "rest")
+                return
+
+        # Ended without a fill (cancelled or expired outside the bot)
+        self._by_list.pop(list_id, None)
+        if await asyncio.to_thread(position_manager.set_bracket, position_id, None):
+            self.released += 1
+            logger.log_error(
+                f"OCO bracket {list_id} ended without a fill - position {position_id} "
+                f"is back under local SL/TP monitoring"
+            )
+
+    def get_status(self) -> Dict:
+        """
+        Get bracket state for monitoring.
+
+        Returns:
+            Dictionary with live bracket count, placements, fills by source and releases
+        """
+        return {
+            'enabled': self.enabled,
+            'running': self.running,
+            'live_brackets': len(self._by_list),
+            'placed': self.placed,
+            'place_failures': self.place_failures,
+            'fills': dict(self.fills),
+            'released': self.released,
+            'last_reconcile': self.last_reconcile,
+        }
+
+
+# Global bracket manager instance
+bracket_manager = BracketManager(
+    enabled=Config.USE_OCO_BRACKETS,
+    stop_limit_offset=Config.OCO_STOP_LIMIT_OFFSET,
+    reconcile_seconds=Config.OCO_RECONCILE_SECONDS
+)
@@ -37,6 +37,77 @@ class Config:
     # Optional override for Binance API base URL (useful for demo/proxy endpoints)
     BINANCE_BASE_URL = os.getenv("BINANCE_BASE_URL", "")
     
+    # Max pooled HTTP connections for the async client used by the webhook path
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    
+    # Exchange rate limits (spot defaults) enforced client-side before every request
+    API_WEIGHT_LIMIT_PER_MINUTE = int(os.getenv("API_WEIGHT_LIMIT_PER_MINUTE", "6000"))
+    API_ORDER_LIMIT_PER_10S = int(os.getenv("API_ORDER_LIMIT_PER_10S", "50"))
+    
+    # Fraction of both budgets held back for exit orders (stop-loss / take-profit)
+    API_EXIT_RESERVE = float(os.getenv("API_EXIT_RESERVE", "0.1"))
+    
+    # ============= MARKET DATA =============
+    # Refresh cached exchange info (symbol filters) every N seconds
+    SYMBOL_INFO_TTL_SECONDS = int(os.getenv("SYMBOL_INFO_TTL_SECONDS", "3600"))
+    
+    # Stream bookTicker/miniTicker prices over websocket instead of polling REST tickers
+    USE_PRICE_STREAM = os.getenv("USE_PRICE_STREAM", "true").lower() == "true"
+    
+    # Optional override for the price stream URL (e.g. ws://localhost:8765/stream for mock_exchange.py)
+    PRICE_STREAM_URL = os.getenv("PRICE_STREAM_URL", "")
+    
+    # Streamed prices older than this fall back to a REST ticker request
+    PRICE_STALE_SECONDS = float(os.getenv("PRICE_STALE_SECONDS", "5"))
+    
+    # Keep balances current from the user data stream instead of get_account per request
+    USE_USER_DATA_STREAM = os.getenv("USE_USER_DATA_STREAM", "true").lower() == "true"
+    
+    # Re-seed cached balances from REST every N seconds (catches missed stream events)
+    ACCOUNT_RESYNC_SECONDS = int(os.getenv("ACCOUNT_RESYNC_SECONDS", "300"))
+    
+    # Refresh the user data stream listenKey every N seconds (Binance expires it after 60 min)
+    LISTEN_KEY_KEEPALIVE_SECONDS = int(os.getenv("LISTEN_KEY_KEEPALIVE_SECONDS", "1800"))
+    
+    # ============= EXITS =============
+    # "stream" evaluates stop-loss/take-profit on every streamed price tick; "poll" only polls
+    EXIT_MODE = os.getenv("EXIT_MODE", "stream").lower()
+    
+    # Seconds between polling passes over open positions (fallback when streaming);
+    # with adaptive polling this is the longest gap between checks of a symbol
+    EXIT_CHECK_INTERVAL = int(os.getenv("EXIT_CHECK_INTERVAL", "30"))
+    
+    # Check symbols more often the closer they are to a trigger and the faster they move
+    EXIT_ADAPTIVE_POLLING = os.getenv("EXIT_ADAPTIVE_POLLING", "true").lower() == "true"
+    
+    # Shortest gap between adaptive checks of a symbol (seconds)
+    EXIT_POLL_MIN_SECONDS = float(os.getenv("EXIT_POLL_MIN_SECONDS", "0.5"))
+    
+    # Standard deviations of expected movement kept between a price and its nearest trigger
+    EXIT_POLL_SAFETY = float(os.getenv("EXIT_POLL_SAFETY", "3"))
+    
+    # Polling passes over at least this many open positions evaluate SL/TP on NumPy column arrays
+    EXIT_VECTORIZE_MIN_POSITIONS = int(os.getenv("EXIT_VECTORIZE_MIN_POSITIONS", "100"))
+    
+    # Triggered exits executed concurrently (bounded; the rest wait for a slot)
+    EXIT_WORKERS = int(os.getenv("EXIT_WORKERS", "4"))
+    
+    # Report an exit order as timed out after N seconds (it stays guarded until it returns)
+    EXIT_TIMEOUT_SECONDS = float(os.getenv("EXIT_TIMEOUT_SECONDS", "15"))
+    
+    # After a failed exit order the position is not re-triggered for N seconds, doubling per failure
+    EXIT_RETRY_BASE_SECONDS = float(os.getenv("EXIT_RETRY_BASE_SECONDS", "1"))
+    EXIT_RETRY_MAX_SECONDS = float(os.getenv("EXIT_RETRY_MAX_SECONDS", "60"))
+    
+    # Protect new positions with an exchange-side OCO (take-profit limit + stop-limit)
+    USE_OCO_BRACKETS = os.getenv("USE_OCO_BRACKETS", "false").lower() == "true"
+    
+    # Stop leg's limit price beyond its stop trigger (0.005 = 0.5%)
+    OCO_STOP_LIMIT_OFFSET = float(os.getenv("OCO_STOP_LIMIT_OFFSET", "0.005"))
+    
+    # Check OCO bracket state over REST every N seconds (fallback to the user data stream)
+    OCO_RECONCILE_SECONDS = int(os.getenv("OCO_RECONCILE_SECONDS", "30"))
+    
     # ============= RISK MANAGEMENT =============
     # Auto-reinvestment mode: use percentage of balance instead of fixed amount
     USE_PERCENTAGE_RISK = os.getenv("USE_PERCENTAGE_RISK", "true").lower() == "true"
@@ -51,15 +122,44 @@ class Config:
     # Maximum number of simultaneous open trades
     MAX_OPEN_TRADES = int(os.getenv("MAX_OPEN_TRADES", "3"))
     
+    # Stop counting an unfilled order toward MAX_OPEN_TRADES after this many seconds
+    # (its executionReport normally removes it first)
+    OPEN_ORDER_TTL_SECONDS = int(os.getenv("OPEN_ORDER_TTL_SECONDS", "3600"))
+    
+    # Maximum simultaneous open trades on one symbol (0 = no limit beyond MAX_OPEN_TRADES)
+    MAX_POSITIONS_PER_SYMBOL = int(os.getenv("MAX_POSITIONS_PER_SYMBOL", "0"))
+    
+    # Maximum open notional (USDT, at entry) on one symbol, including the new trade (0 = no limit)
+    MAX_SYMBOL_NOTIONAL = float(os.getenv("MAX_SYMBOL_NOTIONAL", "0"))
+    
+    # Maximum open notional (USDT, at entry) across all positions, including the new trade (0 = no limit)
+    MAX_PORTFOLIO_NOTIONAL = float(os.getenv("MAX_PORTFOLIO_NOTIONAL", "0"))
+    
     # Maximum trades per day
     MAX_TRADES_PER_DAY = int(os.getenv("MAX_TRADES_PER_DAY", "10"))
     
+    # Count the daily limit over a rolling 24h window instead of resetting at midnight UTC
+    DAILY_LIMIT_ROLLING = os.getenv("DAILY_LIMIT_ROLLING", "false").lower() == "true"
+    
     # Minimum account balance in USDT to allow trading
     MIN_BALANCE_USDT = float(os.getenv("MIN_BALANCE_USDT", "10"))
     
     # Cooldown period between duplicate signals (in seconds)
     SIGNAL_COOLDOWN_SECONDS = int(os.getenv("SIGNAL_COOLDOWN_SECONDS", "300"))
     
+    # Order the risk rules run in (first rejection wins); unlisted rules run after these
+    RISK_RULE_ORDER = [
+        name.strip() for name in
+        os.getenv(
+            "RISK_RULE_ORDER",
+            "confidence,balance,max_risk,open_trades,symbol_positions,daily_limit,cooldown,symbol_notional,portfolio_notional"
+        ).split(",")
+        if name.strip()
+    ]
+    
+    # Per-symbol lock stripes in the risk engine and position manager
+    LOCK_STRIPES = int(os.getenv("LOCK_STRIPES", "16"))
+    
     # Minimum confidence level (0-100) to execute a trade
     MIN_CONFIDENCE = float(os.getenv("MIN_CONFIDENCE", "50"))
     
@@ -82,6 +182,22 @@ class Config:
     SIGNALS_CSV = LOG_DIR / "signals.csv"
     TRADES_CSV = LOG_DIR / "trades.csv"
     
+    # Append-only positions journal: compact to one record per position after N events
+    POSITION_JOURNAL_COMPACT_RECORDS = int(os.getenv("POSITION_JOURNAL_COMPACT_RECORDS", "5000"))
+    
+    # fsync the journal on every open/close (price updates are only flushed)
+    POSITION_JOURNAL_FSYNC = os.getenv("POSITION_JOURNAL_FSYNC", "true").lower() == "true"
+    
+    # Write mark-to-market price updates to the journal in one batch every N seconds
+    POSITION_PRICE_FLUSH_SECONDS = float(os.getenv("POSITION_PRICE_FLUSH_SECONDS", "5"))
+    
+    # Storage backend for positions, trades and signals: "csv" (files above) or "sqlite"
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv").lower()
+    SQLITE_PATH = Path(os.getenv("SQLITE_PATH") or LOG_DIR / "tradingbot.db")
+    
+    # Risk engine state (daily trades, cooldowns, open trades), rewritten on every change
+    RISK_STATE_FILE = Path(os.getenv("RISK_STATE_FILE") or LOG_DIR / "risk_state.json")
+    
     # Ensure log directory exists
     LOG_DIR.mkdir(exist_ok=True)
 
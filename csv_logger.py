@@ -1,6 +1,7 @@
 """
 CSV Logger module - handles all logging to CSV files for human-readable analysis.
 Uses simple CSV format compatible with Excel and data analysis tools.
+With STORAGE_BACKEND=sqlite, signals and trades go to the SQLite store instead.
 """
 
 import csv
@@ -10,6 +11,7 @@ from typing import Optional, Dict, Any
 import threading
 
 from config import Config
+from sqlite_store import sqlite_store
 
 
 class CSVLogger:
@@ -18,7 +20,9 @@ class CSVLogger:
     def __init__(self):
         """Initialize CSV logger and create headers if files don't exist."""
         self._lock = threading.Lock()  # Thread safety for concurrent writes
-        self._ensure_csv_files()
+        self.store = sqlite_store
+        if self.store is None:
+            self._ensure_csv_files()
     
     def _ensure_csv_files(self):
         """Create CSV files with headers if they don't exist."""
@@ -95,6 +99,10 @@ class CSVLogger:
                     'Reason': reason
                 }
                 
+                if self.store is not None:
+                    self.store.insert_signals([dict(row, Confidence=round(confidence, 1))])
+                    return
+                
                 with open(Config.SIGNALS_CSV, 'a', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(
                         f,
@@ -141,6 +149,10 @@ class CSVLogger:
                     'Status': status
                 }
                 
+                if self.store is not None:
+                    self.store.insert_trades([dict(row, TradeAmount=trade_amount, Price=price)])
+                    return
+                
                 with open(Config.TRADES_CSV, 'a', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(
                         f,
@@ -1,154 +1,460 @@
 """
 Exit Manager - Background task that monitors open positions and executes automatic exits.
-This runs every 30 seconds to check:
-1. Stop-loss levels - if price drops 1%, automatically sell
-2. Take-profit levels - if price rises 2.5%, automatically sell to lock in profit
+Stop-loss and take-profit levels are checked on every streamed price tick, with
+volatility-adaptive polling (poll_scheduler.py) for symbols whose stream is stale.
 """
 
-import threading
-from typing import Optional
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
+from config import Config
 from csv_logger import logger
+from metrics import LatencyHistogram
+from models import Position
 from positions import position_manager
-from binance_client import get_binance_client
+from poll_scheduler import PollScheduler
+from price_book import price_book
+from async_binance_client import get_async_binance_client
+from rate_limiter import api_priority, Priority
+
+
+@dataclass
+class ExitAttempt:
+    """One triggered exit and its outcome."""
+    
+    position_id: str
+    symbol: str
+    exit_type: str
+    source: str  # stream or poll
+    trigger_price: float
+    triggered_at: float  # time.perf_counter()
+    outcome: str = "in_flight"  # closed, already_closed, bracketed, order_failed, close_failed, error
+    pnl: Optional[float] = None
+    order_ms: Optional[float] = None  # trigger until the exit order call returned
+    elapsed_ms: Optional[float] = None  # trigger until the position was closed and persisted
+    timed_out: bool = False
+    
+    def report(self) -> Dict:
+        """JSON-friendly summary for /status."""
+        report = asdict(self)
+        del report['triggered_at']
+        return report
 
 
 class ExitManager:
-    """Monitors and executes automatic stop-loss and take-profit exits."""
+    """
+    Monitors and executes automatic stop-loss and take-profit exits.
+    Runs as asyncio tasks on the app's event loop, at most EXIT_WORKERS exits at
+    once. Bracketed positions (brackets.py) are not in the trigger index, so
+    their exits come from the bracket's fills instead.
+    """
     
-    def __init__(self, check_interval: int = 30):
+    def __init__(
+        self,
+        check_interval: int = 30,
+        mode: str = "poll",
+        workers: int = 4,
+        exit_timeout: float = 15.0,
+        adaptive: bool = True,
+        poll_min_interval: float = 0.5,
+        poll_safety: float = 3.0,
+        retry_base: float = 1.0,
+        retry_max: float = 60.0
+    ):
         """
         Initialize exit manager.
         
         Args:
-            check_interval: Check positions every N seconds
+            check_interval: Check positions every N seconds (adaptive: at most N seconds apart)
+            mode: "stream" (evaluate on every price tick, poll as fallback) or "poll"
+            workers: Exits executed concurrently
+            exit_timeout: Seconds after which an in-flight exit is reported as timed out
+            adaptive: Schedule each symbol's checks from trigger distance and volatility
+            poll_min_interval: Shortest gap between adaptive checks of a symbol
+            poll_safety: Standard deviations of movement kept before a trigger
+            retry_base: Seconds before a position whose exit order failed may trigger again
+            retry_max: Cap for that delay, which doubles per consecutive failure
         """
         self.check_interval = check_interval
+        self.adaptive = adaptive
+        self.scheduler = PollScheduler(
+            min_interval=poll_min_interval if adaptive else check_interval,
+            max_interval=check_interval,
+            safety=poll_safety
+        )
+        self.mode = mode
+        self.workers = workers
+        self.exit_timeout = exit_timeout
         self.running = False
-        self.thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._exit_tasks: Set[asyncio.Task] = set()
+        
+        # In-flight exits by position key - the guard against selling a position twice
+        self._pending: Dict[str, ExitAttempt] = {}
+        
+        # Failed exits by position key: (monotonic time it may trigger again, current delay)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._retry_after: Dict[str, Tuple[float, float]] = {}
+        self.retries_deferred = 0
+        
+        # Outcome report: counts per outcome and the most recent finished exits
+        self.outcomes: Dict[str, int] = {}
+        self.recent_exits: Deque[ExitAttempt] = deque(maxlen=50)
+        
+        # Trigger-to-order latency per trigger source (ends when the order call returns)
+        self.trigger_latency = {'stream': LatencyHistogram(), 'poll': LatencyHistogram()}
+        # Order return to position closed and persisted (bookkeeping after a fill)
+        self.close_latency = LatencyHistogram()
+        
+        # SL/TP evaluation time of each polling pass (excludes price fetches)
+        self.poll_evaluation = LatencyHistogram()
     
     def start(self):
-        """Start the background monitoring thread."""
+        """Start monitoring as a task on the running event loop (call from the app's loop)."""
         if self.running:
             logger.log_info("Exit manager already running")
             return
         
+        loop = asyncio.get_running_loop()
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
-        logger.log_info(f"Exit manager started (checking every {self.check_interval}s)")
+        self._slots = asyncio.Semaphore(self.workers)
+        if self.mode == "stream":
+            price_book.add_listener(self._on_tick)
+        self._task = loop.create_task(self._monitor_loop())
+        if self.adaptive:
+            cadence = f"every {self.scheduler.min_interval}-{self.check_interval}s (adaptive)"
+        else:
+            cadence = f"every {self.check_interval}s"
+        logger.log_info(
+            f"Exit manager started (mode: {self.mode}, polling {cadence}, {self.workers} concurrent exits)"
+        )
     
-    def stop(self):
-        """Stop the background monitoring thread."""
+    async def stop(self, drain_timeout: float = 10.0):
+        """
+        Stop monitoring and wait for exits already in flight.
+        
+        Args:
+            drain_timeout: Seconds to wait for in-flight exit orders before giving up
+        """
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        price_book.remove_listener(self._on_tick)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        # Orders already sent are allowed to finish (cancelling could lose a fill)
+        if self._exit_tasks:
+            _, not_done = await asyncio.wait(set(self._exit_tasks), timeout=drain_timeout)
+            if not_done:
+                logger.log_error(f"Exit manager stopped with {len(not_done)} exit orders still in flight")
         logger.log_info("Exit manager stopped")
     
-    def _monitor_loop(self):
-        """Main monitoring loop - runs in background thread."""
-        import time
+    async def _monitor_loop(self):
+        """Main monitoring loop - polls the symbols that are due, checks timeouts at least every second."""
         while self.running:
-            try:
-                self._check_all_positions()
-            except Exception as e:
-                logger.log_error(f"Error in exit manager loop: {e}")
+            due = self.scheduler.due(position_manager.trigger_index.symbols())
+            if due:
+                try:
+                    # Price checks queue behind entries; exits switch to the EXIT lane
+                    with api_priority(Priority.POLL):
+                        await self._check_all_positions(due)
+                except Exception as e:
+                    logger.log_error(f"Error in exit manager loop: {e}")
             
-            # Sleep for interval
-            for _ in range(self.check_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
-    
-    def _check_all_positions(self):
-        """Check all open positions for SL/TP triggers."""
+            # Exits run as their own tasks; this loop only reports overdue ones
+            self._check_timeouts()
+            self._prune_retries()
+            next_check = self.scheduler.next_check()
+            delay = 1.0 if next_check is None else next_check - time.monotonic()
+            await asyncio.sleep(max(0.0, min(1.0, delay)))
+    
+    @staticmethod
+    def _position_key(position: Position) -> str:
+        return position.position_id
+    
+    def exit_pending(self, position_id: str) -> bool:
+        """True while an exit order for the position is in flight (brackets must not be placed then)."""
+        return position_id in self._pending
+    
+    def _on_tick(self, symbol: str, price: float):
+        """Evaluate SL/TP for one symbol on a streamed tick (price book listener, on the event loop)."""
+        for position, exit_type in position_manager.trigger_index.crossed(symbol, price):
+            self._trigger(position, price, exit_type, "stream")
+    
+    def _trigger(self, position: Position, price: float, exit_type: str, source: str):
+        """Start an exit task unless one is already in flight for this position."""
+        key = self._position_key(position)
+        if key in self._pending or not self.running:
+            return
+        retry = self._retry_after.get(key)
+        if retry is not None and time.monotonic() < retry[0]:
+            self.retries_deferred += 1
+            return
+        attempt = ExitAttempt(
+            position_id=position.position_id,
+            symbol=position.symbol,
+            exit_type=exit_type,
+            source=source,
+            trigger_price=price,
+            triggered_at=time.perf_counter()
+        )
+        self._pending[key] = attempt
+        
+        short = position.side == "SELL"
+        if exit_type == "STOP_LOSS":
+            comparison = ">=" if short else "<="
+            level = position.stop_loss_price
+        else:
+            comparison = "<=" if short else ">="
+            level = position.take_profit_price
+        logger.log_info(
+            f"{exit_type.replace('_', '-')} triggered for {'SHORT ' if short else ''}{position.symbol} "
+            f"({source}): {price} {comparison} {level}"
+        )
+        task = asyncio.get_running_loop().create_task(self._run_exit(position, attempt))
+        self._exit_tasks.add(task)
+        task.add_done_callback(self._exit_tasks.discard)
+    
+    async def _run_exit(self, position: Position, attempt: ExitAttempt):
+        """Execute one exit (at most `workers` at once), then record its outcome and latency."""
         try:
-            binance = get_binance_client()
-            positions = position_manager.get_open_positions()
-            
-            if not positions:
+            async with self._slots:
+                attempt.outcome, attempt.pnl = await self._execute_exit(
+                    position, attempt.trigger_price, attempt.exit_type, attempt
+                )
+        except Exception as e:
+            logger.log_error(f"Error executing {attempt.exit_type} exit: {e}")
+            attempt.outcome = "error"
+        finally:
+            attempt.elapsed_ms = (time.perf_counter() - attempt.triggered_at) * 1000
+            if attempt.order_ms is not None:
+                self.trigger_latency[attempt.source].observe(attempt.order_ms)
+                if attempt.outcome == "closed":
+                    self.close_latency.observe(attempt.elapsed_ms - attempt.order_ms)
+            self._pending.pop(self._position_key(position), None)
+            self._schedule_retry(self._position_key(position), attempt)
+            self.outcomes[attempt.outcome] = self.outcomes.get(attempt.outcome, 0) + 1
+            self.recent_exits.append(attempt)
+            if attempt.timed_out:
+                logger.log_info(
+                    f"Timed-out {attempt.exit_type} exit for {attempt.symbol} finished after "
+                    f"{attempt.elapsed_ms / 1000:.1f}s: {attempt.outcome}"
+                )
+    
+    def _schedule_retry(self, key: str, attempt: ExitAttempt):
+        """Back off a position whose exit order failed; forget it once the exit went through."""
+        if attempt.outcome not in ("order_failed", "error"):
+            self._retry_after.pop(key, None)
+            return
+        previous = self._retry_after.get(key)
+        delay = min(self.retry_max, previous[1] * 2) if previous else self.retry_base
+        self._retry_after[key] = (time.monotonic() + delay, delay)
+        logger.log_error(
+            f"{attempt.exit_type} exit for {attempt.symbol} [{attempt.position_id}] failed "
+            f"({attempt.outcome}); not retrying for {delay:.0f}s"
+        )
+    
+    def _prune_retries(self):
+        """Drop backoff entries of positions that are no longer open (closed by a bracket, manually...)."""
+        for key in [key for key in self._retry_after if not position_manager.is_open(key)]:
+            del self._retry_after[key]
+    
+    def _check_timeouts(self):
+        """Report exits in flight longer than exit_timeout (once each; the guard stays until they return)."""
+        now = time.perf_counter()
+        for attempt in self._pending.values():
+            if attempt.timed_out or now - attempt.triggered_at <= self.exit_timeout:
+                continue
+            attempt.timed_out = True
+            self.outcomes['timeout'] = self.outcomes.get('timeout', 0) + 1
+            logger.log_error(
+                f"{attempt.exit_type} exit for {attempt.symbol} [{attempt.position_id}] still in flight "
+                f"after {self.exit_timeout:.0f}s; position stays locked until the order returns"
+            )
+    
+    async def _check_all_positions(self, symbols: Optional[List[str]] = None):
+        """
+        Check open positions for SL/TP triggers against one price snapshot (polling fallback),
+        then schedule each symbol's next check.
+        
+        Args:
+            symbols: Symbols to check (default: every symbol with open positions)
+        """
+        try:
+            binance = get_async_binance_client()
+            if binance is None:
                 return
+            if symbols is None:
+                symbols = position_manager.trigger_index.symbols()
             
-            for position in positions:
-                symbol = position['Symbol']
-                
-                # Get current price
-                current_price = binance.get_current_price(symbol)
-                if current_price is None:
-                    continue
-                
-                # Update position with current price
+            # One price snapshot for the whole cycle: memory reads where the stream
+            # is fresh, one bulk ticker request for the rest (constant per cycle)
+            requests, weight = binance.ticker_requests, binance.ticker_weight
+            prices = await binance.get_current_prices(symbols)
+            self.scheduler.record_poll(binance.ticker_requests - requests, binance.ticker_weight - weight)
+            
+            started = time.perf_counter()
+            if len(position_manager.position_columns) >= Config.EXIT_VECTORIZE_MIN_POSITIONS:
+                hits = position_manager.position_columns.crossed(prices)
+            else:
+                hits = [
+                    hit for symbol, price in prices.items()
+                    for hit in position_manager.trigger_index.crossed(symbol, price)
+                ]
+            self.poll_evaluation.observe((time.perf_counter() - started) * 1000)
+            
+            for position, exit_type in hits:
+                self._trigger(position, prices[position.symbol], exit_type, "poll")
+            
+            # Mark to market after the trigger check (in memory; written behind)
+            for symbol, current_price in prices.items():
                 position_manager.update_position_price(symbol, current_price)
-                
-                entry_price = position['EntryPrice']
-                stop_loss = position['StopLossPrice']
-                take_profit = position['TakeProfitPrice']
-                side = position['Side']
-                quantity = position['Quantity']
-                
-                # Check stop-loss
-                if side == "BUY" and current_price <= stop_loss:
-                    logger.log_info(f"STOP-LOSS triggered for {symbol}: {current_price} <= {stop_loss}")
-                    self._execute_exit(symbol, quantity, current_price, "STOP_LOSS")
-                
-                # Check take-profit
-                elif side == "BUY" and current_price >= take_profit:
-                    logger.log_info(f"TAKE-PROFIT triggered for {symbol}: {current_price} >= {take_profit}")
-                    self._execute_exit(symbol, quantity, current_price, "TAKE_PROFIT")
-                
-                # For SELL positions (short)
-                elif side == "SELL" and current_price >= stop_loss:
-                    logger.log_info(f"STOP-LOSS triggered for SHORT {symbol}: {current_price} >= {stop_loss}")
-                    self._execute_exit(symbol, quantity, current_price, "STOP_LOSS")
-                
-                elif side == "SELL" and current_price <= take_profit:
-                    logger.log_info(f"TAKE-PROFIT triggered for SHORT {symbol}: {current_price} <= {take_profit}")
-                    self._execute_exit(symbol, quantity, current_price, "TAKE_PROFIT")
+            
+            # Next check per symbol: sooner when close to a trigger or moving fast
+            now = time.monotonic()
+            for symbol in symbols:
+                price = prices.get(symbol)
+                if price is None:
+                    self.scheduler.retry(symbol, now)
+                else:
+                    distance = position_manager.trigger_index.nearest_distance(symbol, price)
+                    self.scheduler.observe(symbol, price, distance, now)
         
         except Exception as e:
             logger.log_error(f"Error checking positions: {e}")
     
-    def _execute_exit(self, symbol: str, quantity: float, exit_price: float, exit_type: str):
+    async def _execute_exit(
+        self,
+        position: Position,
+        exit_price: float,
+        exit_type: str,
+        attempt: Optional[ExitAttempt] = None
+    ) -> Tuple[str, Optional[float]]:
         """
-        Execute position exit (stop-loss or take-profit).
+        Execute one position's exit (stop-loss or take-profit).
+        Other positions on the same symbol are not touched.
         
         Args:
-            symbol: Trading pair
-            quantity: Position size to close
+            position: Position to close
             exit_price: Price to execute at
             exit_type: STOP_LOSS or TAKE_PROFIT
+            attempt: Triggered exit to stamp with the order's return time (order_ms)
+        
+        Returns:
+            (outcome, P&L): outcome is closed, already_closed, bracketed, order_failed, close_failed or error
         """
         try:
-            binance = get_binance_client()
+            binance = get_async_binance_client()
+            if binance is None:
+                logger.log_error(f"Cannot execute {exit_type} exit for {position.symbol}: Binance client not initialized")
+                return "error", None
             
-            # Determine action based on position
-            positions = position_manager.get_open_positions()
-            position = next((p for p in positions if p['Symbol'] == symbol), None)
+            # Still open? (may have been closed since the trigger fired)
+            if not position_manager.is_open(position.position_id):
+                return "already_closed", None
+            current = position_manager.get_position(position.position_id)
             
-            if not position:
-                return
+            symbol = position.symbol
+            
+            # Bracketed meanwhile (placed while this exit was triggering): cancel the OCO
+            # before selling locally; if it can't be cancelled it may be filling, so it owns the exit
+            if current.is_bracketed:
+                with api_priority(Priority.EXIT):
+                    cancelled = await binance.cancel_order_list(symbol, current.oco_list_id)
+                if not cancelled:
+                    logger.log_error(
+                        f"Skipping {exit_type} exit for {symbol} [{position.position_id}]: "
+                        f"OCO bracket {current.oco_list_id} could not be cancelled"
+                    )
+                    return "bracketed", None
+                await asyncio.to_thread(position_manager.set_bracket, position.position_id, None)
             
-            # Execute SELL order to close position
-            logger.log_info(f"Executing {exit_type} exit: SELL {quantity:.8f} {symbol}")
-            order = binance.place_sell_order(symbol, quantity)
+            quantity = position.quantity
+            
+            # Long positions exit with a SELL, shorts with a BUY - jumps the rate-limiter queue
+            action = "SELL" if position.side == "BUY" else "BUY"
+            logger.log_info(f"Executing {exit_type} exit: {action} {quantity:.8f} {symbol} [{position.position_id}]")
+            with api_priority(Priority.EXIT):
+                if action == "SELL":
+                    order = await binance.place_sell_order(symbol, quantity)
+                else:
+                    order = await binance.place_buy_order(symbol, quantity)
+            if attempt is not None:
+                attempt.order_ms = (time.perf_counter() - attempt.triggered_at) * 1000
             
             if order and (order.get('status') == 'FILLED' or float(order.get('executedQty', 0)) > 0):
                 executed_qty = float(order.get('executedQty', quantity))
-                actual_exit_price = float(order.get('cummulativeQuoteAssetTransactedQty', 0)) / executed_qty if executed_qty > 0 else exit_price
+                quote_qty = float(order.get('cummulativeQuoteQty', 0))
+                actual_exit_price = quote_qty / executed_qty if executed_qty > 0 and quote_qty > 0 else exit_price
                 
-                # Close position and calculate P&L
-                pnl = position_manager.close_position(symbol, actual_exit_price, exit_type)
+                # Close this position and calculate P&L (journal / archive writes run off the event loop)
+                pnl = await asyncio.to_thread(
+                    position_manager.close_position, position.position_id, actual_exit_price, exit_type
+                )
                 
                 if pnl is not None:
                     logger.log_info(f"{exit_type} executed: P&L = {pnl:.2f} USDT")
-                else:
-                    logger.log_error(f"Failed to close position for {exit_type}")
-            else:
-                logger.log_error(f"Failed to execute {exit_type} order for {symbol}")
+                    return "closed", pnl
+                logger.log_error(f"Failed to close position for {exit_type}")
+                return "close_failed", None
+            
+            logger.log_error(f"Failed to execute {exit_type} order for {symbol}")
+            return "order_failed", None
         
         except Exception as e:
             logger.log_error(f"Error executing {exit_type} exit: {e}")
+            return "error", None
+    
+    def get_status(self) -> Dict:
+        """
+        Get exit manager state for monitoring.
+        
+        Returns:
+            Dictionary with mode, polling schedule and request budget, in-flight exits,
+            exit outcomes, poll evaluation time and trigger-to-order latency histograms
+        """
+        in_flight = [attempt.report() for attempt in self._pending.values()]
+        return {
+            'running': self.running,
+            'mode': self.mode,
+            'check_interval': self.check_interval,
+            'adaptive_polling': self.adaptive,
+            'polling': self.scheduler.get_status(Config.API_WEIGHT_LIMIT_PER_MINUTE),
+            'exit_workers': self.workers,
+            'exit_timeout': self.exit_timeout,
+            'pending_exits': len(in_flight),
+            'backing_off': len(self._retry_after),
+            'retries_deferred': self.retries_deferred,
+            'in_flight': in_flight,
+            'exit_outcomes': dict(self.outcomes),
+            'recent_exits': [attempt.report() for attempt in self.recent_exits][-10:],
+            'indexed_positions': len(position_manager.trigger_index),
+            'poll_evaluation': self.poll_evaluation.snapshot(),
+            'trigger_to_order_latency': {
+                source: histogram.snapshot() for source, histogram in self.trigger_latency.items()
+            },
+            'order_to_close_latency': self.close_latency.snapshot(),
+        }
 
 
 # Global exit manager instance
-exit_manager = ExitManager(check_interval=30)
+exit_manager = ExitManager(
+    check_interval=Config.EXIT_CHECK_INTERVAL,
+    mode="stream" if Config.USE_PRICE_STREAM and Config.EXIT_MODE == "stream" else "poll",
+    workers=Config.EXIT_WORKERS,
+    exit_timeout=Config.EXIT_TIMEOUT_SECONDS,
+    adaptive=Config.EXIT_ADAPTIVE_POLLING,
+    poll_min_interval=Config.EXIT_POLL_MIN_SECONDS,
+    poll_safety=Config.EXIT_POLL_SAFETY,
+    retry_base=Config.EXIT_RETRY_BASE_SECONDS,
+    retry_max=Config.EXIT_RETRY_MAX_SECONDS
+)
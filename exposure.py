@@ -0,0 +1,109 @@
+"""
+Exposure Ledger - running notional of open positions, per symbol, per side and in total.
+Maintained incrementally by the position manager, so the risk rules read it in constant time.
+"""
+
+import threading
+from typing import Dict
+
+
+class ExposureLedger:
+    """Incremental notional totals over the open position book."""
+
+    def __init__(self):
+        """Initialize an empty ledger."""
+        self._lock = threading.Lock()
+        # symbol -> side -> notional, and symbol -> open position count
+        self._by_symbol: Dict[str, Dict[str, float]] = {}
+        self._symbol_positions: Dict[str, int] = {}
+        self._by_side: Dict[str, float] = {'BUY': 0.0, 'SELL': 0.0}
+        self._positions = 0
+
+    def add(self, symbol: str, side: str, notional: float):
+        """
+        Record a position entering the open book.
+
+        Args:
+            symbol: Trading pair
+            side: BUY or SELL
+            notional: Entry notional in USDT
+        """
+        with self._lock:
+            sides = self._by_symbol.setdefault(symbol, {'BUY': 0.0, 'SELL': 0.0})
+            sides[side] += notional
+            self._by_side[side] += notional
+            self._symbol_positions[symbol] = self._symbol_positions.get(symbol, 0) + 1
+            self._positions += 1
+
+    def remove(self, symbol: str, side: str, notional: float):
+        """
+        Record a position leaving the open book (same notional it was added with).
+
+        Args:
+            symbol: Trading pair
+            side: BUY or SELL
+            notional: Entry notional in USDT
+        """
+        with self._lock:
+            count = self._symbol_positions.get(symbol, 0)
+            if count == 0:
+                return
+            if count == 1:
+                # Drop the entry outright so float error never accumulates
+                del self._symbol_positions[symbol]
+                del self._by_symbol[symbol]
+            else:
+                self._symbol_positions[symbol] = count - 1
+                self._by_symbol[symbol][side] -= notional
+            self._positions -= 1
+            if self._positions == 0:
+                self._by_side = {'BUY': 0.0, 'SELL': 0.0}
+            else:
+                self._by_side[side] -= notional
+
+    def clear(self):
+        """Forget every position."""
+        with self._lock:
+            self._by_symbol.clear()
+            self._symbol_positions.clear()
+            self._by_side = {'BUY': 0.0, 'SELL': 0.0}
+            self._positions = 0
+
+    def symbol_notional(self, symbol: str) -> float:
+        """Gross notional (long + short) open on one symbol."""
+        with self._lock:
+            sides = self._by_symbol.get(symbol)
+            return sides['BUY'] + sides['SELL'] if sides else 0.0
+
+    def total_notional(self) -> float:
+        """Gross notional (long + short) open across the portfolio."""
+        with self._lock:
+            return self._by_side['BUY'] + self._by_side['SELL']
+
+    def open_positions(self) -> int:
+        """Number of open positions."""
+        return self._positions
+    
+    def symbol_positions(self, symbol: str) -> int:
+        """Number of open positions on one symbol."""
+        return self._symbol_positions.get(symbol, 0)
+
+    def get_status(self) -> Dict:
+        """
+        Get exposure for monitoring.
+
+        Returns:
+            Dictionary with gross / net / per-side totals and per-symbol notional
+        """
+        with self._lock:
+            return {
+                'open_positions': self._positions,
+                'gross_notional': round(self._by_side['BUY'] + self._by_side['SELL'], 2),
+                'net_notional': round(self._by_side['BUY'] - self._by_side['SELL'], 2),
+                'long_notional': round(self._by_side['BUY'], 2),
+                'short_notional': round(self._by_side['SELL'], 2),
+                'symbols': {
+                    symbol: {side: round(value, 2) for side, value in sides.items()}
+                    for symbol, sides in self._by_symbol.items()
+                },
+            }
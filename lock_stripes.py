@@ -0,0 +1,46 @@
+"""
+Lock Stripes - a fixed pool of locks shared out by key (lock striping).
+Work on unrelated symbols takes different locks and runs in parallel, while
+all work on one symbol is serialized; the pool size bounds memory however
+many symbols are seen.
+"""
+
+import threading
+import zlib
+from typing import List
+
+
+class LockStripes:
+    """Maps keys (symbols) onto a fixed set of locks."""
+
+    def __init__(self, stripes: int = 16):
+        """
+        Initialize the pool.
+
+        Args:
+            stripes: Number of locks; keys beyond this share locks
+        """
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(max(1, stripes))]
+
+    def index(self, key: str) -> int:
+        """Stripe number for a key (stable across processes, unlike hash())."""
+        return zlib.crc32(key.encode()) % len(self._locks)
+
+    def lock(self, key: str) -> threading.Lock:
+        """
+        Lock guarding a key.
+
+        Args:
+            key: Symbol (or any string key)
+
+        Returns:
+            The stripe's lock (use as a context manager)
+        """
+        return self._locks[self.index(key)]
+
+    def lock_at(self, index: int) -> threading.Lock:
+        """Lock of one stripe (for walking every stripe, e.g. status snapshots)."""
+        return self._locks[index]
+
+    def __len__(self) -> int:
+        return len(self._locks)
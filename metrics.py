@@ -0,0 +1,68 @@
+"""
+Metrics - lightweight in-process latency histograms for /status reporting.
+"""
+
+import bisect
+import threading
+from collections import deque
+from typing import Dict, Sequence
+
+# Default bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a bounded window of recent samples for percentiles."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS, window: int = 1024):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets_ms: Sorted bucket upper bounds in milliseconds
+            window: Number of recent samples kept for percentile estimates
+        """
+        self._lock = threading.Lock()
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)  # last bucket is +inf
+        self._recent = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        """Record one latency sample in milliseconds."""
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+            self._recent.append(ms)
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> Dict:
+        """
+        Get histogram state for monitoring.
+
+        Returns:
+            Dictionary with count, mean/p50/p95/p99/max (ms) and per-bucket counts
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            counts = list(self._counts)
+            count, total, peak = self.count, self.total_ms, self.max_ms
+
+        def pct(p: float):
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))], 3)
+
+        labels = [f"le_{b:g}ms" for b in self.buckets_ms] + ["le_inf"]
+        return {
+            'count': count,
+            'mean_ms': round(total / count, 3) if count else None,
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+            'max_ms': round(peak, 3),
+            'buckets': {label: n for label, n in zip(labels, counts) if n},
+        }
@@ -0,0 +1,231 @@
+"""
+Mock Exchange - local stand-in for Binance market-data websockets and REST API.
+Serves random-walk bookTicker and miniTicker events for whatever symbols a client
+SUBSCRIBEs to, using the same combined-stream message format as Binance, plus the
+subset of /api/v3 REST endpoints the bot uses, with a configurable response latency.
+Signatures are not checked and every market order fills immediately.
+
+Usage:
+  python mock_exchange.py
+  PRICE_STREAM_URL=ws://localhost:8765/stream python app.py
+  (REST on http://localhost:8766/api - see bench_exchange_clients.py)
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import websockets
+from aiohttp import web
+
+HOST = "localhost"
+WS_PORT = 8765
+REST_PORT = 8766
+
+# Starting prices for the random walk (unknown symbols start at 100)
+START_PRICES = {'BTCUSDT': 60000.0, 'ETHUSDT': 3000.0, 'BNBUSDT': 550.0}
+
+
+class MockMarket:
+    """Random-walk prices shared by all connections."""
+
+    def __init__(self, tick_interval: float = 0.1, volatility: float = 0.0005):
+        self.tick_interval = tick_interval
+        self.volatility = volatility
+        self.prices = dict(START_PRICES)
+
+    def step(self, symbol: str) -> float:
+        price = self.prices.get(symbol, 100.0)
+        price *= 1 + random.gauss(0, self.volatility)
+        self.prices[symbol] = price
+        return price
+
+    def events(self, symbol: str):
+        """bookTicker + miniTicker payloads for one tick of a symbol."""
+        price = self.step(symbol)
+        spread = price * 0.0001
+        lower = symbol.lower()
+        return [
+            {'stream': f"{lower}@bookTicker", 'data': {
+                'u': int(time.time() * 1000), 's': symbol,
+                'b': f"{price - spread / 2:.8f}", 'B': "1.00000000",
+                'a': f"{price + spread / 2:.8f}", 'A': "1.00000000",
+            }},
+            {'stream': f"{lower}@miniTicker", 'data': {
+                'e': '24hrMiniTicker', 'E': int(time.time() * 1000), 's': symbol,
+                'c': f"{price:.8f}", 'o': f"{price:.8f}", 'h': f"{price:.8f}",
+                'l': f"{price:.8f}", 'v': "0", 'q': "0",
+            }},
+        ]
+
+
+market = MockMarket()
+
+
+async def market_stream(ws, path=None):
+    """Handle SUBSCRIBE requests and push ticks for subscribed symbols."""
+    symbols = set()
+
+    async def reader():
+        async for raw in ws:
+            request = json.loads(raw)
+            if request.get('method') == 'SUBSCRIBE':
+                for stream in request.get('params', []):
+                    symbols.add(stream.split('@')[0].upper())
+            await ws.send(json.dumps({'result': None, 'id': request.get('id')}))
+
+    reader_task = asyncio.create_task(reader())
+    try:
+        while not reader_task.done():
+            for symbol in list(symbols):
+                for event in market.events(symbol):
+                    await ws.send(json.dumps(event))
+            await asyncio.sleep(market.tick_interval)
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        reader_task.cancel()
+
+
+class MockRestAPI:
+    """Minimal /api/v3 REST emulation with an artificial per-request latency."""
+
+    def __init__(self, latency: float = 0.05, balance_usdt: float = 10000.0):
+        self.latency = latency
+        self.balances = {'USDT': balance_usdt, 'BTC': 0.0, 'ETH': 0.0, 'BNB': 0.0}
+        self.orders = {}
+        self.order_ids = itertools.count(1)
+        self.requests = 0
+        self.minute = 0
+        self.used_weight = 0
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._delay])
+        app.router.add_get('/api/v3/ping', self.ping)
+        app.router.add_get('/api/v3/time', self.server_time)
+        app.router.add_get('/api/v3/exchangeInfo', self.exchange_info)
+        app.router.add_get('/api/v3/ticker/price', self.ticker_price)
+        app.router.add_get('/api/v3/account', self.account)
+        app.router.add_post('/api/v3/order', self.new_order)
+        app.router.add_get('/api/v3/order', self.query_order)
+        app.router.add_delete('/api/v3/order', self.cancel_order)
+        app.router.add_post('/api/v3/userDataStream', self.listen_key)
+        app.router.add_put('/api/v3/userDataStream', self.listen_key)
+        return app
+
+    @web.middleware
+    async def _delay(self, request, handler):
+        self.requests += 1
+        minute = int(time.time() // 60)
+        if minute != self.minute:
+            self.minute, self.used_weight = minute, 0
+        self.used_weight += 1  # flat weight; enough to exercise header tracking
+        await asyncio.sleep(self.latency)
+        response = await handler(request)
+        response.headers['X-MBX-USED-WEIGHT-1M'] = str(self.used_weight)
+        return response
+
+    @staticmethod
+    async def _params(request) -> dict:
+        params = dict(request.query)
+        if request.method != 'GET':
+            params.update(await request.post())
+        return params
+
+    async def ping(self, request):
+        return web.json_response({})
+
+    async def server_time(self, request):
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def exchange_info(self, request):
+        symbols = [{
+            'symbol': symbol,
+            'status': 'TRADING',
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000',
+                 'maxPrice': '1000000.00000000', 'tickSize': '0.01000000'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00001000',
+                 'maxQty': '9000.00000000', 'stepSize': '0.00001000'},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'},
+            ],
+        } for symbol in market.prices]
+        return web.json_response({'timezone': 'UTC', 'symbols': symbols})
+
+    async def ticker_price(self, request):
+        params = await self._params(request)
+        if 'symbol' in params:
+            symbol = params['symbol']
+            return web.json_response({'symbol': symbol, 'price': f"{market.step(symbol):.8f}"})
+        symbols = json.loads(params['symbols']) if 'symbols' in params else list(market.prices)
+        return web.json_response([
+            {'symbol': s, 'price': f"{market.step(s):.8f}"} for s in symbols
+        ])
+
+    async def account(self, request):
+        return web.json_response({'balances': [
+            {'asset': a, 'free': f"{v:.8f}", 'locked': "0.00000000"}
+            for a, v in self.balances.items()
+        ]})
+
+    async def new_order(self, request):
+        params = await self._params(request)
+        symbol = params['symbol']
+        quantity = float(params['quantity'])
+        price = float(params['price']) if 'price' in params else market.step(symbol)
+        order = {
+            'symbol': symbol,
+            'orderId': next(self.order_ids),
+            'side': params['side'],
+            'type': params['type'],
+            'origQty': params['quantity'],
+            'executedQty': params['quantity'],
+            'cummulativeQuoteQty': f"{quantity * price:.8f}",
+            'status': 'FILLED' if params['type'] == 'MARKET' else 'NEW',
+            'transactTime': int(time.time() * 1000),
+        }
+        self.orders[order['orderId']] = order
+        return web.json_response(order)
+
+    async def query_order(self, request):
+        params = await self._params(request)
+        order = self.orders.get(int(params['orderId']))
+        if order is None:
+            return web.json_response({'code': -2013, 'msg': 'Order does not exist.'}, status=400)
+        return web.json_response(order)
+
+    async def cancel_order(self, request):
+        params = await self._params(request)
+        order = self.orders.get(int(params['orderId']))
+        if order is None:
+            return web.json_response({'code': -2011, 'msg': 'Unknown order sent.'}, status=400)
+        order['status'] = 'CANCELED'
+        return web.json_response(order)
+
+    async def listen_key(self, request):
+        return web.json_response({'listenKey': 'mock-listen-key'})
+
+
+async def start_rest(api: MockRestAPI, port: int = REST_PORT) -> web.AppRunner:
+    """Start the REST stand-in on the current loop; returns the runner for cleanup."""
+    runner = web.AppRunner(api.app())
+    await runner.setup()
+    await web.TCPSite(runner, HOST, port).start()
+    return runner
+
+
+async def main():
+    runner = await start_rest(MockRestAPI())
+    async with websockets.serve(market_stream, HOST, WS_PORT):
+        print(f"Mock market stream on ws://{HOST}:{WS_PORT}/stream")
+        print(f"Mock REST API on http://{HOST}:{REST_PORT}/api")
+        try:
+            await asyncio.Future()
+        finally:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Models - typed records shared across modules.
+Position replaces the string-keyed dicts that used to travel from positions.csv
+through the exit manager. Numeric fields are floats from the moment a position
+is opened or loaded; the column-named dict form ('StopLossPrice', ...) exists
+only at the persistence edge (journal, CSV export/archive, SQLite).
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar, Dict, Optional
+
+
+def new_position_id() -> str:
+    """Short random id, unique for the life of the bot."""
+    return uuid.uuid4().hex[:16]
+
+
+@dataclass(slots=True)
+class Position:
+    """One open or closed position."""
+
+    position_id: str
+    symbol: str
+    side: str  # BUY (long) or SELL (short)
+    quantity: float
+    entry_price: float
+    stop_loss_price: float
+    take_profit_price: float
+    entry_time: str
+    current_price: float
+    status: str = "OPEN"
+    exit_time: str = ""
+    exit_price: Optional[float] = None
+    pnl: Optional[float] = None
+    pnl_percent: Optional[float] = None
+    oco_list_id: Optional[int] = None  # exchange-side OCO bracket protecting the position
+
+    # Attribute -> persisted column name (journal, CSV, SQLite)
+    RECORD_KEYS: ClassVar[Dict[str, str]] = {
+        'position_id': 'PositionId',
+        'entry_time': 'EntryTime',
+        'symbol': 'Symbol',
+        'side': 'Side',
+        'quantity': 'Quantity',
+        'entry_price': 'EntryPrice',
+        'stop_loss_price': 'StopLossPrice',
+        'take_profit_price': 'TakeProfitPrice',
+        'current_price': 'CurrentPrice',
+        'status': 'Status',
+        'exit_time': 'ExitTime',
+        'exit_price': 'ExitPrice',
+        'pnl': 'PnL',
+        'pnl_percent': 'PnLPercent',
+        'oco_list_id': 'OcoListId',
+    }
+    ATTRIBUTES: ClassVar[Dict[str, str]] = {key: attr for attr, key in RECORD_KEYS.items()}
+    EXIT_ATTRIBUTES: ClassVar[tuple] = ('status', 'exit_time', 'exit_price', 'pnl', 'pnl_percent')
+
+    @classmethod
+    def open(
+        cls,
+        symbol: str,
+        side: str,
+        quantity: float,
+        entry_price: float,
+        stop_loss_price: float,
+        take_profit_price: float
+    ) -> "Position":
+        """New OPEN position with a fresh id, entered now."""
+        return cls(
+            position_id=new_position_id(),
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            entry_price=entry_price,
+            stop_loss_price=stop_loss_price,
+            take_profit_price=take_profit_price,
+            entry_time=datetime.utcnow().isoformat(),
+            current_price=entry_price
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == "OPEN"
+
+    @property
+    def is_bracketed(self) -> bool:
+        """SL/TP are held by the exchange (OCO), not monitored locally."""
+        return self.oco_list_id is not None
+
+    @property
+    def entry_notional(self) -> float:
+        """Position size in quote currency at entry (quantity x entry price)."""
+        return self.quantity * self.entry_price
+
+    # ----- persistence edge -----
+
+    def to_record(self) -> Dict[str, Any]:
+        """Column-named dict for the journal, CSV files and SQLite."""
+        return {key: getattr(self, attr) for attr, key in self.RECORD_KEYS.items()}
+
+    def exit_record(self) -> Dict[str, Any]:
+        """Column-named exit fields (Status, ExitTime, ExitPrice, PnL, PnLPercent)."""
+        return {self.RECORD_KEYS[attr]: getattr(self, attr) for attr in self.EXIT_ATTRIBUTES}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Position":
+        """
+        Build from a column-named dict whose numeric fields are already numbers
+        (journal/SQLite rows, or CSV rows after position_archive.from_csv_row).
+        """
+        position = cls(**{attr: record[key] for key, attr in cls.ATTRIBUTES.items() if key in record})
+        position.exit_time = position.exit_time or ""
+        if position.current_price is None:
+            position.current_price = position.entry_price
+        return position
+
+    def update_from_record(self, fields: Dict[str, Any]):
+        """Apply column-named fields (journal update/close events)."""
+        for key, value in fields.items():
+            setattr(self, self.ATTRIBUTES[key], value)
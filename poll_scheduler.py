@@ -0,0 +1,185 @@
+"""
+Poll Scheduler - volatility-adaptive check times for the exit polling pass.
+Also keeps a one-minute window of polls and ticker requests for /status.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class _SymbolState:
+    """Last observation, volatility estimate and next check time for one symbol."""
+
+    __slots__ = ('price', 'observed_at', 'variance', 'interval', 'next_check')
+
+    def __init__(self, variance: float):
+        self.price: Optional[float] = None
+        self.observed_at = 0.0
+        self.variance = variance  # per second, of log returns
+        self.interval = 0.0
+        self.next_check = 0.0
+
+
+class PollScheduler:
+    """Per-symbol adaptive polling intervals plus a rolling request-budget window."""
+
+    # Volatility assumed before a symbol has been observed (~1.1% per hour)
+    PRIOR_SIGMA = 3e-4
+    # Half-life (seconds) of the volatility EWMA
+    VOLATILITY_HALFLIFE = 300.0
+    # Retry delay for a symbol whose price could not be fetched
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 30.0, safety: float = 3.0):
+        """
+        Initialize scheduler.
+
+        Args:
+            min_interval: Shortest gap between checks of a symbol (seconds)
+            max_interval: Longest gap between checks of a symbol (seconds)
+            safety: Standard deviations of movement that must fit before a trigger
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.safety = safety
+        self._symbols: Dict[str, _SymbolState] = {}
+
+        # (monotonic time, ticker requests, request weight) per polling pass, last 60s
+        self._polls: Deque[Tuple[float, int, int]] = deque()
+
+    # ----- scheduling -----
+
+    def due(self, symbols: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """
+        Symbols to check now. Symbols seen for the first time are due at once;
+        symbols no longer passed in are forgotten.
+
+        Args:
+            symbols: Symbols with open positions
+            now: time.monotonic() (default: current)
+        """
+        now = time.monotonic() if now is None else now
+        symbols = set(symbols)
+        for symbol in [s for s in self._symbols if s not in symbols]:
+            del self._symbols[symbol]
+        due = []
+        for symbol in symbols:
+            state = self._symbols.get(symbol)
+            if state is None:
+                state = self._symbols[symbol] = _SymbolState(self.PRIOR_SIGMA ** 2)
+            if state.next_check <= now:
+                due.append(symbol)
+        return due
+
+    def next_check(self) -> Optional[float]:
+        """Earliest scheduled check (monotonic time), or None if nothing is tracked."""
+        return min((state.next_check for state in self._symbols.values()), default=None)
+
+    def observe(self, symbol: str, price: float, distance: Optional[float], now: Optional[float] = None) -> float:
+        """
+        Record a checked price and schedule the symbol's next check.
+
+        Args:
+            symbol: Trading pair
+            price: Price used for this check
+            distance: Relative distance to the nearest trigger (None: no positions left)
+            now: time.monotonic() (default: current)
+
+        Returns:
+            Seconds until the next check
+        """
+        now = time.monotonic() if now is None else now
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolState(self.PRIOR_SIGMA ** 2)
+
+        if state.price and price > 0 and now > state.observed_at:
+            elapsed = now - state.observed_at
+            sample = math.log(price / state.price) ** 2 / elapsed
+            weight = 1.0 - 0.5 ** (elapsed / self.VOLATILITY_HALFLIFE)
+            state.variance += weight * (sample - state.variance)
+        state.price = price
+        state.observed_at = now
+
+        state.interval = self.interval_for(distance, math.sqrt(state.variance))
+        state.next_check = now + state.interval
+        return state.interval
+
+    def retry(self, symbol: str, now: Optional[float] = None):
+        """Schedule a symbol whose price could not be fetched for a quick retry."""
+        now = time.monotonic() if now is None else now
+        state = self._symbols.get(symbol)
+        if state is not None:
+            state.next_check = now + min(self.RETRY_SECONDS, self.max_interval)
+
+    def interval_for(self, distance: Optional[float], sigma: float) -> float:
+        """
+        Seconds until a check is needed for a price `distance` (relative) from its nearest trigger:
+
+            interval = (distance / (safety * sigma)) ** 2     clamped to [min, max]
+
+        Args:
+            distance: Relative distance to the nearest trigger (<= 0: already crossed)
+            sigma: Volatility of log returns per sqrt(second)
+        """
+        if distance is None:
+            return self.max_interval
+        if distance <= 0:
+            return self.min_interval
+        sigma = max(sigma, self.PRIOR_SIGMA / 100)
+        interval = (distance / (self.safety * sigma)) ** 2
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    # ----- request budget -----
+
+    def record_poll(self, requests: int, weight: int, now: Optional[float] = None):
+        """
+        Record one polling pass and the ticker requests it made.
+
+        Args:
+            requests: REST ticker requests made by the pass (0 when the price book served it)
+            weight: Request weight they consumed
+        """
+        now = time.monotonic() if now is None else now
+        self._polls.append((now, requests, weight))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._polls and self._polls[0][0] < now - 60.0:
+            self._polls.popleft()
+
+    def get_status(self, weight_limit: Optional[int] = None) -> Dict:
+        """
+        Get scheduler state for monitoring.
+
+        Args:
+            weight_limit: Exchange weight limit per minute (for the budget share)
+
+        Returns:
+            Dictionary with interval bounds, current per-symbol intervals and the
+            last minute's polls, ticker requests and request weight
+        """
+        now = time.monotonic()
+        self._trim(now)
+        weight = sum(w for _, _, w in self._polls)
+        status = {
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'safety': self.safety,
+            'symbols': {
+                symbol: {
+                    'interval': round(state.interval, 3),
+                    'next_check_in': round(max(0.0, state.next_check - now), 3),
+                    'sigma_per_sqrt_s': state.variance ** 0.5,
+                }
+                for symbol, state in self._symbols.items()
+            },
+            'polls_last_minute': len(self._polls),
+            'ticker_requests_last_minute': sum(r for _, r, _ in self._polls),
+            'ticker_weight_last_minute': weight,
+        }
+        if weight_limit:
+            status['weight_budget_share'] = round(weight / weight_limit, 4)
+        return status
@@ -0,0 +1,169 @@
+"""
+Position Archive - closed positions in date-partitioned CSV files.
+Also defines the positions CSV row format shared with the positions.csv export.
+"""
+
+import csv
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from models import Position
+
+# Column order of positions.csv and the archive partitions
+CSV_FIELDS = [
+    'EntryTime', 'Symbol', 'Side', 'Quantity', 'EntryPrice',
+    'StopLossPrice', 'TakeProfitPrice', 'CurrentPrice',
+    'Status', 'ExitTime', 'ExitPrice', 'PnL', 'PnLPercent', 'PositionId', 'OcoListId'
+]
+
+# Numeric columns and their CSV format
+NUMERIC_FORMATS = {
+    'Quantity': "{:.8f}",
+    'EntryPrice': "{:.2f}",
+    'StopLossPrice': "{:.2f}",
+    'TakeProfitPrice': "{:.2f}",
+    'CurrentPrice': "{:.2f}",
+    'ExitPrice': "{:.2f}",
+    'PnL': "{:.2f}",
+    'PnLPercent': "{:.2f}%",
+}
+
+
+def parse_number(value) -> Optional[float]:
+    """Number from a CSV cell ('' -> None, '1.5%' -> 1.5)."""
+    if value in (None, ''):
+        return None
+    return float(str(value).rstrip('%'))
+
+
+def to_csv_row(position: Dict[str, Any]) -> Dict[str, str]:
+    """Format a position dict as a CSV row."""
+    row = {}
+    for field in CSV_FIELDS:
+        value = position.get(field)
+        if value is None:
+            row[field] = ''
+        elif field in NUMERIC_FORMATS:
+            row[field] = NUMERIC_FORMATS[field].format(value)
+        else:
+            row[field] = value
+    return row
+
+
+def from_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """Parse a CSV row back into a position dict with numeric fields."""
+    position = {field: row.get(field, '') for field in CSV_FIELDS}
+    for field in NUMERIC_FORMATS:
+        position[field] = parse_number(row.get(field))
+    if position['CurrentPrice'] is None:
+        position['CurrentPrice'] = position['EntryPrice']
+    position['OcoListId'] = int(row['OcoListId']) if row.get('OcoListId') else None
+    return position
+
+
+class PositionArchive:
+    """Append-only, one-file-per-UTC-day store of closed positions."""
+
+    PREFIX = "positions-"
+
+    def __init__(self, directory: Path):
+        """
+        Initialize archive (the directory is created on first write).
+
+        Args:
+            directory: Folder holding the daily partition files
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self.archived = 0  # positions written by this process
+
+    def partition_path(self, day: date) -> Path:
+        """File holding positions closed on a UTC day."""
+        return self.directory / f"{self.PREFIX}{day.isoformat()}.csv"
+
+    @staticmethod
+    def _exit_day(position: Position) -> date:
+        if position.exit_time:
+            return datetime.fromisoformat(position.exit_time).date()
+        return datetime.utcnow().date()
+
+    def append(self, positions: Iterable[Position]):
+        """
+        Append closed positions to their exit-day partitions.
+
+        Args:
+            positions: Closed positions (exit_time decides the partition)
+        """
+        by_day: Dict[date, List[Position]] = {}
+        for position in positions:
+            by_day.setdefault(self._exit_day(position), []).append(position)
+        if not by_day:
+            return
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for day, rows in by_day.items():
+                path = self.partition_path(day)
+                new_file = not path.exists()
+                with open(path, 'a', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                    if new_file:
+                        writer.writeheader()
+                    writer.writerows(to_csv_row(p.to_record()) for p in rows)
+                self.archived += len(rows)
+
+    def partitions(self) -> List[date]:
+        """UTC days that have an archive file, oldest first."""
+        days = []
+        for path in self.directory.glob(f"{self.PREFIX}*.csv"):
+            try:
+                days.append(date.fromisoformat(path.stem[len(self.PREFIX):]))
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def query(
+        self,
+        start: date,
+        end: Optional[date] = None,
+        symbol: Optional[str] = None
+    ) -> Iterator[Position]:
+        """
+        Closed positions whose exit falls on start..end (inclusive UTC days).
+
+        Args:
+            start: First day
+            end: Last day (default: start)
+            symbol: Only this trading pair
+
+        Yields:
+            Positions, in exit-day order
+        """
+        end = end or start
+        day = start
+        while day <= end:
+            path = self.partition_path(day)
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        if symbol is None or row['Symbol'] == symbol:
+                            yield Position.from_record(from_csv_row(row))
+            day += timedelta(days=1)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get archive state for monitoring.
+
+        Returns:
+            Dictionary with directory, partition count/range and positions archived this run
+        """
+        days = self.partitions()
+        return {
+            'directory': str(self.directory),
+            'partitions': len(days),
+            'first_day': days[0].isoformat() if days else None,
+            'last_day': days[-1].isoformat() if days else None,
+            'archived_this_run': self.archived,
+        }
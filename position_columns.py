@@ -0,0 +1,155 @@
+"""
+Position Columns - open positions as NumPy column arrays.
+A full exit-check pass tests every stop-loss / take-profit condition in a few
+array operations instead of a Python loop over positions.
+"""
+
+import threading
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from models import Position
+
+
+class PositionColumns:
+    """Column arrays of open positions, updated incrementally as positions open and close."""
+
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize empty columns.
+
+        Args:
+            capacity: Initial row capacity (doubles when full)
+        """
+        self._lock = threading.Lock()
+        self._size = 0
+        self.entry = np.empty(capacity, dtype=np.float64)
+        self.stop = np.empty(capacity, dtype=np.float64)
+        self.target = np.empty(capacity, dtype=np.float64)
+        self.quantity = np.empty(capacity, dtype=np.float64)
+        self.is_long = np.empty(capacity, dtype=np.bool_)
+        self.symbol_code = np.empty(capacity, dtype=np.int32)
+        self._positions: List[Position] = []  # row -> position
+        self._rows: Dict[str, int] = {}  # position id -> row
+        self._codes: Dict[str, int] = {}  # symbol -> code (codes are never reused)
+        self._symbols: List[str] = []  # code -> symbol
+
+    def _grow(self):
+        capacity = len(self.entry) * 2
+        for name in ('entry', 'stop', 'target', 'quantity', 'is_long', 'symbol_code'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _write_row(self, row: int, position: Position):
+        code = self._codes.get(position.symbol)
+        if code is None:
+            code = self._codes[position.symbol] = len(self._symbols)
+            self._symbols.append(position.symbol)
+        self.entry[row] = position.entry_price
+        self.stop[row] = position.stop_loss_price
+        self.target[row] = position.take_profit_price
+        self.quantity[row] = position.quantity
+        self.is_long[row] = position.side != "SELL"
+        self.symbol_code[row] = code
+
+    def add(self, position: Position):
+        """
+        Append (or overwrite) an open position's row.
+
+        Args:
+            position: Open position
+        """
+        with self._lock:
+            row = self._rows.get(position.position_id)
+            if row is None:
+                if self._size == len(self.entry):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                self._positions.append(position)
+                self._rows[position.position_id] = row
+            else:
+                self._positions[row] = position
+            self._write_row(row, position)
+
+    def remove(self, position: Position):
+        """Drop a position's row (no-op if absent); the last row moves into its slot."""
+        with self._lock:
+            row = self._rows.pop(position.position_id, None)
+            if row is None:
+                return
+            last = self._size - 1
+            moved = self._positions.pop()
+            if row != last:
+                for column in (self.entry, self.stop, self.target, self.quantity, self.is_long, self.symbol_code):
+                    column[row] = column[last]
+                self._positions[row] = moved
+                self._rows[moved.position_id] = row
+            self._size = last
+
+    def clear(self):
+        """Drop every row."""
+        with self._lock:
+            self._size = 0
+            self._positions.clear()
+            self._rows.clear()
+
+    def _price_vector_locked(self, prices: Mapping[str, float]) -> np.ndarray:
+        vector = np.full(len(self._symbols), np.nan)
+        for code, symbol in enumerate(self._symbols):
+            price = prices.get(symbol)
+            if price is not None:
+                vector[code] = price
+        return vector
+
+    def price_vector(self, prices: Mapping[str, float]) -> np.ndarray:
+        """
+        Prices aligned by symbol code (NaN where a symbol has no price).
+
+        Args:
+            prices: Latest price per symbol
+        """
+        with self._lock:
+            return self._price_vector_locked(prices)
+
+    def evaluate(self, price_vector: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows whose stop-loss / take-profit is crossed. Row numbers are only
+        stable until the next add/remove; crossed() resolves them to positions.
+
+        Args:
+            price_vector: Prices aligned by symbol code (see price_vector)
+
+        Returns:
+            (stop-loss rows, take-profit rows)
+        """
+        n = self._size
+        price = price_vector[self.symbol_code[:n]]
+        is_long = self.is_long[:n]
+        stop, target = self.stop[:n], self.target[:n]
+        # NaN (no price) compares False everywhere, so those rows never fire
+        stop_hit = np.where(is_long, price <= stop, price >= stop)
+        target_hit = np.where(is_long, price >= target, price <= target) & ~stop_hit
+        return np.flatnonzero(stop_hit), np.flatnonzero(target_hit)
+
+    def crossed(self, prices: Mapping[str, float]) -> List[Tuple[Position, str]]:
+        """
+        Positions whose stop-loss or take-profit is crossed at the given prices.
+
+        Args:
+            prices: Latest price per symbol (symbols without a price are skipped)
+
+        Returns:
+            List of (position, "STOP_LOSS" | "TAKE_PROFIT")
+        """
+        with self._lock:
+            stop_rows, target_rows = self.evaluate(self._price_vector_locked(prices))
+            hits = [(self._positions[row], "STOP_LOSS") for row in stop_rows.tolist()]
+            hits.extend((self._positions[row], "TAKE_PROFIT") for row in target_rows.tolist())
+            return hits
+
+    def __len__(self):
+        return self._size
@@ -1,44 +1,434 @@
 """
 Position Manager - Tracks open trades and manages exit logic (stop-loss and take-profit).
 This is the CRITICAL piece that was missing - automatic profit taking and loss prevention.
+Open positions live in memory; every change is journaled (or written to SQLite).
 """
 
+import copy
 import csv
+import json
+import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 import threading
 
 from config import Config
 from csv_logger import logger
-
+from exposure import ExposureLedger
+from lock_stripes import LockStripes
+from metrics import LatencyHistogram
+from models import Position, new_position_id
+from position_archive import PositionArchive, CSV_FIELDS, from_csv_row, to_csv_row
+from sqlite_store import sqlite_store, SQLiteStore
+from position_columns import PositionColumns
+from trigger_index import TriggerIndex
 
 class PositionManager:
-    """Manages all open trading positions with automatic SL/TP exits."""
+    """
+    Manages all open trading positions with automatic SL/TP exits.
+    Opening, closing or re-bracketing holds the symbol's lock stripe for the whole
+    change, including the write, so one symbol's events are written in order;
+    the book lock is never held across file I/O.
+    """
+    
+    def __init__(self, log_dir: Path = Config.LOG_DIR, store: Optional[SQLiteStore] = None):
+        """
+        Initialize position manager and rebuild the book from the journal (or store).
+        
+        Args:
+            log_dir: Directory holding positions.journal and the positions.csv export
+            store: SQLite store to persist to instead of the journal
+        """
+        # Lock order: symbol stripe -> _compact_lock -> _lock -> _journal_lock
+        self._stripes = LockStripes(Config.LOCK_STRIPES)  # one symbol's open/close/bracket sequence
+        self._compact_lock = threading.Lock()  # one compaction / CSV export at a time
+        self._sync_lock = threading.Lock()  # group commit: one fsync covers every append before it
+        self._lock = threading.Lock()  # the in-memory book
+        self._journal_lock = threading.Lock()  # journal file; taken after _lock, never before
+        self.positions_file = Path(log_dir) / "positions.csv"
+        self.journal_file = Path(log_dir) / "positions.journal"
+        self.compact_every = Config.POSITION_JOURNAL_COMPACT_RECORDS
+        self.fsync = Config.POSITION_JOURNAL_FSYNC
+        self.store = store
+        self.archive = PositionArchive(Path(log_dir) / "archive")
+        
+        # Open positions by id and by symbol
+        self._positions: Dict[str, Position] = {}
+        self._open_by_symbol: Dict[str, Dict[str, Position]] = {}
+        # Closed and out of the book, not yet in the archive (compactions keep them)
+        self._closing: Dict[str, Position] = {}
+        # Filled on the exchange but not yet persisted; the flusher retries them
+        self._unpersisted_opens: Dict[str, Position] = {}
+        self._unpersisted_closes: Dict[str, Position] = {}
+        # Sorted SL/TP levels of open positions, kept in step with open/close
+        self.trigger_index = TriggerIndex()
+        self.position_columns = PositionColumns()  # full-pass vectorized SL/TP checks
+        self.exposure = ExposureLedger()  # open notional per symbol / side / total
+        
+        self._journal = None
+        self._appended_seq = 0  # appends written (never reset)
+        self._synced_seq = 0  # appends known to be on disk
+        self._unarchived: Set[str] = set()  # closed ids found at load that predate archiving
+        self.journal_records = 0  # appended since the last compaction
+        self.compactions = 0
+        self.last_compaction_ms = None
+        self.replay_ms = None
+        
+        # Write-behind mark-to-market: latest unflushed price per position id
+        self.flush_interval = Config.POSITION_PRICE_FLUSH_SECONDS
+        self._dirty_prices: Dict[str, float] = {}
+        self.price_ticks = 0  # in-memory price updates
+        self.price_writes = 0  # update events actually written
+        self.flush_latency = LatencyHistogram()
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        
+        self._load()
+    
+    # ----- startup -----
+    
+    def _load(self):
+        """Replay the journal (or import a legacy positions.csv), then compact."""
+        started = time.perf_counter()
+        try:
+            if self.store is not None:
+                for record in self.store.load_open_positions():
+                    position = Position.from_record(record)
+                    self._positions[position.position_id] = position
+                    self._index_open(position)
+                self.replay_ms = round((time.perf_counter() - started) * 1000, 3)
+                logger.log_info(
+                    f"Loaded {len(self._positions)} open positions from {self.store.path} "
+                    f"in {self.replay_ms:.1f} ms"
+                )
+                return
+            
+            if self.journal_file.exists():
+                self._replay()
+                source = "journal"
+            elif self.positions_file.exists():
+                self._import_csv()
+                source = "positions.csv"
+            else:
+                source = None
+            
+            # Closed positions leave the book; ones closed before archiving existed move now
+            closed = [p for p in self._positions.values() if not p.is_open]
+            self.archive.append(p for p in closed if p.position_id in self._unarchived)
+            self._unarchived.clear()
+            for position in closed:
+                del self._positions[position.position_id]
+            
+            for position in self._positions.values():
+                self._index_open(position)
+            self.replay_ms = round((time.perf_counter() - started) * 1000, 3)
+            
+            self.compact()
+            
+            if source:
+                logger.log_info(
+                    f"Loaded {len(self._positions)} open positions from {source} "
+                    f"in {self.replay_ms:.1f} ms ({len(closed)} closed dropped from the book)"
+                )
+            else:
+                logger.log_info("Created positions journal for tracking open trades")
+        except Exception as e:
+            logger.log_error(f"Failed to load positions: {e}")
+    
+    def _replay(self):
+        """Apply every journal event (one JSON object per line: open / update / close) in order."""
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one partial trailing line
+                    logger.log_error(f"Skipping unreadable positions journal line {line_no}")
+                    continue
+                self._apply(event)
+    
+    def _apply(self, event: Dict[str, Any]):
+        """Apply one journal event to the book (no indexing, no I/O)."""
+        if event['op'] == 'open':
+            position = Position.from_record(event['position'])
+            self._positions[position.position_id] = position
+            if not position.is_open:  # closed but not yet archived when the snapshot was taken
+                self._unarchived.add(position.position_id)
+        else:  # update / close (a close event means the position was archived when it closed)
+            position = self._positions.get(event['id'])
+            if position is not None:
+                position.update_from_record(event['fields'])
+                self._unarchived.discard(event['id'])
+    
+    def _import_csv(self):
+        """One-time migration of a positions.csv written before the journal existed."""
+        with open(self.positions_file, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                position = Position.from_record(from_csv_row(row))
+                position.position_id = position.position_id or new_position_id()
+                self._positions[position.position_id] = position
+                if not position.is_open:
+                    self._unarchived.add(position.position_id)
+    
+    # ----- journal -----
+    
+    def _append(self, events: List[Dict[str, Any]], sync: bool = False):
+        """
+        Append events to the journal. Callers make the in-memory change first,
+        so a compaction that runs before the write already includes it.
+        """
+        lines = "".join(json.dumps(event, separators=(',', ':')) + "\n" for event in events)
+        with self._journal_lock:
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'a', encoding='utf-8')
+            self._journal.write(lines)
+            self._journal.flush()
+            self.journal_records += len(events)
+            self._appended_seq += 1
+            seq = self._appended_seq
+        if sync and self.fsync:
+            self._sync(seq)
+    
+    def _sync(self, seq: int):
+        """
+        Make appends up to seq durable. The fsync runs outside the journal lock,
+        so other symbols keep appending meanwhile, and a single fsync covers
+        every append written before it (group commit).
+        """
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return  # covered by another writer's fsync
+            with self._journal_lock:
+                target = self._appended_seq
+                # No open journal: a compaction since the append wrote (and fsynced) it
+                fd = os.dup(self._journal.fileno()) if self._journal is not None else None
+            if fd is not None:
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._synced_seq = target
+    
+    def _compact(self):
+        """
+        Rewrite the journal as one record per position and refresh the CSV export
+        (hold self._compact_lock). The book is snapshotted under self._lock, and the
+        journal lock is taken before that is released, so every change after the
+        snapshot is appended to the new journal; the file is written without
+        holding self._lock.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            records = [position.to_record() for position in self._positions.values()]
+            # Closed but not yet archived: replay archives them (once - see _apply)
+            records.extend(position.to_record() for position in self._closing.values())
+            # The snapshot carries every in-memory price
+            self._dirty_prices.clear()
+            self._journal_lock.acquire()
+        try:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            
+            tmp = self.journal_file.with_suffix('.journal.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps({'op': 'open', 'position': record}, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.journal_file)
+            self.journal_records = 0
+        finally:
+            self._journal_lock.release()
+        
+        self.compactions += 1
+        self.last_compaction_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._export([record for record in records if record['Status'] == 'OPEN'])
+    
+    def _compact_if_due(self):
+        """Compact once enough events have accumulated, unless a compaction is already running."""
+        if self.journal_records < self.compact_every:
+            return
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            if self.journal_records >= self.compact_every:
+                self._compact()
+        except Exception as e:
+            # The triggering write is already in the journal; the next due check retries
+            logger.log_error(f"Failed to compact positions journal: {e}")
+        finally:
+            self._compact_lock.release()
+    
+    def compact(self):
+        """Compact the journal now."""
+        with self._compact_lock:
+            self._compact()
+    
+    # ----- CSV export -----
+    
+    def _export(self, records: List[Dict[str, Any]]):
+        """Write positions.csv from open position records (atomic replace)."""
+        tmp = self.positions_file.with_suffix('.csv.tmp')
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(to_csv_row(record) for record in records)
+        os.replace(tmp, self.positions_file)
+    
+    def export_csv(self):
+        """Refresh the positions.csv export."""
+        try:
+            with self._compact_lock:
+                with self._lock:
+                    records = [p.to_record() for p in self._positions.values() if p.is_open]
+                self._export(records)
+        except Exception as e:
+            logger.log_error(f"Failed to export positions.csv: {e}")
+    
+    # ----- write-behind price flushing -----
+    
+    def start(self):
+        """Start the background thread that flushes price updates."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.thread.start()
+        logger.log_info(f"Position price flusher started (every {self.flush_interval}s)")
+    
+    def _flush_loop(self):
+        """Flush coalesced price updates every flush_interval seconds."""
+        while self.running:
+            time.sleep(self.flush_interval)
+            self.flush_prices()
+            self.retry_writes()
+    
+    def flush_prices(self):
+        """Write one update event per position whose price changed since the last flush."""
+        try:
+            with self._lock:
+                dirty, self._dirty_prices = self._dirty_prices, {}
+            if not dirty:
+                return
+            
+            started = time.perf_counter()
+            if self.store is not None:
+                self.store.update_prices(dirty)
+            else:
+                self._append([
+                    {'op': 'update', 'id': position_id, 'fields': {'CurrentPrice': price}}
+                    for position_id, price in dirty.items()
+                ])
+            self.price_writes += len(dirty)
+            self.flush_latency.observe((time.perf_counter() - started) * 1000)
+            
+            if self.store is None:
+                self._compact_if_due()
+        except Exception as e:
+            logger.log_error(f"Failed to flush position prices: {e}")
+    
+    def close(self):
+        """Stop the flusher, compact the journal and export positions.csv (call on shutdown)."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=self.flush_interval + 1)
+        self.retry_writes()
+        if self.store is not None:
+            self.flush_prices()
+            return
+        try:
+            self.compact()
+        except Exception as e:
+            logger.log_error(f"Failed to compact positions journal: {e}")
+    
+    # ----- indexes (call with self._lock held, or during load) -----
+    
+    def _index_open(self, position: Position):
+        self._open_by_symbol.setdefault(position.symbol, {})[position.position_id] = position
+        self.exposure.add(position.symbol, position.side, position.entry_notional)
+        if not position.is_bracketed:  # bracketed positions are exited by the exchange
+            self.trigger_index.add(position)
+            self.position_columns.add(position)
+    
+    def _unindex_open(self, position: Position):
+        by_id = self._open_by_symbol.get(position.symbol, {})
+        if by_id.pop(position.position_id, None) is not None:
+            self.exposure.remove(position.symbol, position.side, position.entry_notional)
+        if not by_id:
+            self._open_by_symbol.pop(position.symbol, None)
+        self.trigger_index.remove(position)
+        self.position_columns.remove(position)
+    
+    # ----- persistence (call with the symbol's stripe held, not self._lock) -----
     
-    def __init__(self):
-        """Initialize position manager."""
-        self._lock = threading.Lock()
-        self.positions_file = Path("logs") / "positions.csv"
-        self._ensure_positions_file()
+    def _persist_open(self, position: Position):
+        if self.store is not None:
+            self.store.insert_positions([position.to_record()])
+            return
+        self._append([{'op': 'open', 'position': position.to_record()}], sync=True)
+        self._compact_if_due()
     
-    def _ensure_positions_file(self):
-        """Create positions.csv if it doesn't exist."""
-        if not self.positions_file.exists():
+    def _persist_close(self, position: Position):
+        # Closed before its open was written: write the open record first
+        with self._lock:
+            open_unpersisted = position.position_id in self._unpersisted_opens
+        if open_unpersisted:
+            self._persist_open(position)
+            with self._lock:
+                self._unpersisted_opens.pop(position.position_id, None)
+        
+        fields = position.exit_record()
+        if self.store is not None:
+            self.store.close_position(position.position_id, fields)
+            return
+        
+        # Archive first: the close event marks the position as already archived on replay
+        # (a retried close skips the archive if that part already landed)
+        with self._lock:
+            archived = position.position_id not in self._closing
+        if not archived:
+            self.archive.append([position])
+            with self._lock:
+                self._closing.pop(position.position_id, None)
+        self._append([{'op': 'close', 'id': position.position_id, 'fields': fields}], sync=True)
+        self._compact_if_due()
+    
+    def retry_writes(self):
+        """Persist opens and closes whose write failed (memory already has them)."""
+        with self._lock:
+            opens = list(self._unpersisted_opens.values())
+        for position in opens:
             try:
-                with open(self.positions_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(
-                        f,
-                        fieldnames=[
-                            'EntryTime', 'Symbol', 'Side', 'Quantity', 'EntryPrice',
-                            'StopLossPrice', 'TakeProfitPrice', 'CurrentPrice',
-                            'Status', 'ExitTime', 'ExitPrice', 'PnL', 'PnLPercent'
-                        ]
-                    )
-                    writer.writeheader()
-                logger.log_info("Created positions.csv for tracking open trades")
+                with self._stripes.lock(position.symbol):
+                    with self._lock:
+                        # A close since then writes the open itself (see _persist_close)
+                        if position.position_id not in self._unpersisted_opens or not position.is_open:
+                            continue
+                    self._persist_open(position)
+                    with self._lock:
+                        self._unpersisted_opens.pop(position.position_id, None)
+                logger.log_info(f"Persisted open of position {position.position_id} on retry")
+            except Exception as e:
+                logger.log_error(f"Failed to persist open of position {position.position_id}: {e}")
+        
+        with self._lock:
+            pending = list(self._unpersisted_closes.values())
+        for position in pending:
+            try:
+                with self._stripes.lock(position.symbol):
+                    self._persist_close(position)
+                with self._lock:
+                    self._unpersisted_closes.pop(position.position_id, None)
+                logger.log_info(f"Persisted close of position {position.position_id} on retry")
             except Exception as e:
-                logger.log_error(f"Failed to create positions file: {e}")
+                logger.log_error(f"Failed to persist close of position {position.position_id}: {e}")
+    
+    # ----- positions -----
     
     def open_position(
         self,
@@ -46,9 +436,10 @@ class PositionManager:
         side: str,
         quantity: float,
         entry_price: float
-    ) -> bool:
+    ) -> Optional[str]:
         """
         Record a new open position.
+        A symbol may hold any number of open positions; each gets its own id.
         
         Args:
             symbol: Trading pair (e.g., BTCUSDT)
@@ -57,10 +448,10 @@ class PositionManager:
             entry_price: Entry price in USDT
         
         Returns:
-            True if recorded successfully
+            Position id (also when its write failed and is being retried), None otherwise
         """
         try:
-            with self._lock:
+            with self._stripes.lock(symbol):
                 # Calculate SL and TP
                 if side == "BUY":
                     stop_loss = entry_price * 0.99  # 1% below entry
@@ -69,150 +460,262 @@ class PositionManager:
                     stop_loss = entry_price * 1.01  # 1% above entry (for short)
                     take_profit = entry_price * 0.975  # 2.5% below entry (for short)
                 
-                row = {
-                    'EntryTime': datetime.utcnow().isoformat(),
-                    'Symbol': symbol,
-                    'Side': side,
-                    'Quantity': f"{quantity:.8f}",
-                    'EntryPrice': f"{entry_price:.2f}",
-                    'StopLossPrice': f"{stop_loss:.2f}",
-                    'TakeProfitPrice': f"{take_profit:.2f}",
-                    'CurrentPrice': f"{entry_price:.2f}",
-                    'Status': 'OPEN',
-                    'ExitTime': '',
-                    'ExitPrice': '',
-                    'PnL': '',
-                    'PnLPercent': ''
-                }
+                position = Position.open(symbol, side, quantity, entry_price, stop_loss, take_profit)
                 
-                with open(self.positions_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=row.keys())
-                    writer.writerow(row)
-                
-                logger.log_info(
-                    f"Position opened: {side} {quantity:.8f} {symbol} @ {entry_price:.2f} "
-                    f"| SL: {stop_loss:.2f} | TP: {take_profit:.2f}"
-                )
-                return True
+                with self._lock:
+                    self._positions[position.position_id] = position
+                    self._index_open(position)
+                try:
+                    self._persist_open(position)
+                except Exception as e:
+                    # The entry order already filled, so the position stays in the book and
+                    # under SL/TP monitoring (dropping it would leave it unmanaged on the
+                    # exchange); the flusher retries the write
+                    with self._lock:
+                        self._unpersisted_opens[position.position_id] = position
+                    logger.log_error(
+                        f"POSITION NOT PERSISTED: {side} {quantity:.8f} {symbol} @ {entry_price:.2f} "
+                        f"[{position.position_id}] is open in memory only (will retry): {e}"
+                    )
+            
+            logger.log_info(
+                f"Position opened: {side} {quantity:.8f} {symbol} @ {entry_price:.2f} "
+                f"| SL: {stop_loss:.2f} | TP: {take_profit:.2f} [{position.position_id}]"
+            )
+            return position.position_id
         
         except Exception as e:
             logger.log_error(f"Failed to open position: {e}")
-            return False
+            return None
+    
+    def get_open_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get all open positions, or just one symbol's (per-symbol index, no scan).
+        
+        Args:
+            symbol: Only positions on this trading pair
+        
+        Returns:
+            List of open positions (copies)
+        """
+        with self._lock:
+            if symbol is not None:
+                return [copy.copy(p) for p in self._open_by_symbol.get(symbol, {}).values()]
+            return [
+                copy.copy(position)
+                for by_id in self._open_by_symbol.values()
+                for position in by_id.values()
+            ]
     
-    def get_open_positions(self) -> List[Dict[str, Any]]:
+    def _symbol_of(self, position_id: str) -> Optional[str]:
+        """Symbol of an open position (to pick its lock stripe)."""
+        with self._lock:
+            position = self._positions.get(position_id)
+            return position.symbol if position is not None and position.is_open else None
+    
+    def is_open(self, position_id: str) -> bool:
+        """Whether a position is in the open book (memory only, no store lookup)."""
+        return self._symbol_of(position_id) is not None
+    
+    def get_position(self, position_id: str) -> Optional[Position]:
         """
-        Get all open positions.
+        Get one position by id (open; closed too with the SQLite store,
+        otherwise use archive.query for closed positions).
         
         Returns:
-            List of open position dictionaries
+            Position (copy), or None if unknown
+        """
+        with self._lock:
+            position = self._positions.get(position_id)
+            if position:
+                return copy.copy(position)
+        if self.store is not None:
+            record = self.store.get_position(position_id)
+            return Position.from_record(record) if record else None
+        return None
+    
+    def update_position_price(self, symbol: str, current_price: float) -> bool:
+        """
+        Update current price for a symbol's open positions.
+        Memory only; the journal write happens on the next flush.
         """
         try:
             with self._lock:
-                positions = []
-                if self.positions_file.exists():
-                    with open(self.positions_file, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row.get('Status') == 'OPEN':
-                                # Convert strings to numbers
-                                row['Quantity'] = float(row['Quantity'])
-                                row['EntryPrice'] = float(row['EntryPrice'])
-                                row['StopLossPrice'] = float(row['StopLossPrice'])
-                                row['TakeProfitPrice'] = float(row['TakeProfitPrice'])
-                                row['CurrentPrice'] = float(row.get('CurrentPrice', row['EntryPrice']))
-                                positions.append(row)
-                return positions
+                for position_id, position in self._open_by_symbol.get(symbol, {}).items():
+                    position.current_price = current_price
+                    self._dirty_prices[position_id] = current_price
+                    self.price_ticks += 1
+                return True
         except Exception as e:
-            logger.log_error(f"Failed to get open positions: {e}")
-            return []
+            logger.log_error(f"Failed to update position price: {e}")
+            return False
     
-    def update_position_price(self, symbol: str, current_price: float) -> bool:
-        """Update current price for a position."""
+    def set_bracket(self, position_id: str, oco_list_id: Optional[int]) -> bool:
+        """
+        Record the exchange-side OCO bracket protecting a position, or clear it.
+        A bracketed position leaves the trigger index (no local SL/TP checks);
+        clearing the bracket puts it back under local monitoring.
+        
+        Args:
+            position_id: Open position
+            oco_list_id: Exchange orderListId, or None to clear
+        
+        Returns:
+            True if the position is open and was updated
+        """
         try:
-            with self._lock:
-                positions = []
-                with open(self.positions_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row['Symbol'] == symbol and row['Status'] == 'OPEN':
-                            row['CurrentPrice'] = f"{current_price:.2f}"
-                        positions.append(row)
-                
-                with open(self.positions_file, 'w', newline='', encoding='utf-8') as f:
-                    if positions:
-                        writer = csv.DictWriter(f, fieldnames=positions[0].keys())
-                        writer.writeheader()
-                        writer.writerows(positions)
+            symbol = self._symbol_of(position_id)
+            if symbol is None:
+                return False
+            
+            with self._stripes.lock(symbol):
+                with self._lock:
+                    position = self._positions.get(position_id)
+                    if position is None or not position.is_open:
+                        return False
+                    
+                    previous = position.oco_list_id
+                    self._apply_bracket(position, oco_list_id)
                 
+                try:
+                    if self.store is not None:
+                        self.store.update_bracket(position_id, oco_list_id)
+                    else:
+                        self._append(
+                            [{'op': 'update', 'id': position_id, 'fields': {'OcoListId': oco_list_id}}],
+                            sync=True
+                        )
+                except Exception:
+                    # Not recorded: restore the previous bracket state and monitoring
+                    with self._lock:
+                        if position.is_open:
+                            self._apply_bracket(position, previous)
+                    raise
                 return True
+        
         except Exception as e:
-            logger.log_error(f"Failed to update position price: {e}")
+            logger.log_error(f"Failed to update bracket for position {position_id}: {e}")
             return False
     
+    def _apply_bracket(self, position: Position, oco_list_id: Optional[int]):
+        """Set a position's bracket and move it out of / back into local monitoring (hold self._lock)."""
+        position.oco_list_id = oco_list_id
+        if position.is_bracketed:
+            self.trigger_index.remove(position)
+            self.position_columns.remove(position)
+        else:
+            self.trigger_index.add(position)
+            self.position_columns.add(position)
+    
     def close_position(
         self,
-        symbol: str,
+        position_id: str,
         exit_price: float,
         exit_type: str = "MANUAL"
     ) -> Optional[float]:
         """
-        Close a position and calculate P&L.
+        Close one position and calculate P&L.
+        Other positions on the same symbol are left untouched.
         
         Args:
-            symbol: Trading pair
+            position_id: Id of the position to close
             exit_price: Price at which position was closed
             exit_type: Reason for exit (MANUAL, STOP_LOSS, TAKE_PROFIT)
         
         Returns:
-            P&L amount, or None if failed
+            P&L amount, or None if failed (or the position is not open)
         """
         try:
-            with self._lock:
-                positions = []
-                pnl = None
-                
-                with open(self.positions_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row['Symbol'] == symbol and row['Status'] == 'OPEN':
-                            # Calculate P&L
-                            entry_price = float(row['EntryPrice'])
-                            quantity = float(row['Quantity'])
-                            side = row['Side']
-                            
-                            if side == "BUY":
-                                pnl = (exit_price - entry_price) * quantity
-                                pnl_percent = ((exit_price - entry_price) / entry_price) * 100
-                            else:  # SELL
-                                pnl = (entry_price - exit_price) * quantity
-                                pnl_percent = ((entry_price - exit_price) / entry_price) * 100
-                            
-                            # Update position
-                            row['Status'] = 'CLOSED'
-                            row['ExitTime'] = datetime.utcnow().isoformat()
-                            row['ExitPrice'] = f"{exit_price:.2f}"
-                            row['PnL'] = f"{pnl:.2f}"
-                            row['PnLPercent'] = f"{pnl_percent:.2f}%"
-                            
-                            logger.log_info(
-                                f"Position closed: {side} {quantity:.8f} {symbol} "
-                                f"@ {exit_price:.2f} | P&L: {pnl:.2f} USDT ({pnl_percent:.2f}%)"
-                            )
-                        
-                        positions.append(row)
-                
-                with open(self.positions_file, 'w', newline='', encoding='utf-8') as f:
-                    if positions:
-                        writer = csv.DictWriter(f, fieldnames=positions[0].keys())
-                        writer.writeheader()
-                        writer.writerows(positions)
-                
-                return pnl
+            symbol = self._symbol_of(position_id)
+            if symbol is None:
+                logger.log_error(f"Cannot close position {position_id}: not open")
+                return None
+            
+            with self._stripes.lock(symbol):
+                with self._lock:
+                    # Re-check under the stripe: a concurrent close may have won
+                    position = self._positions.get(position_id)
+                    if position is None or not position.is_open:
+                        logger.log_error(f"Cannot close position {position_id}: not open")
+                        return None
+                    
+                    # Calculate P&L
+                    entry_price = position.entry_price
+                    quantity = position.quantity
+                    side = position.side
+                    
+                    if side == "BUY":
+                        pnl = (exit_price - entry_price) * quantity
+                        pnl_percent = ((exit_price - entry_price) / entry_price) * 100
+                    else:  # SELL
+                        pnl = (entry_price - exit_price) * quantity
+                        pnl_percent = ((entry_price - exit_price) / entry_price) * 100
+                    
+                    # Update position; it leaves the book in the same step, so a
+                    # compaction never snapshots it as an open record
+                    self._unindex_open(position)
+                    position.status = 'CLOSED'
+                    position.exit_time = datetime.utcnow().isoformat()
+                    position.exit_price = exit_price
+                    position.pnl = pnl
+                    position.pnl_percent = pnl_percent
+                    self._dirty_prices.pop(position.position_id, None)
+                    del self._positions[position_id]
+                    if self.store is None:
+                        self._closing[position_id] = position
+                try:
+                    self._persist_close(position)
+                except Exception as e:
+                    # The exit already happened on the exchange, so the close stands
+                    # (reopening would let the exit fire twice); the flusher retries the write
+                    with self._lock:
+                        self._unpersisted_closes[position_id] = position
+                    logger.log_error(f"Failed to persist close of position {position_id} (will retry): {e}")
+            
+            logger.log_info(
+                f"Position closed ({exit_type}): {side} {quantity:.8f} {position.symbol} "
+                f"@ {exit_price:.2f} | P&L: {pnl:.2f} USDT ({pnl_percent:.2f}%) [{position_id}]"
+            )
+            return pnl
         
         except Exception as e:
             logger.log_error(f"Failed to close position: {e}")
             return None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get position book and journal state for monitoring.
+        
+        Returns:
+            Dictionary with position counts and journal/compaction stats
+        """
+        with self._lock:
+            return {
+                'backend': 'sqlite' if self.store is not None else 'journal',
+                'open_positions': len(self._positions),
+                'locally_monitored': len(self.trigger_index),
+                'bracketed': len(self._positions) - len(self.trigger_index),
+                'open_symbols': len(self._open_by_symbol),
+                'unpersisted_opens': len(self._unpersisted_opens),
+                'unpersisted_closes': len(self._unpersisted_closes),
+                'exposure': self.exposure.get_status(),
+                'journal_records': self.journal_records,
+                'compact_every': self.compact_every,
+                'compactions': self.compactions,
+                'last_compaction_ms': self.last_compaction_ms,
+                'replay_ms': self.replay_ms,
+                'archive': self.archive.get_status() if self.store is None else None,
+                'price_flush': {
+                    'interval_seconds': self.flush_interval,
+                    'pending': len(self._dirty_prices),
+                    'ticks': self.price_ticks,
+                    'writes': self.price_writes,
+                    # in-memory updates per written record (higher = more coalescing)
+                    'coalescing_ratio': round(self.price_ticks / self.price_writes, 2) if self.price_writes else None,
+                    'latency': self.flush_latency.snapshot(),
+                },
+            }
 
 
 # Global position manager instance
-position_manager = PositionManager()
+position_manager = PositionManager(store=sqlite_store)
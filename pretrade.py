@@ -0,0 +1,80 @@
+"""
+Pre-trade Context - everything a webhook needs from the exchange, fetched once and concurrently.
+Balance, price and symbol filters are gathered in parallel, so webhook-to-order
+latency is the slowest single lookup instead of the sum. The frozen context is then
+the only source the risk check, quantity sizing and logging read from, so nothing
+is looked up twice within one request.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
+
+from csv_logger import logger
+from symbol_cache import SymbolFilters
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class PreTradeContext:
+    """Immutable snapshot of account and market state for one signal."""
+
+    symbol: str
+    action: str
+    balance: float
+    price: Optional[float]
+    filters: Optional[SymbolFilters]
+    fetch_ms: float = 0.0
+    timings_ms: Dict[str, float] = field(default_factory=dict, compare=False)
+
+    def describe_timings(self) -> str:
+        """Human-readable fetch timings for log lines."""
+        parts = ", ".join(f"{name} {ms:.1f}" for name, ms in self.timings_ms.items())
+        return f"{self.fetch_ms:.1f} ms ({parts})"
+
+
+async def _timed(coro: Awaitable[T]) -> Tuple[T, float]:
+    """Await a coroutine and return (result, elapsed ms)."""
+    start = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def build_pretrade_context(
+    client,
+    symbol: str,
+    action: str,
+    quote_asset: str = "USDT"
+) -> PreTradeContext:
+    """
+    Fetch balance, price and symbol filters concurrently.
+
+    Args:
+        client: AsyncBinanceAPIClient
+        symbol: Trading pair (e.g., BTCUSDT)
+        action: BUY or SELL
+        quote_asset: Asset whose balance funds the trade
+
+    Returns:
+        PreTradeContext (price/filters are None if their lookup failed)
+    """
+    start = time.perf_counter()
+    (balance, balance_ms), (price, price_ms), (filters, filters_ms) = await asyncio.gather(
+        _timed(client.get_account_balance(quote_asset)),
+        _timed(client.get_current_price(symbol)),
+        _timed(client.get_symbol_filters(symbol)),
+    )
+
+    context = PreTradeContext(
+        symbol=symbol,
+        action=action,
+        balance=balance,
+        price=price,
+        filters=filters,
+        fetch_ms=(time.perf_counter() - start) * 1000,
+        timings_ms={'balance': balance_ms, 'price': price_ms, 'filters': filters_ms},
+    )
+    logger.log_info(f"Pre-trade context for {action} {symbol}: {context.describe_timings()}")
+    return context
@@ -0,0 +1,218 @@
+"""
+Price Book - in-memory last/bid/ask per symbol fed by Binance websocket streams.
+Subscribes to <symbol>@bookTicker and <symbol>@miniTicker so price lookups on the
+hot path are memory reads. Quotes older than PRICE_STALE_SECONDS are treated as
+missing and the caller falls back to REST.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config import Config
+from csv_logger import logger
+from ws_stream import StreamWorker
+
+
+class PriceQuote:
+    """Latest known prices for one symbol."""
+
+    __slots__ = ('symbol', 'last', 'bid', 'ask', 'received_at')
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.last: Optional[float] = None
+        self.bid: Optional[float] = None
+        self.ask: Optional[float] = None
+        self.received_at = 0.0  # time.monotonic() of the latest update
+
+    @property
+    def price(self) -> Optional[float]:
+        """Mid price when the book is known, otherwise last trade price."""
+        if self.bid and self.ask:
+            return (self.bid + self.ask) / 2
+        return self.last
+
+    def age(self) -> float:
+        """Seconds since the last update."""
+        return time.monotonic() - self.received_at
+
+    def to_dict(self) -> Dict:
+        return {
+            'last': self.last,
+            'bid': self.bid,
+            'ask': self.ask,
+            'age_seconds': round(self.age(), 3),
+        }
+
+
+class PriceBook(StreamWorker):
+    """Streaming price cache with per-symbol staleness tracking."""
+
+    def __init__(self, stale_seconds: float = 5.0):
+        """
+        Initialize an empty price book.
+
+        Args:
+            stale_seconds: Quotes older than this are not served
+        """
+        super().__init__("Price stream")
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, PriceQuote] = {}
+        self._subscribed: Set[str] = set()
+        self._listeners: List[Callable[[str, float], None]] = []
+        self._request_id = 0
+
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+
+    async def get_url(self) -> str:
+        """Combined-stream endpoint (PRICE_STREAM_URL overrides, e.g. a local stand-in)."""
+        if Config.PRICE_STREAM_URL:
+            return Config.PRICE_STREAM_URL
+        base = Config.BINANCE_TESTNET_WS if Config.USE_TESTNET else Config.BINANCE_LIVE_WS
+        return f"{base}/stream"
+
+    # ----- subscriptions -----
+
+    @staticmethod
+    def _streams(symbols: Iterable[str]):
+        streams = []
+        for symbol in symbols:
+            streams.append(f"{symbol.lower()}@bookTicker")
+            streams.append(f"{symbol.lower()}@miniTicker")
+        return streams
+
+    def _subscribe_payload(self, symbols: Iterable[str]) -> Dict:
+        self._request_id += 1
+        return {'method': 'SUBSCRIBE', 'params': self._streams(symbols), 'id': self._request_id}
+
+    def subscribe(self, symbols: Iterable[str]):
+        """
+        Start streaming prices for symbols (no-op for symbols already subscribed).
+
+        Args:
+            symbols: Trading pairs (e.g., ['BTCUSDT'])
+        """
+        with self._lock:
+            new = [s for s in symbols if s not in self._subscribed]
+            self._subscribed.update(new)
+        if new and self.running:
+            self.send_threadsafe(self._subscribe_payload(new))
+
+    async def on_open(self):
+        """Resubscribe everything after a (re)connect."""
+        with self._lock:
+            symbols = sorted(self._subscribed)
+        if symbols:
+            await self.send(self._subscribe_payload(symbols))
+
+    # ----- updates -----
+
+    def _quote(self, symbol: str) -> PriceQuote:
+        quote = self._quotes.get(symbol)
+        if quote is None:
+            with self._lock:
+                quote = self._quotes.setdefault(symbol, PriceQuote(symbol))
+        return quote
+
+    def on_message(self, message: Dict):
+        """Apply a bookTicker or miniTicker event."""
+        data = message.get('data', message)  # combined streams wrap the payload
+        symbol = data.get('s')
+        if not symbol:
+            return  # subscription acks etc.
+
+        quote = self._quote(symbol)
+        if 'b' in data and 'a' in data:  # bookTicker
+            quote.bid = float(data['b'])
+            quote.ask = float(data['a'])
+        elif data.get('e') == '24hrMiniTicker':
+            quote.last = float(data['c'])
+        else:
+            return
+        quote.received_at = time.monotonic()
+
+        price = quote.price
+        for listener in self._listeners:
+            try:
+                listener(symbol, price)
+            except Exception as e:
+                logger.log_error(f"Price listener error for {symbol}: {e}")
+
+    def add_listener(self, callback: Callable[[str, float], None]):
+        """
+        Call callback(symbol, price) on every streamed tick.
+        Runs on the stream's event loop, so it must return quickly.
+        """
+        if callback not in self._listeners:
+            self._listeners = self._listeners + [callback]
+
+    def remove_listener(self, callback: Callable[[str, float], None]):
+        """Stop delivering ticks to callback."""
+        self._listeners = [cb for cb in self._listeners if cb != callback]
+
+    def update_from_rest(self, symbol: str, price: float):
+        """
+        Record a REST price and make sure the symbol is streamed from now on.
+
+        Args:
+            symbol: Trading pair
+            price: Last price from the ticker endpoint
+        """
+        quote = self._quote(symbol)
+        quote.last = price
+        quote.bid = quote.ask = None  # REST has no book; don't mix with an old one
+        quote.received_at = time.monotonic()
+        if Config.USE_PRICE_STREAM:
+            self.subscribe([symbol])
+
+    # ----- reads -----
+
+    def get_quote(self, symbol: str) -> Optional[PriceQuote]:
+        """
+        Get the quote for a symbol if it is fresh.
+
+        Returns:
+            PriceQuote, or None if unknown or stale
+        """
+        quote = self._quotes.get(symbol)
+        if quote is None or quote.received_at == 0.0:
+            self.misses += 1
+            return None
+        if quote.age() > self.stale_seconds:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return quote
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Fresh price for a symbol from memory, or None (caller should use REST)."""
+        quote = self.get_quote(symbol)
+        return quote.price if quote else None
+
+    def get_status(self) -> Dict:
+        """
+        Get price book counters for monitoring.
+
+        Returns:
+            Dictionary with connection state, subscriptions and hit/stale/miss counters
+        """
+        with self._lock:
+            subscribed = len(self._subscribed)
+        return {
+            'connected': self.connected,
+            'subscribed_symbols': subscribed,
+            'messages': self.messages,
+            'reconnects': max(self.connects - 1, 0),
+            'stale_seconds': self.stale_seconds,
+            'hits': self.hits,
+            'stale': self.stale,
+            'misses': self.misses,
+        }
+
+
+# Global price book instance
+price_book = PriceBook(stale_seconds=Config.PRICE_STALE_SECONDS)
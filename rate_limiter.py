@@ -0,0 +1,282 @@
+"""
+Rate Limiter - request-weight-aware token bucket shared by every exchange call.
+Tracks Binance's used-weight / order-count headers and keeps a slice of the
+budget reserved for exits, so webhooks can't starve a stop-loss.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, List, Mapping, Optional
+
+from config import Config
+from csv_logger import logger
+
+
+class Priority(IntEnum):
+    """Queue lanes - lower value is served first."""
+    EXIT = 0
+    ENTRY = 1
+    POLL = 2
+
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar('api_priority', default=Priority.ENTRY)
+
+
+@contextmanager
+def api_priority(priority: Priority):
+    """
+    Run exchange calls in this block (thread or task) at the given priority:
+
+        with api_priority(Priority.EXIT):
+            binance.place_sell_order(...)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+# Request weights of the endpoints we use (Binance spot, /api/v3)
+ENDPOINT_WEIGHTS = {
+    'ping': 1,
+    'time': 1,
+    'exchangeInfo': 20,
+    'account': 20,
+    'order': 4,             # GET; POST/DELETE are 1
+    'order/oco': 1,
+    'orderList': 4,
+    'openOrders': 6,
+    'openOrderList': 6,
+    'userDataStream': 2,
+}
+ORDER_ENDPOINTS = ('order', 'order/oco')
+
+
+def request_weight(method: str, uri: str, params: Optional[Mapping] = None) -> int:
+    """
+    Request weight of one API call.
+
+    Args:
+        method: HTTP method (get, post, put, delete)
+        uri: Full request URI
+        params: Request parameters
+
+    Returns:
+        Weight units the call consumes
+    """
+    path = uri.split('/api/', 1)[-1].split('/', 1)[-1]  # strip host and version
+    params = params or {}
+    if path == 'ticker/price':
+        return 2 if 'symbol' in params else 4
+    if path == 'order' and method != 'get':
+        return 1
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+def is_order_request(method: str, uri: str) -> bool:
+    """True if the call counts against the order rate limit."""
+    return method == 'post' and uri.rstrip('/').endswith(ORDER_ENDPOINTS)
+
+
+class WeightLimiter:
+    """Priority-queued token bucket for request weight and order count."""
+
+    # Polling interval for waiters that are not at the head of the queue
+    RECHECK_SECONDS = 0.005
+
+    def __init__(
+        self,
+        weight_per_minute: int = 6000,
+        orders_per_10s: int = 50,
+        exit_reserve: float = 0.1
+    ):
+        """
+        Initialize limiter with full buckets.
+
+        Args:
+            weight_per_minute: Exchange request-weight limit per minute
+            orders_per_10s: Exchange order-count limit per 10 seconds
+            exit_reserve: Fraction of each budget only exits may use
+        """
+        self.weight_limit = weight_per_minute
+        self.order_limit = orders_per_10s
+        self.exit_reserve = exit_reserve
+
+        self._cond = threading.Condition()
+        self._weight_tokens = float(weight_per_minute)
+        self._order_tokens = float(orders_per_10s)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+
+        self._queue: List = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+
+        self.used_weight_1m: Optional[int] = None  # last value reported by the exchange
+        self.order_count_10s: Optional[int] = None
+        self.requests = 0
+        self.waits = {p.name.lower(): 0 for p in Priority}
+        self.wait_seconds = {p.name.lower(): 0.0 for p in Priority}
+        self.rate_limited_responses = 0
+
+    # ----- bucket maintenance (call with self._cond held) -----
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._weight_tokens = min(self.weight_limit, self._weight_tokens + elapsed * self.weight_limit / 60)
+        self._order_tokens = min(self.order_limit, self._order_tokens + elapsed * self.order_limit / 10)
+
+    def _try_grant(self, entry, weight: int, orders: int) -> float:
+        """Consume tokens for the queue entry if it may go now; else return seconds to wait."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._queue[0] != entry:
+            return self.RECHECK_SECONDS
+
+        self._refill()
+        reserve = 0.0 if entry[0] == Priority.EXIT else self.exit_reserve
+        weight_free = self._weight_tokens - reserve * self.weight_limit
+        order_free = self._order_tokens - reserve * self.order_limit
+
+        delay = 0.0
+        if weight_free < weight:
+            delay = (weight - weight_free) * 60 / self.weight_limit
+        if orders and order_free < orders:
+            delay = max(delay, (orders - order_free) * 10 / self.order_limit)
+        if delay:
+            return max(delay, self.RECHECK_SECONDS)
+
+        self._weight_tokens -= weight
+        self._order_tokens -= orders
+        heapq.heappop(self._queue)
+        self.requests += 1
+        self._cond.notify_all()
+        return 0.0
+
+    def _enqueue(self):
+        entry = (_current_priority.get(), next(self._seq))
+        heapq.heappush(self._queue, entry)
+        return entry
+
+    def _dequeue(self, entry):
+        """Remove an abandoned waiter so it can't block the queue."""
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._cond.notify_all()
+
+    def _record_wait(self, entry, started: float):
+        lane = Priority(entry[0]).name.lower()
+        self.waits[lane] += 1
+        self.wait_seconds[lane] += time.monotonic() - started
+
+    # ----- acquire -----
+
+    def acquire(self, weight: int, orders: int = 0):
+        """Block the calling thread until the request may be sent."""
+        with self._cond:
+            entry = self._enqueue()
+            delay = self._try_grant(entry, weight, orders)
+            if not delay:
+                return
+            started = time.monotonic()
+            try:
+                while delay:
+                    self._cond.wait(timeout=delay)
+                    delay = self._try_grant(entry, weight, orders)
+            finally:
+                self._dequeue(entry)
+            self._record_wait(entry, started)
+
+    async def acquire_async(self, weight: int, orders: int = 0):
+        """Wait (without blocking the event loop) until the request may be sent."""
+        with self._cond:
+            entry = self._enqueue()
+            delay = self._try_grant(entry, weight, orders)
+        if not delay:
+            return
+        started = time.monotonic()
+        try:
+            while delay:
+                await asyncio.sleep(delay)
+                with self._cond:
+                    delay = self._try_grant(entry, weight, orders)
+        finally:
+            with self._cond:
+                self._dequeue(entry)
+        with self._cond:
+            self._record_wait(entry, started)
+
+    # ----- feedback from responses -----
+
+    def record_response(self, status: int, headers: Mapping[str, str]):
+        """
+        Sync the buckets with the exchange's view after a response.
+
+        Args:
+            status: HTTP status code
+            headers: Response headers
+        """
+        with self._cond:
+            used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('x-mbx-used-weight-1m')
+            if used is not None:
+                self.used_weight_1m = int(used)
+                self._refill()
+                self._weight_tokens = min(self._weight_tokens, self.weight_limit - self.used_weight_1m)
+
+            orders = headers.get('X-MBX-ORDER-COUNT-10S') or headers.get('x-mbx-order-count-10s')
+            if orders is not None:
+                self.order_count_10s = int(orders)
+                self._order_tokens = min(self._order_tokens, self.order_limit - self.order_count_10s)
+
+            if status in (418, 429):
+                self.rate_limited_responses += 1
+                retry_after = float(headers.get('Retry-After') or headers.get('retry-after') or 60)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                logger.log_error(f"Exchange rate limit hit (HTTP {status}) - pausing requests for {retry_after:.0f}s")
+
+    def get_status(self) -> Dict:
+        """
+        Get current budget and queue depth for monitoring.
+
+        Returns:
+            Dictionary with remaining budget, exchange-reported usage and per-lane queue stats
+        """
+        with self._cond:
+            self._refill()
+            depth = {p.name.lower(): 0 for p in Priority}
+            for priority, _ in self._queue:
+                depth[Priority(priority).name.lower()] += 1
+            blocked = max(self._blocked_until - time.monotonic(), 0.0)
+            return {
+                'weight_limit_1m': self.weight_limit,
+                'weight_available': int(self._weight_tokens),
+                'used_weight_1m': self.used_weight_1m,
+                'order_limit_10s': self.order_limit,
+                'orders_available': int(self._order_tokens),
+                'order_count_10s': self.order_count_10s,
+                'exit_reserve': self.exit_reserve,
+                'queue_depth': depth,
+                'waits': dict(self.waits),
+                'wait_seconds': {k: round(v, 3) for k, v in self.wait_seconds.items()},
+                'requests': self.requests,
+                'rate_limited_responses': self.rate_limited_responses,
+                'blocked_for_seconds': round(blocked, 1),
+            }
+
+
+# Global rate limiter instance
+rate_limiter = WeightLimiter(
+    weight_per_minute=Config.API_WEIGHT_LIMIT_PER_MINUTE,
+    orders_per_10s=Config.API_ORDER_LIMIT_PER_10S,
+    exit_reserve=Config.API_EXIT_RESERVE
+)
@@ -1,58 +1,211 @@
 """
 Risk Management Engine - implements safety rules for trade execution.
 This is the critical safety layer that prevents dangerous trades.
+The checks are risk_rules.py rules; state survives restarts in RISK_STATE_FILE.
 """
 
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Tuple, Dict, List
-from collections import defaultdict
+from pathlib import Path
+from typing import Deque, Tuple, Dict, List, Optional
 import threading
 
 from config import Config
 from csv_logger import logger
+from exposure import ExposureLedger
+from lock_stripes import LockStripes
+from positions import position_manager
+from risk_rules import RULES, RiskCheck, RiskRule
+
+# executionReport order statuses after which an order is no longer pending
+CLOSED_ORDER_STATUSES = {'FILLED', 'CANCELED', 'EXPIRED', 'EXPIRED_IN_MATCH', 'REJECTED'}
 
 
 class RiskEngine:
     """
-    Manages trading risk with multiple safety constraints:
+    Manages trading risk with a pipeline of safety rules (risk_rules.py):
     - Max risk per trade
     - Max trades per day
+    - Max open trades, in total and per symbol
+    - Max notional per symbol and per portfolio
     - Minimum balance requirement
     - Duplicate signal cooldown
     - Confidence threshold
     """
     
-    def __init__(self):
-        """Initialize risk engine with empty tracking dictionaries."""
-        self._lock = threading.Lock()
+    def __init__(
+        self,
+        state_file: Optional[Path] = Config.RISK_STATE_FILE,
+        exposure: Optional[ExposureLedger] = None
+    ):
+        """
+        Initialize risk engine and restore its last saved state.
+        
+        Args:
+            state_file: JSON snapshot rewritten on every change (None: memory only)
+            exposure: Open position ledger (None: count only orders tracked here)
+        """
+        self.exposure = exposure
+        self._lock = threading.Lock()  # portfolio-wide counters only
+        self._stripes = LockStripes(Config.LOCK_STRIPES)  # per-symbol state
+        
+        # Monotonic times of trades in the daily window, oldest first
+        # (monotonic, so a wall-clock jump never reopens a limit)
+        self._trades_today: Deque[float] = deque()
         
-        # Track trades executed today for daily limit
-        self._trades_today: List[datetime] = []
+        # Count trades over a rolling 24h window instead of the UTC day
+        self.rolling_daily_limit = Config.DAILY_LIMIT_ROLLING
         
-        # Track recent signals to prevent duplicates within cooldown period
-        # Key: (symbol, action), Value: last signal datetime
-        self._signal_cache: Dict[Tuple[str, str], datetime] = {}
+        # Track recent signals to prevent duplicates within cooldown period, one cache per stripe
+        # Key: (symbol, action), Value: last signal monotonic time (oldest first)
+        self._signal_caches: List["OrderedDict[Tuple[str, str], float]"] = [
+            OrderedDict() for _ in range(len(self._stripes))
+        ]
         
-        # Track open orders/positions (can be extended with actual positions)
+        # Orders not filled at placement (filled ones are positions in the exposure ledger)
         self._open_trades: List[Dict] = []
+        self.open_order_ttl = Config.OPEN_ORDER_TTL_SECONDS
         
-        # Reset daily counters at midnight
+        # Admitted signals whose order is still in flight (see admit / release)
+        self._admit_lock = threading.Lock()
+        self._reservations: Dict[int, Dict] = {}
+        self._reservation_ids = itertools.count(1)
+        
+        # Log the UTC day rollover once
         self._last_reset = datetime.utcnow().date()
+        
+        # Rule pipeline, evaluated in order until the first rejection
+        self.rules: List[RiskRule] = self._build_rules(Config.RISK_RULE_ORDER)
+        
+        # Snapshot persistence; a change made while a save runs is picked up by that save
+        self.state_file = Path(state_file) if state_file else None
+        self._save_lock = threading.Lock()  # taken before any stripe or self._lock
+        self._save_pending = False
+        self.saves = 0
+        self.last_save_ms: Optional[float] = None
+        self.restore_ms: Optional[float] = None
+        
+        self._restore()
     
-    def _reset_daily_counters(self):
-        """Reset daily trade counter if day has changed."""
-        today = datetime.utcnow().date()
-        if today > self._last_reset:
-            self._trades_today = []
-            self._last_reset = today
-            logger.log_info("Daily counters reset")
+    @staticmethod
+    def _build_rules(order: List[str]) -> List[RiskRule]:
+        """
+        Instantiate the rule pipeline.
+        
+        Args:
+            order: Rule names to run first, in order; rules not named run after them
+                   in their default order, so no safety rule can be dropped by omission
+        
+        Returns:
+            Rule instances in evaluation order
+        """
+        names = []
+        for name in order:
+            if name not in RULES:
+                logger.log_error(f"Unknown risk rule '{name}' in RISK_RULE_ORDER (known: {', '.join(RULES)})")
+            elif name not in names:
+                names.append(name)
+        names.extend(name for name in RULES if name not in names)
+        return [RULES[name]() for name in names]
+    
+    # ----- state read by rules -----
+    
+    def open_trade_count(self) -> int:
+        """Open positions (exposure ledger) plus tracked unfilled orders and reserved trades."""
+        positions = self.exposure.open_positions() if self.exposure is not None else 0
+        with self._lock:
+            self._expire_open_trades()
+            return positions + len(self._open_trades) + len(self._reservations)
+    
+    def symbol_open_trade_count(self, symbol: str) -> int:
+        """Open positions plus tracked unfilled orders and reserved trades on one symbol."""
+        positions = self.exposure.symbol_positions(symbol) if self.exposure is not None else 0
+        with self._lock:
+            self._expire_open_trades()
+            return positions + sum(
+                1 for t in itertools.chain(self._open_trades, self._reservations.values())
+                if t['symbol'] == symbol
+            )
+    
+    def symbol_notional(self, symbol: str) -> float:
+        """Open notional on one symbol (exposure ledger) plus reserved trades on it."""
+        current = self.exposure.symbol_notional(symbol) if self.exposure is not None else 0.0
+        with self._lock:
+            return current + sum(r['notional'] for r in self._reservations.values() if r['symbol'] == symbol)
+    
+    def total_notional(self) -> float:
+        """Open notional across the portfolio (exposure ledger) plus reserved trades."""
+        current = self.exposure.total_notional() if self.exposure is not None else 0.0
+        with self._lock:
+            return current + sum(r['notional'] for r in self._reservations.values())
+    
+    def trades_in_window(self, now: float) -> int:
+        """Trades executed in the daily limit window (expired ones are dropped first) plus reserved trades."""
+        with self._lock:
+            self._expire_trades(now)
+            return len(self._trades_today) + len(self._reservations)
+    
+    def last_signal(self, symbol: str, action: str, now: float) -> Optional[float]:
+        """Monotonic time of the symbol/action's last signal if its cooldown is still running (or a reserved one)."""
+        stripe = self._stripes.index(symbol)
+        with self._stripes.lock(symbol):
+            cache = self._signal_caches[stripe]
+            self._expire_signals(cache, now)
+            recorded_at = cache.get((symbol, action))
+        if recorded_at is not None:
+            return recorded_at
+        with self._lock:
+            return next(
+                (r['reserved_at'] for r in self._reservations.values()
+                 if r['symbol'] == symbol and r['action'] == action),
+                None
+            )
+    
+    def _daily_window_start(self, now: float) -> float:
+        """Monotonic time the daily limit window starts at (00:00 UTC, or 24h ago)."""
+        if self.rolling_daily_limit:
+            return now - 86400
+        return now - (time.time() % 86400)
+    
+    def _expire_signals(self, cache: "OrderedDict[Tuple[str, str], float]", now: float):
+        """Drop signals whose cooldown has passed (hold the cache's stripe lock)."""
+        cooldown = Config.SIGNAL_COOLDOWN_SECONDS
+        while cache:
+            recorded_at = next(iter(cache.values()))
+            if recorded_at + cooldown > now:
+                break
+            cache.popitem(last=False)
+    
+    def _expire_open_trades(self):
+        """Drop unfilled orders older than OPEN_ORDER_TTL_SECONDS (hold self._lock)."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.open_order_ttl)
+        if self._open_trades and self._open_trades[0]['opened_at'] < cutoff:
+            self._open_trades = [t for t in self._open_trades if t['opened_at'] >= cutoff]
+    
+    def _expire_trades(self, now: float):
+        """Drop trades that left the daily window (hold self._lock)."""
+        window_start = self._daily_window_start(now)
+        while self._trades_today and self._trades_today[0] < window_start:
+            self._trades_today.popleft()
+        
+        if not self.rolling_daily_limit:
+            today = datetime.utcnow().date()
+            if today > self._last_reset:
+                self._last_reset = today
+                logger.log_info("Daily counters reset")
     
     def check_all_constraints(
         self,
         symbol: str,
         action: str,
         confidence: float,
-        account_balance: float
+        account_balance: float,
+        notional: float = 0.0
     ) -> Tuple[bool, str]:
         """
         Check all risk constraints before allowing a trade.
@@ -62,58 +215,87 @@ class RiskEngine:
             action: BUY or SELL
             confidence: Confidence level (0-100)
             account_balance: Current USDT balance
+            notional: USDT size of the intended trade (for the notional limits)
         
         Returns:
             Tuple of (allowed: bool, reason: str)
         """
+        request = RiskCheck(symbol, action, confidence, account_balance, time.monotonic(), notional)
+        return self._run_rules(self.rules, request)
+    
+    def check_signal_constraints(self, symbol: str, action: str, confidence: float) -> Tuple[bool, str]:
+        """
+        Run the rules that need no exchange data (confidence, cooldown, daily limit, open trades).
+        Call this before fetching the pre-trade context, then admit().
+        
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+            action: BUY or SELL
+            confidence: Confidence level (0-100)
+        
+        Returns:
+            Tuple of (allowed: bool, reason: str)
+        """
+        request = RiskCheck(symbol, action, confidence, 0.0, time.monotonic())
+        return self._run_rules([rule for rule in self.rules if not rule.needs_context], request)
+    
+    def admit(
+        self,
+        symbol: str,
+        action: str,
+        confidence: float,
+        account_balance: float,
+        notional: float = 0.0
+    ) -> Tuple[bool, str, Optional[int]]:
+        """
+        Run every rule and, if the signal passes, reserve the trade in the same step.
+        Until release(), the reservation counts as an open trade, a trade in the
+        daily window, an active cooldown and open notional, so concurrent signals
+        cannot all pass one limit while their orders are in flight.
+        
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+            action: BUY or SELL
+            confidence: Confidence level (0-100)
+            account_balance: Current USDT balance
+            notional: USDT size of the intended trade (for the notional limits)
+        
+        Returns:
+            Tuple of (allowed, reason, reservation id to release - None if rejected)
+        """
+        with self._admit_lock:
+            allowed, reason = self.check_all_constraints(symbol, action, confidence, account_balance, notional)
+            if not allowed:
+                return False, reason, None
+            with self._lock:
+                reservation = next(self._reservation_ids)
+                self._reservations[reservation] = {
+                    'symbol': symbol,
+                    'action': action,
+                    'notional': notional,
+                    'reserved_at': time.monotonic(),
+                }
+            return True, reason, reservation
+    
+    def release(self, reservation: Optional[int]):
+        """
+        Drop a reservation made by admit(). Call once the trade is recorded
+        (record_trade / record_signal / the position) or has failed.
+        """
+        if reservation is None:
+            return
         with self._lock:
-            self._reset_daily_counters()
-            
-            # 1. Check confidence threshold
-            if confidence < Config.MIN_CONFIDENCE:
-                return False, f"Confidence {confidence:.1f} below minimum {Config.MIN_CONFIDENCE}"
-            
-            # 2. Check minimum balance
-            if account_balance < Config.MIN_BALANCE_USDT:
-                return False, (
-                    f"Insufficient balance: ${account_balance:.2f} < "
-                    f"${Config.MIN_BALANCE_USDT} minimum"
-                )
-            
-            # 3. Check max risk per trade
-            available_for_trade = min(account_balance, Config.MAX_RISK_PER_TRADE)
-            if available_for_trade <= 0:
-                return False, f"Trade size ${Config.MAX_RISK_PER_TRADE} exceeds balance ${account_balance:.2f}"
-            
-            # 4. Check max open trades
-            if len(self._open_trades) >= Config.MAX_OPEN_TRADES:
-                return False, (
-                    f"Max open trades {Config.MAX_OPEN_TRADES} reached "
-                    f"({len(self._open_trades)} currently open)"
-                )
-            
-            # 5. Check daily trade limit
-            if len(self._trades_today) >= Config.MAX_TRADES_PER_DAY:
-                return False, (
-                    f"Daily trade limit {Config.MAX_TRADES_PER_DAY} reached "
-                    f"({len(self._trades_today)} executed today)"
-                )
-            
-            # 6. Check duplicate signal cooldown
-            cache_key = (symbol, action)
-            if cache_key in self._signal_cache:
-                last_signal = self._signal_cache[cache_key]
-                cooldown_expiry = last_signal + timedelta(seconds=Config.SIGNAL_COOLDOWN_SECONDS)
-                
-                if datetime.utcnow() < cooldown_expiry:
-                    time_remaining = (cooldown_expiry - datetime.utcnow()).total_seconds()
-                    return False, (
-                        f"Duplicate {action} signal for {symbol}: "
-                        f"cooldown active for {time_remaining:.0f}s more"
-                    )
-            
-            # All checks passed
-            return True, "All risk constraints satisfied"
+            self._reservations.pop(reservation, None)
+    
+    def _run_rules(self, rules: List[RiskRule], request: RiskCheck) -> Tuple[bool, str]:
+        """Evaluate rules in order; the first rejection wins."""
+        for rule in rules:
+            reason = rule.evaluate(self, request)
+            if reason is not None:
+                return False, reason
+        
+        # All checks passed
+        return True, "All risk constraints satisfied"
     
     def record_signal(self, symbol: str, action: str):
         """
@@ -124,9 +306,16 @@ class RiskEngine:
             symbol: Trading pair
             action: BUY or SELL
         """
-        with self._lock:
+        now = time.monotonic()
+        stripe = self._stripes.index(symbol)
+        with self._stripes.lock(symbol):
+            cache = self._signal_caches[stripe]
+            self._expire_signals(cache, now)
             cache_key = (symbol, action)
-            self._signal_cache[cache_key] = datetime.utcnow()
+            # Re-recording moves the key to the back so the cache stays in expiry order
+            cache.pop(cache_key, None)
+            cache[cache_key] = now
+        self._save()
     
     def record_trade(self, symbol: str, action: str):
         """
@@ -137,16 +326,21 @@ class RiskEngine:
             symbol: Trading pair
             action: BUY or SELL
         """
+        now = time.monotonic()
         with self._lock:
-            self._trades_today.append(datetime.utcnow())
-            logger.log_info(
-                f"Trade recorded: {action} {symbol} | "
-                f"Daily: {len(self._trades_today)}/{Config.MAX_TRADES_PER_DAY}"
-            )
+            self._expire_trades(now)
+            self._trades_today.append(now)
+            trades_today = len(self._trades_today)
+        logger.log_info(
+            f"Trade recorded: {action} {symbol} | "
+            f"Daily: {trades_today}/{Config.MAX_TRADES_PER_DAY}"
+        )
+        self._save()
     
     def add_open_trade(self, symbol: str, order_id: str, action: str, quantity: float):
         """
-        Track an open position (optional for more advanced risk management).
+        Track an order that was not filled at placement; it counts toward
+        MAX_OPEN_TRADES until on_execution_report or the TTL removes it.
         
         Args:
             symbol: Trading pair
@@ -162,16 +356,118 @@ class RiskEngine:
                 'quantity': quantity,
                 'opened_at': datetime.utcnow()
             })
+        self._save()
     
     def remove_open_trade(self, order_id: str):
         """
-        Remove a closed position from tracking.
+        Stop tracking an unfilled order.
         
         Args:
             order_id: Binance order ID to remove
         """
         with self._lock:
-            self._open_trades = [t for t in self._open_trades if t['order_id'] != order_id]
+            remaining = [t for t in self._open_trades if str(t['order_id']) != str(order_id)]
+            removed = len(remaining) != len(self._open_trades)
+            self._open_trades = remaining
+        if removed:
+            self._save()
+    
+    def on_execution_report(self, event: Dict):
+        """
+        Order listener for the user data stream (runs on the event loop): stop
+        tracking an unfilled order once it is filled or has ended. The state
+        file write runs in a worker thread.
+        """
+        if event.get('X') not in CLOSED_ORDER_STATUSES:
+            return
+        order_id = str(event.get('i'))
+        with self._lock:
+            tracked = any(str(t['order_id']) == order_id for t in self._open_trades)
+        if tracked:
+            asyncio.get_running_loop().run_in_executor(None, self.remove_open_trade, order_id)
+    
+    # ----- persistence -----
+    
+    def _snapshot(self) -> Dict:
+        """Current state with monotonic times converted to wall-clock (epoch seconds)."""
+        offset = time.time() - time.monotonic()
+        cooldowns = []
+        for stripe, cache in enumerate(self._signal_caches):
+            with self._stripes.lock_at(stripe):
+                cooldowns.extend(
+                    [symbol, action, round(recorded_at + offset, 3)]
+                    for (symbol, action), recorded_at in cache.items()
+                )
+        with self._lock:
+            trades = [round(t + offset, 3) for t in self._trades_today]
+            open_trades = [
+                {**trade, 'opened_at': trade['opened_at'].isoformat()}
+                for trade in self._open_trades
+            ]
+        return {
+            'version': 1,
+            'saved_at': round(time.time(), 3),
+            'trades': trades,
+            'cooldowns': cooldowns,
+            'open_trades': open_trades,
+        }
+    
+    def _save(self):
+        """Rewrite the state file (temp file + atomic rename), coalescing concurrent changes."""
+        if self.state_file is None:
+            return
+        self._save_pending = True
+        while self._save_pending:
+            if not self._save_lock.acquire(blocking=False):
+                return  # the running save picks this change up
+            try:
+                while self._save_pending:
+                    self._save_pending = False
+                    started = time.perf_counter()
+                    tmp = self.state_file.with_suffix('.tmp')
+                    with open(tmp, 'w', encoding='utf-8') as f:
+                        json.dump(self._snapshot(), f, separators=(',', ':'))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.state_file)
+                    self.saves += 1
+                    self.last_save_ms = round((time.perf_counter() - started) * 1000, 3)
+            except Exception as e:
+                logger.log_error(f"Failed to save risk state: {e}")
+            finally:
+                self._save_lock.release()
+    
+    def _restore(self):
+        """Load the last snapshot, dropping trades and cooldowns that expired while down."""
+        if self.state_file is None or not self.state_file.exists():
+            return
+        started = time.perf_counter()
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            
+            offset = time.time() - time.monotonic()
+            now = time.monotonic()
+            self._trades_today.extend(sorted(t - offset for t in state.get('trades', [])))
+            for symbol, action, recorded_at in sorted(state.get('cooldowns', []), key=lambda c: c[2]):
+                self._signal_caches[self._stripes.index(symbol)][(symbol, action)] = recorded_at - offset
+            for trade in state.get('open_trades', []):
+                self._open_trades.append({**trade, 'opened_at': datetime.fromisoformat(trade['opened_at'])})
+            
+            self._expire_trades(now)
+            self._expire_open_trades()
+            for cache in self._signal_caches:
+                self._expire_signals(cache, now)
+            
+            self.restore_ms = round((time.perf_counter() - started) * 1000, 3)
+            logger.log_info(
+                f"Restored risk state from {self.state_file} in {self.restore_ms:.2f} ms: "
+                f"{len(self._trades_today)} trades in the daily window, "
+                f"{sum(len(c) for c in self._signal_caches)} active cooldowns, "
+                f"{len(self._open_trades)} open trades"
+            )
+        except Exception as e:
+            logger.log_error(f"Failed to restore risk state from {self.state_file}: {e}")
     
     def get_status(self) -> Dict:
         """
@@ -180,13 +476,38 @@ class RiskEngine:
         Returns:
             Dictionary with current limits and usage
         """
+        now = time.monotonic()
+        cooldown_entries = 0
+        for stripe, cache in enumerate(self._signal_caches):
+            with self._stripes.lock_at(stripe):
+                self._expire_signals(cache, now)
+                cooldown_entries += len(cache)
+        
         with self._lock:
-            self._reset_daily_counters()
+            self._expire_trades(now)
+            self._expire_open_trades()
             return {
                 'trades_today': len(self._trades_today),
                 'max_trades_per_day': Config.MAX_TRADES_PER_DAY,
-                'open_trades': len(self._open_trades),
+                'daily_window': 'rolling_24h' if self.rolling_daily_limit else 'utc_day',
+                'cooldown_entries': cooldown_entries,
+                'lock_stripes': len(self._stripes),
+                'state_file': str(self.state_file) if self.state_file else None,
+                'state_saves': self.saves,
+                'last_save_ms': self.last_save_ms,
+                'restore_ms': self.restore_ms,
+                'rules': [rule.get_status() for rule in self.rules],
+                'open_trades': len(self._open_trades) + len(self._reservations) + (
+                    self.exposure.open_positions() if self.exposure is not None else 0
+                ),
+                'unfilled_orders': len(self._open_trades),
+                'reserved_trades': len(self._reservations),
+                'open_order_ttl_seconds': self.open_order_ttl,
+                'max_symbol_notional': Config.MAX_SYMBOL_NOTIONAL,
+                'max_portfolio_notional': Config.MAX_PORTFOLIO_NOTIONAL,
+                'portfolio_notional': round(self.exposure.total_notional(), 2) if self.exposure is not None else None,
                 'max_open_trades': Config.MAX_OPEN_TRADES,
+                'max_positions_per_symbol': Config.MAX_POSITIONS_PER_SYMBOL,
                 'max_risk_per_trade': Config.MAX_RISK_PER_TRADE,
                 'min_balance': Config.MIN_BALANCE_USDT,
                 'cooldown_seconds': Config.SIGNAL_COOLDOWN_SECONDS,
@@ -195,4 +516,4 @@ class RiskEngine:
 
 
 # Global risk engine instance
-risk_engine = RiskEngine()
+risk_engine = RiskEngine(exposure=position_manager.exposure)
@@ -0,0 +1,236 @@
+"""
+Risk Rules - the individual pre-trade checks the risk engine runs as a pipeline.
+Rules run in RISK_RULE_ORDER and the first rejection wins.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+from config import Config
+
+if TYPE_CHECKING:
+    from risk import RiskEngine
+
+
+@dataclass
+class RiskCheck:
+    """One signal being checked."""
+
+    symbol: str
+    action: str
+    confidence: float
+    account_balance: float
+    now: float  # time.monotonic() when the check started
+    notional: float = 0.0  # USDT size of the intended trade (0: unknown)
+
+
+class RiskRule:
+    """
+    Base class: one named pre-trade check with evaluation statistics.
+    To add a rule, subclass it, give it a unique name and register it in RULES.
+    """
+
+    name = "rule"
+    needs_context = False  # reads account_balance / notional, which come from the exchange
+
+    def __init__(self):
+        # Monitoring counters; concurrent checks may occasionally lose an increment
+        self.evaluations = 0
+        self.rejections = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def check(self, engine: "RiskEngine", request: RiskCheck) -> Optional[str]:
+        """
+        Evaluate the rule.
+
+        Args:
+            engine: Risk engine holding the counters the rule reads
+            request: Signal being checked
+
+        Returns:
+            Rejection reason, or None if the signal passes
+        """
+        raise NotImplementedError
+
+    def evaluate(self, engine: "RiskEngine", request: RiskCheck) -> Optional[str]:
+        """Run check() and record its timing and outcome."""
+        started = time.perf_counter_ns()
+        reason = self.check(engine, request)
+        elapsed = time.perf_counter_ns() - started
+        self.evaluations += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        if reason is not None:
+            self.rejections += 1
+        return reason
+
+    def get_status(self) -> Dict:
+        """
+        Get rule statistics.
+
+        Returns:
+            Dictionary with evaluations, rejections, rejection rate and mean/max time (microseconds)
+        """
+        return {
+            'name': self.name,
+            'evaluations': self.evaluations,
+            'rejections': self.rejections,
+            'rejection_rate': round(self.rejections / self.evaluations, 4) if self.evaluations else None,
+            'mean_us': round(self.total_ns / self.evaluations / 1000, 3) if self.evaluations else None,
+            'max_us': round(self.max_ns / 1000, 3),
+        }
+
+
+class ConfidenceRule(RiskRule):
+    """Signal confidence must reach MIN_CONFIDENCE."""
+
+    name = "confidence"
+
+    def check(self, engine, request):
+        if request.confidence < Config.MIN_CONFIDENCE:
+            return f"Confidence {request.confidence:.1f} below minimum {Config.MIN_CONFIDENCE}"
+        return None
+
+
+class BalanceRule(RiskRule):
+    """Account balance must be at least MIN_BALANCE_USDT."""
+
+    name = "balance"
+    needs_context = True
+
+    def check(self, engine, request):
+        if request.account_balance < Config.MIN_BALANCE_USDT:
+            return (
+                f"Insufficient balance: ${request.account_balance:.2f} < "
+                f"${Config.MIN_BALANCE_USDT} minimum"
+            )
+        return None
+
+
+class MaxRiskRule(RiskRule):
+    """There must be something to trade within MAX_RISK_PER_TRADE."""
+
+    name = "max_risk"
+    needs_context = True
+
+    def check(self, engine, request):
+        available_for_trade = min(request.account_balance, Config.MAX_RISK_PER_TRADE)
+        if available_for_trade <= 0:
+            return f"Trade size ${Config.MAX_RISK_PER_TRADE} exceeds balance ${request.account_balance:.2f}"
+        return None
+
+
+class OpenTradesRule(RiskRule):
+    """Fewer than MAX_OPEN_TRADES trades (open positions plus unfilled orders) may be open."""
+
+    name = "open_trades"
+
+    def check(self, engine, request):
+        open_trades = engine.open_trade_count()
+        if open_trades >= Config.MAX_OPEN_TRADES:
+            return (
+                f"Max open trades {Config.MAX_OPEN_TRADES} reached "
+                f"({open_trades} currently open)"
+            )
+        return None
+
+
+class SymbolPositionsRule(RiskRule):
+    """Fewer than MAX_POSITIONS_PER_SYMBOL trades may be open on the symbol (0 = off)."""
+
+    name = "symbol_positions"
+
+    def check(self, engine, request):
+        limit = Config.MAX_POSITIONS_PER_SYMBOL
+        if limit <= 0:
+            return None
+        open_trades = engine.symbol_open_trade_count(request.symbol)
+        if open_trades >= limit:
+            return (
+                f"Max open trades per symbol {limit} reached for {request.symbol} "
+                f"({open_trades} currently open)"
+            )
+        return None
+
+
+class DailyLimitRule(RiskRule):
+    """Fewer than MAX_TRADES_PER_DAY trades may have executed in the daily window."""
+
+    name = "daily_limit"
+
+    def check(self, engine, request):
+        trades_today = engine.trades_in_window(request.now)
+        if trades_today >= Config.MAX_TRADES_PER_DAY:
+            return (
+                f"Daily trade limit {Config.MAX_TRADES_PER_DAY} reached "
+                f"({trades_today} executed "
+                f"{'in the last 24h' if engine.rolling_daily_limit else 'today'})"
+            )
+        return None
+
+
+class CooldownRule(RiskRule):
+    """The same symbol/action must not have been signalled within SIGNAL_COOLDOWN_SECONDS."""
+
+    name = "cooldown"
+
+    def check(self, engine, request):
+        last_signal = engine.last_signal(request.symbol, request.action, request.now)
+        if last_signal is not None:
+            time_remaining = last_signal + Config.SIGNAL_COOLDOWN_SECONDS - request.now
+            return (
+                f"Duplicate {request.action} signal for {request.symbol}: "
+                f"cooldown active for {time_remaining:.0f}s more"
+            )
+        return None
+
+
+class SymbolNotionalRule(RiskRule):
+    """Open notional on the symbol plus the new trade must stay within MAX_SYMBOL_NOTIONAL (0 = off)."""
+
+    name = "symbol_notional"
+    needs_context = True
+
+    def check(self, engine, request):
+        limit = Config.MAX_SYMBOL_NOTIONAL
+        if limit <= 0:
+            return None
+        current = engine.symbol_notional(request.symbol)
+        if current + request.notional > limit:
+            return (
+                f"Notional limit for {request.symbol} reached: ${current:.2f} open "
+                f"+ ${request.notional:.2f} > ${limit:.2f}"
+            )
+        return None
+
+
+class PortfolioNotionalRule(RiskRule):
+    """Total open notional plus the new trade must stay within MAX_PORTFOLIO_NOTIONAL (0 = off)."""
+
+    name = "portfolio_notional"
+    needs_context = True
+
+    def check(self, engine, request):
+        limit = Config.MAX_PORTFOLIO_NOTIONAL
+        if limit <= 0:
+            return None
+        current = engine.total_notional()
+        if current + request.notional > limit:
+            return (
+                f"Portfolio notional limit reached: ${current:.2f} open "
+                f"+ ${request.notional:.2f} > ${limit:.2f}"
+            )
+        return None
+
+
+# Available rules by name, in the default order
+RULES = {
+    rule.name: rule
+    for rule in (
+        ConfidenceRule, BalanceRule, MaxRiskRule, OpenTradesRule, SymbolPositionsRule, DailyLimitRule,
+        CooldownRule, SymbolNotionalRule, PortfolioNotionalRule,
+    )
+}
@@ -0,0 +1,317 @@
+"""
+SQLite Store - optional database backend for positions, trades and signals.
+Enabled with STORAGE_BACKEND=sqlite; runs in WAL mode so readers never block writes.
+Import the existing CSV logs with: python sqlite_store.py import
+"""
+
+import csv
+import sqlite3
+import sys
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    position_id TEXT PRIMARY KEY,
+    entry_time TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    entry_price REAL NOT NULL,
+    stop_loss_price REAL NOT NULL,
+    take_profit_price REAL NOT NULL,
+    current_price REAL,
+    status TEXT NOT NULL,
+    exit_time TEXT,
+    exit_price REAL,
+    pnl REAL,
+    pnl_percent REAL,
+    oco_list_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_positions_status ON positions (status);
+CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions (symbol, status);
+CREATE INDEX IF NOT EXISTS idx_positions_entry_time ON positions (entry_time);
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    datetime TEXT NOT NULL,
+    trading_pair TEXT NOT NULL,
+    action TEXT NOT NULL,
+    trade_amount REAL,
+    price REAL,
+    order_id TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trades_datetime ON trades (datetime);
+CREATE INDEX IF NOT EXISTS idx_trades_pair ON trades (trading_pair, datetime);
+
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    datetime TEXT NOT NULL,
+    trading_pair TEXT NOT NULL,
+    action TEXT NOT NULL,
+    strategy TEXT,
+    timeframe TEXT,
+    confidence REAL,
+    decision TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_datetime ON signals (datetime);
+CREATE INDEX IF NOT EXISTS idx_signals_pair ON signals (trading_pair, datetime);
+"""
+
+# Position dict keys (as used by PositionManager) <-> positions table columns
+POSITION_COLUMNS = {
+    'PositionId': 'position_id',
+    'EntryTime': 'entry_time',
+    'Symbol': 'symbol',
+    'Side': 'side',
+    'Quantity': 'quantity',
+    'EntryPrice': 'entry_price',
+    'StopLossPrice': 'stop_loss_price',
+    'TakeProfitPrice': 'take_profit_price',
+    'CurrentPrice': 'current_price',
+    'Status': 'status',
+    'ExitTime': 'exit_time',
+    'ExitPrice': 'exit_price',
+    'PnL': 'pnl',
+    'PnLPercent': 'pnl_percent',
+    'OcoListId': 'oco_list_id',
+}
+
+# Columns added after the first release: (column, type) - added to older databases on open
+ADDED_POSITION_COLUMNS = [('oco_list_id', 'INTEGER')]
+
+# Statements are fixed strings so sqlite3's statement cache reuses the compiled form
+INSERT_POSITION = (
+    f"INSERT OR REPLACE INTO positions ({', '.join(POSITION_COLUMNS.values())}) "
+    f"VALUES ({', '.join(':' + key for key in POSITION_COLUMNS)})"
+)
+CLOSE_POSITION = (
+    "UPDATE positions SET status = :Status, exit_time = :ExitTime, exit_price = :ExitPrice, "
+    "pnl = :PnL, pnl_percent = :PnLPercent WHERE position_id = :PositionId"
+)
+UPDATE_PRICE = "UPDATE positions SET current_price = ? WHERE position_id = ? AND status = 'OPEN'"
+UPDATE_BRACKET = "UPDATE positions SET oco_list_id = ? WHERE position_id = ?"
+SELECT_POSITIONS = f"SELECT {', '.join(POSITION_COLUMNS.values())} FROM positions"
+INSERT_TRADE = (
+    "INSERT INTO trades (datetime, trading_pair, action, trade_amount, price, order_id, status) "
+    "VALUES (:DateTime, :TradingPair, :Action, :TradeAmount, :Price, :OrderID, :Status)"
+)
+INSERT_SIGNAL = (
+    "INSERT INTO signals (datetime, trading_pair, action, strategy, timeframe, confidence, decision, reason) "
+    "VALUES (:DateTime, :TradingPair, :Action, :Strategy, :TimeFrame, :Confidence, :Decision, :Reason)"
+)
+
+
+def _number(value) -> Optional[float]:
+    """Number from a CSV cell ('' -> None, '1.5%' -> 1.5)."""
+    if value in (None, ''):
+        return None
+    return float(str(value).rstrip('%'))
+
+
+class SQLiteStore:
+    """Thread-safe SQLite (WAL) store shared by PositionManager and CSVLogger."""
+
+    def __init__(self, path: Path):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path: Database file path
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+            cached_statements=64
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns that databases created by older versions lack."""
+        existing = {row['name'] for row in self._conn.execute("PRAGMA table_info(positions)")}
+        for column, column_type in ADDED_POSITION_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE positions ADD COLUMN {column} {column_type}")
+
+    def _transaction(self, statement: str, rows: Iterable):
+        """Run one statement over many parameter sets in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(statement, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ----- positions -----
+
+    @staticmethod
+    def _position_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        position = {key: row[column] for key, column in POSITION_COLUMNS.items()}
+        position['ExitTime'] = position['ExitTime'] or ''
+        return position
+
+    def insert_positions(self, positions: Iterable[Dict[str, Any]]):
+        """Insert (or replace) positions in one transaction."""
+        self._transaction(INSERT_POSITION, positions)
+
+    def close_position(self, position_id: str, fields: Dict[str, Any]):
+        """Record a position's exit fields (Status, ExitTime, ExitPrice, PnL, PnLPercent)."""
+        self._transaction(CLOSE_POSITION, [dict(fields, PositionId=position_id)])
+
+    def update_prices(self, prices: Dict[str, float]):
+        """Write the latest CurrentPrice for many positions in one transaction."""
+        self._transaction(UPDATE_PRICE, ((price, position_id) for position_id, price in prices.items()))
+
+    def update_bracket(self, position_id: str, oco_list_id: Optional[int]):
+        """Record (or clear) the OCO order list protecting a position."""
+        self._transaction(UPDATE_BRACKET, [(oco_list_id, position_id)])
+
+    def load_open_positions(self) -> List[Dict[str, Any]]:
+        """All OPEN positions (uses idx_positions_status)."""
+        with self._lock:
+            rows = self._conn.execute(
+                SELECT_POSITIONS + " WHERE status = 'OPEN' ORDER BY entry_time"
+            ).fetchall()
+        return [self._position_from_row(row) for row in rows]
+
+    def get_position(self, position_id: str) -> Optional[Dict[str, Any]]:
+        """One position by id, or None."""
+        with self._lock:
+            row = self._conn.execute(SELECT_POSITIONS + " WHERE position_id = ?", (position_id,)).fetchone()
+        return self._position_from_row(row) if row else None
+
+    def query_positions(
+        self,
+        symbol: Optional[str] = None,
+        status: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Positions filtered by symbol, status and entry-time range (ISO strings, end exclusive).
+
+        Returns:
+            List of position dicts ordered by entry time
+        """
+        clauses, params = [], []
+        for column, op, value in (
+            ('symbol', '=', symbol), ('status', '=', status),
+            ('entry_time', '>=', start), ('entry_time', '<', end)
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        sql = SELECT_POSITIONS + (" WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY entry_time"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._position_from_row(row) for row in rows]
+
+    # ----- trades / signals -----
+
+    def insert_trades(self, rows: Iterable[Dict[str, Any]]):
+        """Insert trades.csv-shaped rows in one transaction."""
+        self._transaction(INSERT_TRADE, rows)
+
+    def insert_signals(self, rows: Iterable[Dict[str, Any]]):
+        """Insert signals.csv-shaped rows in one transaction."""
+        self._transaction(INSERT_SIGNAL, rows)
+
+    def count(self, table: str) -> int:
+        """Row count of positions, trades or signals."""
+        if table not in ('positions', 'trades', 'signals'):
+            raise ValueError(f"Unknown table {table}")
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # ----- one-shot CSV import -----
+
+    def import_csvs(self, log_dir: Path = Config.LOG_DIR) -> Dict[str, int]:
+        """
+        Import positions (positions.csv and archive/), trades.csv and signals.csv from log_dir.
+        Tables that already hold rows are skipped, so re-running is harmless.
+        A positions.journal is compacted first, so the import sees its latest state.
+
+        Returns:
+            Rows imported per table
+        """
+        log_dir = Path(log_dir)
+        imported = {}
+
+        def read(name: str) -> List[Dict[str, str]]:
+            rows = []
+            for path in sorted(log_dir.glob(name)):
+                with open(path, 'r', encoding='utf-8') as f:
+                    rows.extend(csv.DictReader(f))
+            return rows
+
+        if self.count('positions') == 0:
+            # positions.csv is only an export of the journal: replay and compact it so the
+            # export is current and positions closed since are in the archive
+            if (log_dir / "positions.journal").exists():
+                from positions import PositionManager  # positions imports this module
+                PositionManager(log_dir=log_dir, store=None).close()
+
+            positions = []
+            # Open positions plus the closed-position archive partitions
+            for row in read("archive/positions-*.csv") + read("positions.csv"):
+                position = {key: row.get(key) for key in POSITION_COLUMNS}
+                position['PositionId'] = row.get('PositionId') or uuid.uuid4().hex[:16]
+                for key in ('Quantity', 'EntryPrice', 'StopLossPrice', 'TakeProfitPrice',
+                            'CurrentPrice', 'ExitPrice', 'PnL', 'PnLPercent'):
+                    position[key] = _number(row.get(key))
+                position['OcoListId'] = int(row['OcoListId']) if row.get('OcoListId') else None
+                positions.append(position)
+            self.insert_positions(positions)
+            imported['positions'] = len(positions)
+
+        if self.count('trades') == 0:
+            trades = read("trades.csv")
+            for row in trades:
+                row['TradeAmount'] = _number(row.get('TradeAmount'))
+                row['Price'] = _number(row.get('Price'))
+            self.insert_trades(trades)
+            imported['trades'] = len(trades)
+
+        if self.count('signals') == 0:
+            signals = read("signals.csv")
+            for row in signals:
+                row['Confidence'] = _number(row.get('Confidence'))
+            self.insert_signals(signals)
+            imported['signals'] = len(signals)
+
+        return imported
+
+
+# Global store instance (None unless STORAGE_BACKEND=sqlite)
+sqlite_store: Optional[SQLiteStore] = (
+    SQLiteStore(Config.SQLITE_PATH) if Config.STORAGE_BACKEND == "sqlite" else None
+)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["import"]:
+        print("Usage: python sqlite_store.py import")
+        sys.exit(1)
+    store = sqlite_store or SQLiteStore(Config.SQLITE_PATH)
+    counts = store.import_csvs()
+    print(f"Imported into {store.path}: " + (", ".join(f"{n} {t}" for t, n in counts.items()) or "nothing (tables not empty)"))
@@ -0,0 +1,289 @@
+"""
+Symbol Cache - indexed copy of Binance exchange info for order sizing.
+Exchange info is the largest payload we download, so it is fetched once at
+startup, parsed into per-symbol filters and refreshed in the background on a TTL.
+A failed refresh is retried with exponential backoff (capped at the TTL), so an
+exchangeInfo outage never turns into a request every second.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_FLOOR, ROUND_HALF_UP
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import Config
+from csv_logger import logger
+from rate_limiter import api_priority, Priority
+
+
+def _decimals(step: str) -> int:
+    """Number of decimal places implied by a Binance step string like '0.00100000'."""
+    return len(step.rstrip('0').split('.')[-1]) if '.' in step else 0
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    """Parsed LOT_SIZE, PRICE_FILTER and MIN_NOTIONAL values for one symbol."""
+
+    symbol: str
+    step_size: float
+    quantity_precision: int
+    min_qty: float
+    max_qty: float
+    tick_size: float
+    price_precision: int
+    min_price: float
+    max_price: float
+    min_notional: float
+    raw: Dict = field(repr=False, compare=False)
+
+    @classmethod
+    def from_symbol_info(cls, sym_info: Dict) -> Optional["SymbolFilters"]:
+        """
+        Build filters from one entry of exchange_info['symbols'].
+
+        Returns:
+            SymbolFilters, or None if the symbol has no LOT_SIZE filter
+        """
+        filters = {f['filterType']: f for f in sym_info.get('filters', [])}
+        lot = filters.get('LOT_SIZE')
+        if lot is None:
+            return None
+
+        price = filters.get('PRICE_FILTER', {})
+        # Newer exchange info reports NOTIONAL instead of MIN_NOTIONAL
+        notional = filters.get('MIN_NOTIONAL') or filters.get('NOTIONAL') or {}
+        tick = price.get('tickSize', '0.01000000')
+
+        return cls(
+            symbol=sym_info['symbol'],
+            step_size=float(lot['stepSize']),
+            quantity_precision=_decimals(lot['stepSize']),
+            min_qty=float(lot.get('minQty', 0)),
+            max_qty=float(lot.get('maxQty', 0)),
+            tick_size=float(tick),
+            price_precision=_decimals(tick),
+            min_price=float(price.get('minPrice', 0)),
+            max_price=float(price.get('maxPrice', 0)),
+            min_notional=float(notional.get('minNotional', 0)),
+            raw=sym_info
+        )
+
+    def price_on_tick(self, price: float, rounding: str = ROUND_HALF_UP) -> str:
+        """
+        Snap a price to the PRICE_FILTER tick grid, formatted for the API.
+
+        Args:
+            price: Raw price
+            rounding: decimal rounding mode (ROUND_FLOOR / ROUND_CEILING to stay on one side)
+        """
+        if self.tick_size <= 0:
+            return f"{price:.8f}".rstrip('0').rstrip('.')
+        tick = Decimal(str(self.tick_size))
+        ticks = (Decimal(repr(price)) / tick).quantize(Decimal(1), rounding=rounding)
+        return f"{ticks * tick:.{self.price_precision}f}"
+
+    def quantity_on_step(self, quantity: float) -> str:
+        """Round a quantity down to the LOT_SIZE step grid, formatted for the API."""
+        if self.step_size <= 0:
+            return f"{quantity:.8f}".rstrip('0').rstrip('.')
+        step = Decimal(str(self.step_size))
+        steps = (Decimal(repr(quantity)) / step).quantize(Decimal(1), rounding=ROUND_FLOOR)
+        return f"{steps * step:.{self.quantity_precision}f}"
+
+
+class SymbolCache:
+    """Thread-safe symbol metadata cache with TTL background refresh."""
+
+    # Don't re-download exchange info for unknown symbols more often than this
+    MISS_REFRESH_GAP_SECONDS = 60
+    # First retry delay after a failed refresh; doubles per failure up to the TTL
+    RETRY_BASE_SECONDS = 5
+
+    def __init__(self, ttl_seconds: int = 3600):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Refresh exchange info every N seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, SymbolFilters] = {}
+        self._loaded_at = 0.0  # monotonic
+        self._attempted_at = 0.0  # monotonic, last refresh attempt (successful or not)
+        self._next_refresh = 0.0  # monotonic
+        self._retry_delay = 0.0  # current backoff after failures (0: none)
+        self._fetch: Optional[Callable[[], Dict]] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def load(self, exchange_info: Dict) -> int:
+        """
+        Replace the index with the symbols from an exchange info payload.
+
+        Args:
+            exchange_info: Response of client.get_exchange_info()
+
+        Returns:
+            Number of symbols indexed
+        """
+        index = {}
+        for sym_info in exchange_info.get('symbols', []):
+            filters = SymbolFilters.from_symbol_info(sym_info)
+            if filters is not None:
+                index[filters.symbol] = filters
+
+        with self._lock:
+            self._symbols = index
+            self._loaded_at = time.monotonic()
+            self._next_refresh = self._loaded_at + self.ttl_seconds
+            self._retry_delay = 0.0
+            self.refreshes += 1
+        return len(index)
+
+    def refresh(self) -> bool:
+        """Download exchange info and rebuild the index. Returns True on success."""
+        if self._fetch is None:
+            return False
+        with self._lock:
+            self._attempted_at = time.monotonic()
+        try:
+            count = self.load(self._fetch())
+            logger.log_info(f"Symbol cache refreshed: {count} symbols")
+            return True
+        except Exception as e:
+            self._refresh_failed(e)
+            return False
+
+    async def refresh_on_miss(self, fetch: Callable[[], Awaitable[Dict]]) -> bool:
+        """
+        Reload exchange info for an unknown symbol from the event loop.
+        Same miss gap and failure backoff as a miss in get(); the attempt is
+        stamped before the download, so concurrent misses share one request.
+
+        Args:
+            fetch: Coroutine function returning the exchange info payload
+
+        Returns:
+            True if the index was reloaded
+        """
+        if not self._claim_miss_refresh():
+            return False
+        try:
+            count = self.load(await fetch())
+            logger.log_info(f"Symbol cache refreshed on miss: {count} symbols")
+            return True
+        except Exception as e:
+            self._refresh_failed(e)
+            return False
+
+    def _claim_miss_refresh(self) -> bool:
+        """Check miss_refresh_due and record the attempt in one step."""
+        with self._lock:
+            if not self.miss_refresh_due():
+                return False
+            self._attempted_at = time.monotonic()
+            return True
+
+    def _refresh_failed(self, error: Exception):
+        """Back off exponentially (capped at the TTL) after a failed download."""
+        with self._lock:
+            self.refresh_failures += 1
+            self._retry_delay = min(self.ttl_seconds, max(self.RETRY_BASE_SECONDS, self._retry_delay * 2))
+            self._next_refresh = time.monotonic() + self._retry_delay
+            retry_delay = self._retry_delay
+        logger.log_error(f"Failed to refresh symbol cache: {error} (retrying in {retry_delay:.0f}s)")
+
+    def start(self, fetch: Callable[[], Dict]):
+        """
+        Load exchange info once and start the background refresh thread.
+
+        Args:
+            fetch: Callable returning the exchange info payload
+        """
+        self._fetch = fetch
+        self.refresh()
+
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self.thread.start()
+        logger.log_info(f"Symbol cache started (refreshing every {self.ttl_seconds}s)")
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _refresh_loop(self):
+        """Refresh exchange info whenever the TTL (or a failure's backoff) expires - runs in background thread."""
+        with api_priority(Priority.POLL):
+            while self.running:
+                if time.monotonic() >= self._next_refresh:
+                    self.refresh()
+                time.sleep(1)
+
+    def get(self, symbol: str, refresh_on_miss: bool = True) -> Optional[SymbolFilters]:
+        """
+        Look up parsed filters for a symbol.
+        A miss triggers a refresh (rate limited) in case the symbol was listed recently.
+
+        Args:
+            symbol: Trading pair (e.g., BTCUSDT)
+            refresh_on_miss: Set False where a blocking download is not allowed (event loop)
+
+        Returns:
+            SymbolFilters, or None if the symbol is unknown
+        """
+        with self._lock:
+            filters = self._symbols.get(symbol)
+            if filters is not None:
+                self.hits += 1
+                return filters
+            self.misses += 1
+
+        if refresh_on_miss and self._claim_miss_refresh() and self.refresh():
+            with self._lock:
+                return self._symbols.get(symbol)
+        return None
+
+    def miss_refresh_due(self) -> bool:
+        """True if a miss may trigger a new exchange info download (not while backing off; hold self._lock)."""
+        now = time.monotonic()
+        if self._retry_delay and now < self._next_refresh:
+            return False
+        return now - self._attempted_at >= self.MISS_REFRESH_GAP_SECONDS
+
+    def get_status(self) -> Dict:
+        """
+        Get cache counters for monitoring.
+
+        Returns:
+            Dictionary with size, age and hit/miss/refresh counters
+        """
+        with self._lock:
+            age = time.monotonic() - self._loaded_at if self._loaded_at else None
+            return {
+                'symbols': len(self._symbols),
+                'age_seconds': round(age, 1) if age is not None else None,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'retry_delay_seconds': self._retry_delay or None,
+            }
+
+
+# Global symbol cache instance
+symbol_cache = SymbolCache(ttl_seconds=Config.SYMBOL_INFO_TTL_SECONDS)
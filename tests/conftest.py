@@ -0,0 +1,10 @@
+"""
+Shared test setup. The bot's modules create their CSV logs, position journal
+and risk state under LOG_DIR as soon as they are imported, so point LOG_DIR at
+a throwaway directory before any test module imports them.
+"""
+
+import os
+import tempfile
+
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="tradingbot_tests_")
@@ -0,0 +1,178 @@
+"""BracketManager: OCO placement, fills from the stream and REST, releases and races with local exits."""
+
+import asyncio
+
+import pytest
+
+import brackets
+import exit_manager as exits
+from positions import PositionManager
+from symbol_cache import SymbolFilters
+
+FILTERS = SymbolFilters('BTCUSDT', 0.00001, 5, 0.00001, 9000, 0.01, 2, 0.01, 1e6, 5, {})
+
+
+class FakeExchange:
+    """Just enough of AsyncBinanceAPIClient for brackets and exits."""
+
+    def __init__(self):
+        self.lists = {}
+        self.placed = []
+        self.cancelled = []
+        self.sells = []
+        self.next_id = 100
+        self.on_place = None  # hook run while an OCO is being placed
+
+    async def get_symbol_filters(self, symbol):
+        return FILTERS
+
+    async def place_oco_order(self, **order):
+        if self.on_place:
+            self.on_place()
+        self.next_id += 1
+        self.placed.append(order)
+        self.lists[self.next_id] = {
+            'orderListId': self.next_id,
+            'listOrderStatus': 'EXECUTING',
+            'orders': [
+                {'symbol': order['symbol'], 'orderId': self.next_id * 10},
+                {'symbol': order['symbol'], 'orderId': self.next_id * 10 + 1},
+            ],
+            'legs': {},
+        }
+        return {'orderListId': self.next_id}
+
+    async def cancel_order_list(self, symbol, list_id):
+        self.cancelled.append(list_id)
+        self.lists[list_id]['listOrderStatus'] = 'ALL_DONE'
+        return True
+
+    async def get_open_order_lists(self):
+        return [l for l in self.lists.values() if l['listOrderStatus'] == 'EXECUTING']
+
+    async def get_order_list(self, list_id):
+        return self.lists.get(list_id)
+
+    async def get_order(self, symbol, order_id):
+        for order_list in self.lists.values():
+            if order_id in order_list['legs']:
+                return order_list['legs'][order_id]
+        return {'status': 'EXPIRED', 'type': 'LIMIT_MAKER'}
+
+    async def place_sell_order(self, symbol, quantity):
+        self.sells.append((symbol, quantity))
+        return {'status': 'FILLED', 'executedQty': str(quantity), 'cummulativeQuoteQty': str(quantity * 98)}
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    monkeypatch.setattr(brackets, "position_manager", book)
+    monkeypatch.setattr(exits, "position_manager", book)
+    return book
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    exchange = FakeExchange()
+    monkeypatch.setattr(brackets, "get_async_binance_client", lambda: exchange)
+    monkeypatch.setattr(exits, "get_async_binance_client", lambda: exchange)
+    return exchange
+
+
+@pytest.fixture
+def exit_manager(monkeypatch):
+    manager = exits.ExitManager()
+    monkeypatch.setattr(brackets, "exit_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def manager(book, exchange, exit_manager):
+    return brackets.BracketManager(enabled=True, stop_limit_offset=0.005)
+
+
+def test_protect_places_oco_and_leaves_local_monitoring(book, exchange, manager):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    assert asyncio.run(manager.protect(position_id))
+    order = exchange.placed[0]
+    assert order['side'] == "SELL"
+    assert order['limit_price'] == "102.50"
+    assert order['stop_price'] == "99.00"
+    assert order['stop_limit_price'] == "98.50"
+    assert book.get_position(position_id).oco_list_id == 101
+    assert len(book.trigger_index) == 0
+
+
+def test_stream_fill_closes_position(book, exchange, manager):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        await manager.protect(position_id)
+        manager._on_execution_report({
+            'e': 'executionReport', 'g': 101, 'X': 'FILLED', 'o': 'LIMIT_MAKER',
+            'z': '0.5', 'Z': '51.25', 'L': '102.5',
+        })
+        await manager.stop()  # waits for the close task
+
+    asyncio.run(scenario())
+    assert not book.is_open(position_id)
+    assert manager.fills['stream'] == 1
+    assert manager.get_status()['live_brackets'] == 0
+
+
+def test_reconcile_closes_rest_fill_and_releases_cancelled_bracket(book, exchange, manager):
+    filled = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    cancelled = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        await manager.protect(filled)
+        await manager.protect(cancelled)
+        # List 101: the stop leg filled while the stream was down; list 102 was cancelled outside the bot
+        exchange.lists[101]['listOrderStatus'] = 'ALL_DONE'
+        exchange.lists[101]['legs'][1011] = {
+            'status': 'FILLED', 'executedQty': '0.5', 'cummulativeQuoteQty': '49.5', 'type': 'STOP_LOSS_LIMIT',
+        }
+        exchange.lists[102]['listOrderStatus'] = 'ALL_DONE'
+        await manager.reconcile()
+
+    asyncio.run(scenario())
+    assert not book.is_open(filled)
+    assert manager.fills['rest'] == 1
+    assert manager.released == 1
+    assert book.get_position(cancelled).oco_list_id is None
+    assert len(book.trigger_index) == 1  # back under local SL/TP monitoring
+
+
+def test_protect_refused_while_exit_in_flight(book, exchange, manager, exit_manager):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    exit_manager._pending[position_id] = object()
+
+    assert not asyncio.run(manager.protect(position_id))
+    assert exchange.placed == []
+
+
+def test_exit_triggered_during_placement_withdraws_the_oco(book, exchange, manager, exit_manager):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    exchange.on_place = lambda: exit_manager._pending.setdefault(position_id, object())
+
+    assert not asyncio.run(manager.protect(position_id))
+    assert exchange.cancelled == [101]
+    assert book.get_position(position_id).oco_list_id is None
+    assert manager.get_status()['live_brackets'] == 0
+
+
+def test_local_exit_cancels_bracket_before_selling(book, exchange, manager, exit_manager):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        await manager.protect(position_id)
+        position = book.get_position(position_id)
+        return await exit_manager._execute_exit(position, 98.0, "STOP_LOSS")
+
+    outcome, pnl = asyncio.run(scenario())
+    assert outcome == "closed"
+    assert exchange.cancelled == [101]
+    assert exchange.sells == [("BTCUSDT", 0.5)]
+    assert not book.is_open(position_id)
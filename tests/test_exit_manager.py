@@ -0,0 +1,139 @@
+"""ExitManager: ticks trigger exits once per position, failed exits back off."""
+
+import asyncio
+
+import pytest
+
+import exit_manager as exits
+from positions import PositionManager
+
+
+class FakeExchange:
+    """Market orders that fail until `fail` is cleared."""
+
+    def __init__(self):
+        self.fail = True
+        self.sells = 0
+
+    async def place_sell_order(self, symbol, quantity):
+        self.sells += 1
+        if self.fail:
+            return None
+        return {'status': 'FILLED', 'executedQty': str(quantity), 'cummulativeQuoteQty': str(quantity * 98)}
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    monkeypatch.setattr(exits, "position_manager", book)
+    return book
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    exchange = FakeExchange()
+    monkeypatch.setattr(exits, "get_async_binance_client", lambda: exchange)
+    return exchange
+
+
+def make_manager(**kwargs):
+    manager = exits.ExitManager(mode="stream", **kwargs)
+    manager.running = True
+    manager._slots = asyncio.Semaphore(manager.workers)
+    return manager
+
+
+async def tick(manager, symbol, price):
+    manager._on_tick(symbol, price)
+    if manager._exit_tasks:
+        await asyncio.gather(*manager._exit_tasks)
+
+
+def test_one_exit_in_flight_per_position(book, exchange):
+    exchange.fail = False
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        manager = make_manager()
+        for _ in range(5):
+            manager._on_tick("BTCUSDT", 98.0)
+        assert len(manager._pending) == 1
+        await asyncio.gather(*manager._exit_tasks)
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert exchange.sells == 1
+    assert manager.outcomes == {'closed': 1}
+    assert not book.is_open(position_id)
+
+
+def test_failed_exit_backs_off_exponentially(book, exchange):
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        manager = make_manager(retry_base=0.2, retry_max=0.4)
+        await tick(manager, "BTCUSDT", 98.0)
+        assert exchange.sells == 1
+
+        # Every tick inside the backoff window is skipped
+        for _ in range(20):
+            await tick(manager, "BTCUSDT", 98.0)
+        assert exchange.sells == 1
+        assert manager.retries_deferred == 20
+
+        await asyncio.sleep(0.25)
+        await tick(manager, "BTCUSDT", 98.0)
+        assert exchange.sells == 2
+        assert manager._retry_after[position_id][1] == pytest.approx(0.4)
+
+        # Capped at retry_max; a successful exit clears the backoff
+        await asyncio.sleep(0.45)
+        exchange.fail = False
+        await tick(manager, "BTCUSDT", 98.0)
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert exchange.sells == 3
+    assert manager.outcomes == {'order_failed': 2, 'closed': 1}
+    assert manager.get_status()['backing_off'] == 0
+    assert not book.is_open(position_id)
+
+
+def test_backoff_is_per_position(book, exchange):
+    failing = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    other = book.open_position("ETHUSDT", "BUY", 0.5, 100.0)
+
+    async def scenario():
+        manager = make_manager(retry_base=60)
+        await tick(manager, "BTCUSDT", 98.0)
+        exchange.fail = False
+        await tick(manager, "ETHUSDT", 98.0)
+
+    asyncio.run(scenario())
+    assert book.is_open(failing)
+    assert not book.is_open(other)
+
+
+def test_trigger_to_order_latency_stops_at_order_return(book, exchange, monkeypatch):
+    exchange.fail = False
+    book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    close_position = book.close_position
+
+    def slow_close(*args, **kwargs):
+        exits.time.sleep(0.2)
+        return close_position(*args, **kwargs)
+
+    monkeypatch.setattr(book, "close_position", slow_close)
+
+    async def scenario():
+        manager = make_manager()
+        await tick(manager, "BTCUSDT", 98.0)
+        return manager
+
+    manager = asyncio.run(scenario())
+    attempt = manager.recent_exits[-1]
+    assert attempt.order_ms < 100
+    assert attempt.elapsed_ms >= 200
+    status = manager.get_status()
+    assert status['trigger_to_order_latency']['stream']['count'] == 1
+    assert status['order_to_close_latency']['count'] == 1
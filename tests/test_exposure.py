@@ -0,0 +1,75 @@
+"""Exposure ledger accounting, on its own and as kept by the position manager."""
+
+import pytest
+
+from exposure import ExposureLedger
+from positions import PositionManager
+
+
+def test_add_accumulates_per_symbol_side_and_total():
+    ledger = ExposureLedger()
+    ledger.add("BTCUSDT", "BUY", 100.0)
+    ledger.add("BTCUSDT", "SELL", 50.0)
+    ledger.add("ETHUSDT", "BUY", 30.0)
+
+    assert ledger.symbol_notional("BTCUSDT") == pytest.approx(150.0)
+    assert ledger.symbol_notional("ETHUSDT") == pytest.approx(30.0)
+    assert ledger.symbol_notional("SOLUSDT") == 0.0
+    assert ledger.total_notional() == pytest.approx(180.0)
+    assert ledger.open_positions() == 3
+    assert ledger.symbol_positions("BTCUSDT") == 2
+
+    status = ledger.get_status()
+    assert status['long_notional'] == pytest.approx(130.0)
+    assert status['short_notional'] == pytest.approx(50.0)
+    assert status['net_notional'] == pytest.approx(80.0)
+
+
+def test_remove_subtracts_and_returns_to_exact_zero():
+    ledger = ExposureLedger()
+    ledger.add("BTCUSDT", "BUY", 0.1)
+    ledger.add("BTCUSDT", "BUY", 0.2)
+    ledger.add("ETHUSDT", "SELL", 0.3)
+
+    ledger.remove("BTCUSDT", "BUY", 0.1)
+    assert ledger.symbol_notional("BTCUSDT") == pytest.approx(0.2)
+    assert ledger.total_notional() == pytest.approx(0.5)
+    assert ledger.symbol_positions("BTCUSDT") == 1
+
+    ledger.remove("BTCUSDT", "BUY", 0.2)
+    ledger.remove("ETHUSDT", "SELL", 0.3)
+    # The last position out resets the totals, so float error never accumulates
+    assert ledger.total_notional() == 0.0
+    assert ledger.open_positions() == 0
+    assert ledger.get_status()['symbols'] == {}
+
+
+def test_remove_of_unknown_symbol_is_ignored():
+    ledger = ExposureLedger()
+    ledger.add("BTCUSDT", "BUY", 100.0)
+    ledger.remove("ETHUSDT", "BUY", 100.0)
+
+    assert ledger.open_positions() == 1
+    assert ledger.total_notional() == pytest.approx(100.0)
+
+
+def test_position_manager_keeps_ledger_in_step(tmp_path):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    first = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    second = book.open_position("BTCUSDT", "SELL", 2.0, 100.0)
+    assert book.exposure.symbol_notional("BTCUSDT") == pytest.approx(250.0)
+    assert book.exposure.open_positions() == 2
+
+    book.close_position(first, 110.0, "TAKE_PROFIT")
+    assert book.exposure.symbol_notional("BTCUSDT") == pytest.approx(200.0)
+
+    book.close_position(second, 90.0, "TAKE_PROFIT")
+    assert book.exposure.total_notional() == 0.0
+    assert book.exposure.open_positions() == 0
+
+    # A restart rebuilds the ledger from the journal
+    third = book.open_position("ETHUSDT", "BUY", 1.0, 40.0)
+    book.close()
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert reloaded.exposure.symbol_notional("ETHUSDT") == pytest.approx(40.0)
+    assert reloaded.is_open(third)
@@ -0,0 +1,62 @@
+"""PollScheduler: check intervals stretch far from triggers and in calm markets."""
+
+import pytest
+
+from poll_scheduler import PollScheduler
+
+
+def test_new_symbols_are_due_and_dropped_ones_forgotten():
+    scheduler = PollScheduler()
+    assert sorted(scheduler.due(["BTCUSDT", "ETHUSDT"], now=0.0)) == ["BTCUSDT", "ETHUSDT"]
+
+    scheduler.observe("BTCUSDT", 100.0, 0.05, now=0.0)
+    assert scheduler.due(["BTCUSDT", "ETHUSDT"], now=0.1) == ["ETHUSDT"]
+
+    assert scheduler.due(["ETHUSDT"], now=0.2) == ["ETHUSDT"]
+    assert "BTCUSDT" not in scheduler.get_status()['symbols']
+
+
+def test_interval_grows_with_distance_to_the_nearest_trigger():
+    scheduler = PollScheduler(min_interval=0.5, max_interval=30.0, safety=3.0)
+    sigma = 3e-4
+
+    assert scheduler.interval_for(0.0001, sigma) == 0.5  # near a trigger: floor
+    assert scheduler.interval_for(-0.01, sigma) == 0.5  # already crossed
+    assert scheduler.interval_for(0.0036, sigma) == pytest.approx(16.0)  # (0.0036 / 9e-4) ** 2
+    assert scheduler.interval_for(0.05, sigma) == 30.0  # far away: ceiling
+    assert scheduler.interval_for(None, sigma) == 30.0  # no positions left
+
+
+def test_volatile_symbols_are_checked_sooner():
+    calm = PollScheduler()
+    busy = PollScheduler()
+    now, calm_price, busy_price = 0.0, 100.0, 100.0
+    for step in range(30):
+        now += 1.0
+        calm_price *= 1.00001
+        busy_price *= 1.002 if step % 2 else 0.998
+        calm_interval = calm.observe("BTCUSDT", calm_price, 0.003, now=now)
+        busy_interval = busy.observe("BTCUSDT", busy_price, 0.003, now=now)
+
+    # Same distance to the trigger, but 0.2% swings per second need checks far more often
+    assert busy_interval < calm_interval / 3
+
+
+def test_failed_fetch_is_retried_quickly():
+    scheduler = PollScheduler(max_interval=30.0)
+    scheduler.due(["BTCUSDT"], now=0.0)
+    scheduler.observe("BTCUSDT", 100.0, 0.05, now=0.0)
+    assert scheduler.next_check() == pytest.approx(30.0)
+
+    scheduler.retry("BTCUSDT", now=5.0)
+    assert scheduler.next_check() == pytest.approx(5.0 + PollScheduler.RETRY_SECONDS)
+    assert scheduler.due(["BTCUSDT"], now=6.0) == ["BTCUSDT"]
+
+
+def test_request_budget_counts_the_last_minute_only():
+    scheduler = PollScheduler()
+    scheduler.record_poll(2, 4, now=0.0)
+    scheduler.record_poll(1, 2, now=30.0)
+    scheduler.record_poll(1, 2, now=65.0)
+
+    assert [weight for _, _, weight in scheduler._polls] == [2, 2]
@@ -0,0 +1,110 @@
+"""PositionManager persistence: journal replay and compaction, failed writes retried."""
+
+from datetime import datetime
+
+import pytest
+
+from positions import PositionManager
+
+
+def journal_lines(book):
+    return book.journal_file.read_text(encoding='utf-8').splitlines()
+
+
+def test_replay_restores_open_book_and_prices(tmp_path):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    kept = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    short = book.open_position("BTCUSDT", "SELL", 1.0, 100.0)
+    closed = book.open_position("ETHUSDT", "BUY", 1.0, 40.0)
+    book.close_position(closed, 41.0, "TAKE_PROFIT")
+    book.update_position_price("BTCUSDT", 100.5)
+    book.flush_prices()
+    # No close(): restart from the journal as written
+
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert sorted(p.position_id for p in reloaded.get_open_positions()) == sorted([kept, short])
+    assert reloaded.get_position(kept).current_price == 100.5
+    assert len(reloaded.trigger_index) == 2
+    assert [p.position_id for p in reloaded.archive.query(datetime.utcnow().date())] == [closed]
+    # Startup compacts the journal down to one record per open position
+    assert len(journal_lines(reloaded)) == 2
+
+
+def test_replay_skips_a_torn_last_line(tmp_path):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    first = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    second = book.open_position("ETHUSDT", "BUY", 1.0, 40.0)
+    with open(book.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op":"close","id":"%s","fields":{"Sta' % first)  # crash mid-append
+
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert reloaded.is_open(first)
+    assert reloaded.is_open(second)
+    # The compacted journal no longer holds the partial line
+    assert len(journal_lines(reloaded)) == 2
+
+
+def test_compaction_keeps_the_journal_bounded(tmp_path):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    book.compact_every = 5
+    ids = [book.open_position("BTCUSDT", "BUY", 0.1, 100.0 + i) for i in range(4)]
+    for position_id in ids[:3]:
+        book.close_position(position_id, 101.0, "MANUAL")
+
+    assert book.compactions >= 2  # one at startup, one once 5 events accumulated
+    assert len(journal_lines(book)) < 7
+    assert [p.position_id for p in book.get_open_positions()] == [ids[3]]
+
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert [p.position_id for p in reloaded.get_open_positions()] == [ids[3]]
+    assert len(list(reloaded.archive.query(datetime.utcnow().date()))) == 3
+
+
+def fail_next_append(book, monkeypatch):
+    append = book._append
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return append(*args, **kwargs)
+
+    monkeypatch.setattr(book, "_append", flaky)
+
+
+def test_failed_open_write_keeps_position_managed(tmp_path, monkeypatch):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    fail_next_append(book, monkeypatch)
+
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    assert position_id is not None
+    assert book.is_open(position_id)
+    assert len(book.trigger_index) == 1
+    assert book.exposure.symbol_notional("BTCUSDT") == pytest.approx(50.0)
+    assert book.get_status()['unpersisted_opens'] == 1
+
+    book.retry_writes()
+    assert book.get_status()['unpersisted_opens'] == 0
+    book.close()
+
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert reloaded.is_open(position_id)
+
+
+def test_close_before_retry_writes_the_open_first(tmp_path, monkeypatch):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    fail_next_append(book, monkeypatch)
+    position_id = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+
+    assert book.close_position(position_id, 102.0, "TAKE_PROFIT") == pytest.approx(1.0)
+    status = book.get_status()
+    assert status['unpersisted_opens'] == 0
+    assert status['unpersisted_closes'] == 0
+    book.retry_writes()  # nothing left to write; must not resurrect the position
+    book.close()
+
+    reloaded = PositionManager(log_dir=tmp_path, store=None)
+    assert not reloaded.is_open(position_id)
+    archived = list(reloaded.archive.query(datetime.utcnow().date()))
+    assert [p.position_id for p in archived] == [position_id]
@@ -0,0 +1,99 @@
+"""PriceBook on a mocked websocket: ticks, bad messages, reconnect and resubscribe."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import ws_stream
+from price_book import PriceBook
+
+
+class FakeSocket:
+    """Delivers its messages, then drops the connection or stays open until cancelled."""
+
+    def __init__(self, messages, drop):
+        self.messages = messages
+        self.drop = drop
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+    def __aiter__(self):
+        return self._receive()
+
+    async def _receive(self):
+        for message in self.messages:
+            yield message
+            await asyncio.sleep(0)
+        if self.drop:
+            raise ConnectionError("connection reset")
+        await asyncio.Event().wait()
+
+
+def book_ticker(symbol, bid, ask):
+    return json.dumps({'stream': f"{symbol.lower()}@bookTicker", 'data': {'s': symbol, 'b': bid, 'a': ask}})
+
+
+def mini_ticker(symbol, close):
+    return json.dumps({'data': {'e': '24hrMiniTicker', 's': symbol, 'c': close}})
+
+
+async def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_stream_updates_quotes_and_resubscribes_after_disconnect(monkeypatch):
+    sockets = [
+        FakeSocket([book_ticker("BTCUSDT", "99", "101"), "not json", mini_ticker("ETHUSDT", "40.5")], drop=True),
+        FakeSocket([], drop=False),
+    ]
+    connects = []
+
+    @asynccontextmanager
+    async def connect(url, **kwargs):
+        connects.append(url)
+        yield sockets[len(connects) - 1]
+
+    monkeypatch.setattr(ws_stream.websockets, "connect", connect)
+
+    book = PriceBook(stale_seconds=5)
+    book.RECONNECT_DELAY = 0.01
+    ticks = []
+    book.add_listener(lambda symbol, price: ticks.append((symbol, price)))
+    book.subscribe(["BTCUSDT"])
+
+    async def scenario():
+        book.start()
+        await wait_for(lambda: book.connects == 2 and book.connected)
+        book.subscribe(["BTCUSDT", "ETHUSDT"])
+        await wait_for(lambda: len(sockets[1].sent) == 2)
+        book.stop()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert ticks == [("BTCUSDT", 100.0), ("ETHUSDT", 40.5)]
+    assert book.messages == 3  # the unreadable one is counted and skipped
+    assert book.get_price("BTCUSDT") == 100.0
+    assert book.get_quote("ETHUSDT").last == 40.5
+
+    streams = ['btcusdt@bookTicker', 'btcusdt@miniTicker']
+    assert [m['params'] for m in sockets[0].sent] == [streams]
+    # Every reconnect resubscribes; later subscriptions only send the new symbols
+    assert [m['params'] for m in sockets[1].sent] == [streams, ['ethusdt@bookTicker', 'ethusdt@miniTicker']]
+    assert not book.connected
+
+
+def test_stale_and_unknown_quotes_are_not_served():
+    book = PriceBook(stale_seconds=5)
+    book.on_message(json.loads(book_ticker("BTCUSDT", "99", "101")))
+    book._quotes["BTCUSDT"].received_at -= 10
+
+    assert book.get_price("BTCUSDT") is None
+    assert book.get_price("ETHUSDT") is None
+    assert (book.hits, book.stale, book.misses) == (0, 1, 1)
@@ -0,0 +1,74 @@
+"""WeightLimiter: exit reserve, priority lanes and 429/418 backoff."""
+
+import asyncio
+import time
+
+import pytest
+
+from rate_limiter import Priority, WeightLimiter, api_priority
+
+
+async def request(limiter, lane, weight, granted, name):
+    with api_priority(lane):
+        await limiter.acquire_async(weight)
+    granted.append(name)
+
+
+def test_exit_reserve_is_left_to_exits():
+    limiter = WeightLimiter(weight_per_minute=600, exit_reserve=0.5)
+    limiter.record_response(200, {'X-MBX-USED-WEIGHT-1M': '300'})
+
+    async def scenario():
+        granted = []
+        await asyncio.wait_for(request(limiter, Priority.EXIT, 50, granted, "exit"), 0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(request(limiter, Priority.ENTRY, 50, granted, "entry"), 0.05)
+        return granted
+
+    assert asyncio.run(scenario()) == ["exit"]
+    status = limiter.get_status()
+    assert status['used_weight_1m'] == 300
+    assert sum(status['queue_depth'].values()) == 0  # the abandoned entry left the queue
+
+
+def test_queued_requests_are_served_by_lane():
+    limiter = WeightLimiter(weight_per_minute=6000, exit_reserve=0.0)
+    limiter.record_response(200, {'X-MBX-USED-WEIGHT-1M': '6000'})  # empty bucket
+
+    async def scenario():
+        granted = []
+        await asyncio.gather(
+            request(limiter, Priority.POLL, 5, granted, "poll"),
+            request(limiter, Priority.ENTRY, 5, granted, "entry"),
+            request(limiter, Priority.EXIT, 5, granted, "exit"),
+        )
+        return granted
+
+    assert asyncio.run(scenario()) == ["exit", "entry", "poll"]
+    assert limiter.get_status()['waits'] == {'exit': 1, 'entry': 1, 'poll': 1}
+
+
+def test_429_pauses_every_lane_for_retry_after():
+    limiter = WeightLimiter()
+    limiter.record_response(429, {'Retry-After': '0.2'})
+
+    started = time.monotonic()
+    with api_priority(Priority.EXIT):
+        limiter.acquire(1)
+    assert time.monotonic() - started >= 0.19
+    assert limiter.rate_limited_responses == 1
+
+
+def test_418_without_retry_after_blocks_for_a_minute():
+    limiter = WeightLimiter()
+    limiter.record_response(418, {})
+
+    status = limiter.get_status()
+    assert status['rate_limited_responses'] == 1
+    assert status['blocked_for_seconds'] == pytest.approx(60, abs=1)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(request(limiter, Priority.EXIT, 1, [], "exit"), 0.05)
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+"""RiskEngine.admit: checks and reservation happen in one step."""
+
+import threading
+import time
+
+import pytest
+
+from config import Config
+from exposure import ExposureLedger
+from risk import RiskEngine
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(Config, "MIN_CONFIDENCE", 50)
+    monkeypatch.setattr(Config, "MIN_BALANCE_USDT", 10)
+    monkeypatch.setattr(Config, "MAX_OPEN_TRADES", 100)
+    monkeypatch.setattr(Config, "MAX_POSITIONS_PER_SYMBOL", 0)
+    monkeypatch.setattr(Config, "MAX_TRADES_PER_DAY", 100)
+    monkeypatch.setattr(Config, "MAX_SYMBOL_NOTIONAL", 0)
+    monkeypatch.setattr(Config, "MAX_PORTFOLIO_NOTIONAL", 0)
+    monkeypatch.setattr(Config, "SIGNAL_COOLDOWN_SECONDS", 300)
+    return RiskEngine(state_file=None, exposure=ExposureLedger())
+
+
+def admit(engine, symbol="BTCUSDT", action="BUY"):
+    return engine.admit(symbol, action, 90, account_balance=1000, notional=10.0)
+
+
+def test_reservation_holds_the_cooldown_until_released(engine):
+    allowed, _, reservation = admit(engine)
+    assert allowed
+
+    # A second signal while the first order is in flight sees the cooldown
+    allowed, reason, second = admit(engine)
+    assert not allowed
+    assert "cooldown active" in reason
+    assert second is None
+    assert not engine.check_signal_constraints("BTCUSDT", "BUY", 90)[0]
+    assert admit(engine, action="SELL")[0]
+
+    # The order failed: nothing was recorded, so the symbol is free again
+    engine.release(reservation)
+    assert admit(engine)[0]
+
+
+def test_recorded_trade_outlives_its_reservation(engine):
+    _, _, reservation = admit(engine)
+    engine.record_trade("BTCUSDT", "BUY")
+    engine.record_signal("BTCUSDT", "BUY")
+    engine.release(reservation)
+
+    assert engine.trades_in_window(time.monotonic()) == 1
+    assert not admit(engine)[0]
+
+
+def test_reservations_count_toward_open_and_daily_limits(monkeypatch, engine):
+    monkeypatch.setattr(Config, "MAX_OPEN_TRADES", 2)
+    first = admit(engine, "BTCUSDT")[2]
+    admit(engine, "ETHUSDT")
+
+    allowed, reason, _ = admit(engine, "SOLUSDT")
+    assert not allowed
+    assert "Max open trades" in reason
+
+    monkeypatch.setattr(Config, "MAX_OPEN_TRADES", 100)
+    monkeypatch.setattr(Config, "MAX_TRADES_PER_DAY", 2)
+    allowed, reason, _ = admit(engine, "SOLUSDT")
+    assert not allowed
+    assert "Daily trade limit" in reason
+
+    engine.release(first)
+    assert admit(engine, "SOLUSDT")[0]
+
+
+def test_concurrent_signals_for_one_symbol_admit_one(engine):
+    results = []
+    barrier = threading.Barrier(8)
+
+    def signal():
+        barrier.wait()
+        results.append(admit(engine)[0])
+
+    threads = [threading.Thread(target=signal) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert engine.get_status()['reserved_trades'] == 1
@@ -0,0 +1,111 @@
+"""Signals rejected at the per-symbol and portfolio notional caps."""
+
+import pytest
+
+from config import Config
+from exposure import ExposureLedger
+from risk import RiskEngine
+
+
+@pytest.fixture
+def ledger():
+    return ExposureLedger()
+
+
+@pytest.fixture
+def engine(monkeypatch, ledger):
+    # Loose limits everywhere except the notional caps under test
+    monkeypatch.setattr(Config, "MIN_CONFIDENCE", 50)
+    monkeypatch.setattr(Config, "MIN_BALANCE_USDT", 10)
+    monkeypatch.setattr(Config, "MAX_OPEN_TRADES", 100)
+    monkeypatch.setattr(Config, "MAX_POSITIONS_PER_SYMBOL", 0)
+    monkeypatch.setattr(Config, "MAX_TRADES_PER_DAY", 100)
+    monkeypatch.setattr(Config, "MAX_SYMBOL_NOTIONAL", 0)
+    monkeypatch.setattr(Config, "MAX_PORTFOLIO_NOTIONAL", 0)
+    return RiskEngine(state_file=None, exposure=ledger)
+
+
+def check(engine, symbol, notional):
+    return engine.check_all_constraints(symbol, "BUY", 90, account_balance=1000, notional=notional)
+
+
+def rule_status(engine, name):
+    return next(rule for rule in engine.get_status()['rules'] if rule['name'] == name)
+
+
+def test_symbol_cap_rejects_signal_that_would_exceed_it(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_SYMBOL_NOTIONAL", 100)
+    ledger.add("BTCUSDT", "BUY", 80.0)
+
+    allowed, reason = check(engine, "BTCUSDT", 30.0)
+    assert not allowed
+    assert "Notional limit for BTCUSDT" in reason
+    assert rule_status(engine, "symbol_notional")['rejections'] == 1
+
+    # Up to the cap is fine, and other symbols are unaffected
+    assert check(engine, "BTCUSDT", 20.0)[0]
+    assert check(engine, "ETHUSDT", 30.0)[0]
+
+
+def test_symbol_cap_counts_both_sides(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_SYMBOL_NOTIONAL", 100)
+    ledger.add("BTCUSDT", "BUY", 60.0)
+    ledger.add("BTCUSDT", "SELL", 30.0)
+
+    allowed, reason = check(engine, "BTCUSDT", 20.0)
+    assert not allowed
+    assert "$90.00 open" in reason
+
+
+def test_portfolio_cap_rejects_signal_that_would_exceed_it(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_PORTFOLIO_NOTIONAL", 150)
+    ledger.add("BTCUSDT", "BUY", 80.0)
+    ledger.add("ETHUSDT", "SELL", 50.0)
+
+    allowed, reason = check(engine, "SOLUSDT", 30.0)
+    assert not allowed
+    assert "Portfolio notional limit reached" in reason
+    assert rule_status(engine, "portfolio_notional")['rejections'] == 1
+
+    assert check(engine, "SOLUSDT", 20.0)[0]
+
+
+def test_closing_a_position_frees_the_cap(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_PORTFOLIO_NOTIONAL", 100)
+    ledger.add("BTCUSDT", "BUY", 90.0)
+    assert not check(engine, "ETHUSDT", 20.0)[0]
+
+    ledger.remove("BTCUSDT", "BUY", 90.0)
+    assert check(engine, "ETHUSDT", 20.0)[0]
+
+
+def test_zero_caps_are_off(engine, ledger):
+    ledger.add("BTCUSDT", "BUY", 1_000_000.0)
+
+    assert check(engine, "BTCUSDT", 1_000_000.0)[0]
+
+
+def test_notional_rules_wait_for_the_pretrade_context(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_SYMBOL_NOTIONAL", 100)
+    ledger.add("BTCUSDT", "BUY", 100.0)
+
+    # The exchange-free phase passes; the cap applies once the trade size is known
+    assert engine.check_signal_constraints("BTCUSDT", "BUY", 90)[0]
+    assert rule_status(engine, "symbol_notional")['evaluations'] == 0
+    allowed, _, reservation = engine.admit("BTCUSDT", "BUY", 90, account_balance=1000, notional=10.0)
+    assert not allowed
+    assert reservation is None
+
+
+def test_reserved_notional_counts_until_released(monkeypatch, engine, ledger):
+    monkeypatch.setattr(Config, "MAX_PORTFOLIO_NOTIONAL", 100)
+    monkeypatch.setattr(Config, "SIGNAL_COOLDOWN_SECONDS", 0)
+
+    allowed, _, reservation = engine.admit("BTCUSDT", "BUY", 90, account_balance=1000, notional=60.0)
+    assert allowed
+    allowed, reason, _ = engine.admit("ETHUSDT", "BUY", 90, account_balance=1000, notional=60.0)
+    assert not allowed
+    assert "$60.00 open" in reason
+
+    engine.release(reservation)
+    assert engine.admit("ETHUSDT", "BUY", 90, account_balance=1000, notional=60.0)[0]
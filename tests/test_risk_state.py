@@ -0,0 +1,94 @@
+"""Risk engine state snapshot: save on change, restore on startup."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from config import Config
+from risk import RiskEngine
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(Config, "DAILY_LIMIT_ROLLING", True)
+    monkeypatch.setattr(Config, "SIGNAL_COOLDOWN_SECONDS", 300)
+    monkeypatch.setattr(Config, "OPEN_ORDER_TTL_SECONDS", 3600)
+    monkeypatch.setattr(Config, "MIN_CONFIDENCE", 50)
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / "risk_state.json"
+
+
+def test_round_trip_restores_trades_cooldowns_and_open_orders(state_file):
+    engine = RiskEngine(state_file=state_file)
+    engine.record_trade("BTCUSDT", "BUY")
+    engine.record_trade("ETHUSDT", "SELL")
+    engine.record_signal("BTCUSDT", "BUY")
+    engine.add_open_trade("ETHUSDT", 12345, "SELL", 0.5)
+    assert state_file.exists()
+
+    restored = RiskEngine(state_file=state_file)
+    now = time.monotonic()
+    assert restored.trades_in_window(now) == 2
+    assert restored.last_signal("BTCUSDT", "BUY", now) is not None
+    assert restored.last_signal("BTCUSDT", "SELL", now) is None
+    assert restored.open_trade_count() == 1
+
+    allowed, reason = restored.check_signal_constraints("BTCUSDT", "BUY", 90)
+    assert not allowed
+    assert "cooldown active" in reason
+
+    # The restored order is still matched by its id
+    restored.remove_open_trade(12345)
+    assert restored.open_trade_count() == 0
+    assert RiskEngine(state_file=state_file).open_trade_count() == 0
+
+
+def test_restore_drops_state_that_expired_while_down(state_file):
+    engine = RiskEngine(state_file=state_file)
+    engine.record_trade("BTCUSDT", "BUY")
+    engine.record_signal("BTCUSDT", "BUY")
+    engine.add_open_trade("BTCUSDT", 1, "BUY", 0.5)
+
+    # Shift the snapshot two days back, as if the bot had been down since
+    state = json.loads(state_file.read_text())
+    state['trades'] = [t - 2 * 86400 for t in state['trades']]
+    state['cooldowns'] = [[s, a, t - 2 * 86400] for s, a, t in state['cooldowns']]
+    state['open_trades'][0]['opened_at'] = "2000-01-01T00:00:00"
+    state_file.write_text(json.dumps(state))
+
+    restored = RiskEngine(state_file=state_file)
+    now = time.monotonic()
+    assert restored.trades_in_window(now) == 0
+    assert restored.last_signal("BTCUSDT", "BUY", now) is None
+    assert restored.open_trade_count() == 0
+
+
+def test_unreadable_snapshot_starts_empty(state_file):
+    state_file.write_text("{not json")
+
+    engine = RiskEngine(state_file=state_file)
+    assert engine.trades_in_window(time.monotonic()) == 0
+    assert engine.open_trade_count() == 0
+
+
+def test_execution_report_releases_unfilled_order(state_file):
+    engine = RiskEngine(state_file=state_file)
+    engine.add_open_trade("BTCUSDT", 777, "BUY", 0.5)
+
+    # Listeners run on the event loop; asyncio.run also waits for the
+    # worker thread the state write is handed to
+    async def deliver(*events):
+        for event in events:
+            engine.on_execution_report(event)
+
+    asyncio.run(deliver({'e': 'executionReport', 'i': 777, 'X': 'PARTIALLY_FILLED'}))
+    assert engine.open_trade_count() == 1
+
+    asyncio.run(deliver({'e': 'executionReport', 'i': 777, 'X': 'CANCELED'}))
+    assert engine.open_trade_count() == 0
+    assert RiskEngine(state_file=state_file).open_trade_count() == 0
@@ -0,0 +1,22 @@
+"""SQLite store: the one-shot CSV import picks up the positions journal."""
+
+from positions import PositionManager
+from sqlite_store import SQLiteStore
+
+
+def test_import_replays_positions_journal(tmp_path):
+    book = PositionManager(log_dir=tmp_path, store=None)
+    kept = book.open_position("BTCUSDT", "BUY", 0.5, 100.0)
+    closed = book.open_position("ETHUSDT", "SELL", 1.0, 40.0)
+    book.close_position(closed, 39.0, "TAKE_PROFIT")
+    book.update_position_price("BTCUSDT", 101.0)
+    book.flush_prices()
+    # No shutdown compaction: positions.csv is stale, the journal is not
+
+    store = SQLiteStore(tmp_path / "trading.db")
+    assert store.import_csvs(tmp_path)['positions'] == 2
+
+    assert [p['PositionId'] for p in store.load_open_positions()] == [kept]
+    assert store.get_position(kept)['CurrentPrice'] == 101.0
+    assert store.get_position(closed)['Status'] == 'CLOSED'
+    assert store.get_position(closed)['PnL'] == 1.0
@@ -0,0 +1,163 @@
+"""Symbol cache: lookups, misses, refresh and failure backoff."""
+
+import asyncio
+
+import pytest
+
+import async_binance_client
+from async_binance_client import AsyncBinanceAPIClient
+from symbol_cache import SymbolCache
+
+
+def exchange_info(*symbols):
+    return {'symbols': [
+        {
+            'symbol': symbol,
+            'filters': [
+                {'filterType': 'LOT_SIZE', 'stepSize': '0.00100000', 'minQty': '0.001', 'maxQty': '9000'},
+                {'filterType': 'PRICE_FILTER', 'tickSize': '0.01000000', 'minPrice': '0.01', 'maxPrice': '1000000'},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'},
+            ],
+        }
+        for symbol in symbols
+    ]}
+
+
+class FakeAsyncClient:
+    """python-binance AsyncClient stand-in counting exchangeInfo downloads."""
+
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+        self.downloads = 0
+
+    async def get_exchange_info(self):
+        self.downloads += 1
+        if self.error:
+            raise self.error
+        return self.payload
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SymbolCache(ttl_seconds=3600)
+    cache.load(exchange_info("BTCUSDT"))
+    monkeypatch.setattr(async_binance_client, "symbol_cache", cache)
+    return cache
+
+
+def lookup_many(client, symbol, times):
+    async def lookups():
+        return [await client.get_symbol_filters(symbol) for _ in range(times)]
+    return asyncio.run(lookups())
+
+
+def test_load_parses_filters(cache):
+    filters = cache.get("BTCUSDT")
+    assert filters.step_size == 0.001
+    assert filters.quantity_precision == 3
+    assert filters.tick_size == 0.01
+    assert filters.min_notional == 5.0
+    assert filters.quantity_on_step(1.23456) == "1.234"
+    assert filters.price_on_tick(100.126) == "100.13"
+
+
+def test_async_miss_downloads_once_per_gap(cache):
+    fake = FakeAsyncClient(payload=exchange_info("BTCUSDT"))
+    client = AsyncBinanceAPIClient(fake)
+
+    assert lookup_many(client, "NEWUSDT", 5) == [None] * 5
+    assert fake.downloads == 1
+
+
+def test_async_miss_finds_newly_listed_symbol(cache):
+    fake = FakeAsyncClient(payload=exchange_info("BTCUSDT", "NEWUSDT"))
+    client = AsyncBinanceAPIClient(fake)
+
+    filters = asyncio.run(client.get_symbol_filters("NEWUSDT"))
+    assert filters is not None and filters.symbol == "NEWUSDT"
+    assert fake.downloads == 1
+    assert cache.get_status()['symbols'] == 2
+
+
+def test_async_miss_failure_backs_off(cache):
+    fake = FakeAsyncClient(error=ConnectionError("exchangeInfo down"))
+    client = AsyncBinanceAPIClient(fake)
+
+    assert lookup_many(client, "NEWUSDT", 5) == [None] * 5
+    assert fake.downloads == 1
+    status = cache.get_status()
+    assert status['refresh_failures'] == 1
+    assert status['retry_delay_seconds'] == SymbolCache.RETRY_BASE_SECONDS
+    assert not cache.miss_refresh_due()
+
+
+def test_concurrent_async_misses_share_one_download(cache):
+    fake = FakeAsyncClient(payload=exchange_info("BTCUSDT"))
+    client = AsyncBinanceAPIClient(fake)
+
+    async def burst():
+        return await asyncio.gather(*(client.get_symbol_filters("NEWUSDT") for _ in range(5)))
+
+    asyncio.run(burst())
+    assert fake.downloads == 1
+
+
+class CountingFetch:
+    """Synchronous exchangeInfo download stand-in."""
+
+    def __init__(self, payload=None, error=None):
+        self.payload = payload
+        self.error = error
+        self.downloads = 0
+
+    def __call__(self):
+        self.downloads += 1
+        if self.error:
+            raise self.error
+        return self.payload
+
+
+def test_miss_refreshes_at_most_once_per_gap(cache):
+    fetch = cache._fetch = CountingFetch(payload=exchange_info("BTCUSDT"))
+
+    assert cache.get("NEWUSDT") is None
+    assert cache.get("NEWUSDT") is None
+    assert fetch.downloads == 1
+
+    # Listed since; found once the gap has passed
+    fetch.payload = exchange_info("BTCUSDT", "NEWUSDT")
+    cache._attempted_at -= SymbolCache.MISS_REFRESH_GAP_SECONDS
+    assert cache.get("NEWUSDT").symbol == "NEWUSDT"
+    assert fetch.downloads == 2
+    assert cache.get("NEWUSDT", refresh_on_miss=False) is not None
+    assert cache.get_status()['hits'] == 1
+
+
+def test_no_download_when_refresh_on_miss_is_off(cache):
+    fetch = cache._fetch = CountingFetch(payload=exchange_info("BTCUSDT", "NEWUSDT"))
+
+    assert cache.get("NEWUSDT", refresh_on_miss=False) is None
+    assert fetch.downloads == 0
+    assert cache.get_status()['misses'] == 1
+
+
+def test_failed_refreshes_back_off_up_to_the_ttl(cache):
+    cache.ttl_seconds = 12
+    fetch = cache._fetch = CountingFetch(error=ConnectionError("exchangeInfo down"))
+
+    delays = []
+    for _ in range(3):
+        assert not cache.refresh()
+        delays.append(cache.get_status()['retry_delay_seconds'])
+    assert delays == [5, 10, 12]
+    assert fetch.downloads == 3
+    # The cached filters keep serving while refreshes fail
+    assert cache.get("BTCUSDT", refresh_on_miss=False) is not None
+
+    # A successful refresh clears the backoff and schedules the next one a TTL out
+    fetch.error = None
+    fetch.payload = exchange_info("BTCUSDT")
+    assert cache.refresh()
+    assert cache.get_status()['retry_delay_seconds'] is None
+    assert cache._next_refresh - cache._loaded_at == pytest.approx(12)
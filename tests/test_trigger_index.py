@@ -0,0 +1,93 @@
+"""TriggerIndex: crossed levels match a brute-force check of every position."""
+
+import random
+
+import pytest
+
+from models import Position
+from trigger_index import TriggerIndex
+
+
+def position(side, stop, target, symbol="BTCUSDT"):
+    return Position.open(symbol, side, 1.0, 100.0, stop, target)
+
+
+def crossed_ids(index, symbol, price):
+    return sorted((p.position_id, exit_type) for p, exit_type in index.crossed(symbol, price))
+
+
+def test_long_and_short_levels_fire_on_the_right_side_inclusive():
+    index = TriggerIndex()
+    long = position("BUY", 99.0, 102.5)
+    short = position("SELL", 101.0, 97.5)
+    index.add(long)
+    index.add(short)
+
+    assert index.crossed("BTCUSDT", 100.0) == []
+    assert crossed_ids(index, "BTCUSDT", 99.0) == [(long.position_id, "STOP_LOSS")]
+    assert crossed_ids(index, "BTCUSDT", 101.0) == [(short.position_id, "STOP_LOSS")]
+    assert crossed_ids(index, "BTCUSDT", 102.5) == sorted([
+        (long.position_id, "TAKE_PROFIT"), (short.position_id, "STOP_LOSS")
+    ])
+    assert crossed_ids(index, "BTCUSDT", 97.0) == sorted([
+        (long.position_id, "STOP_LOSS"), (short.position_id, "TAKE_PROFIT")
+    ])
+    assert index.crossed("ETHUSDT", 1.0) == []
+
+
+def test_removed_positions_no_longer_fire():
+    index = TriggerIndex()
+    first = position("BUY", 99.0, 102.5)
+    second = position("BUY", 99.0, 102.5)  # same levels, different id
+    index.add(first)
+    index.add(second)
+
+    index.remove(first)
+    index.remove(first)  # no-op
+    assert crossed_ids(index, "BTCUSDT", 98.0) == [(second.position_id, "STOP_LOSS")]
+
+    index.remove(second)
+    assert len(index) == 0
+    assert index.symbols() == []
+
+
+def test_matches_brute_force_on_random_books():
+    rng = random.Random(7)
+    index = TriggerIndex()
+    book = []
+    for _ in range(300):
+        side = rng.choice(["BUY", "SELL"])
+        entry = rng.uniform(90, 110)
+        if side == "BUY":
+            p = position(side, entry * 0.99, entry * 1.025, rng.choice(["BTCUSDT", "ETHUSDT"]))
+        else:
+            p = position(side, entry * 1.01, entry * 0.975, rng.choice(["BTCUSDT", "ETHUSDT"]))
+        index.add(p)
+        book.append(p)
+    for p in book[::3]:
+        index.remove(p)
+    live = [p for i, p in enumerate(book) if i % 3]
+
+    for _ in range(200):
+        symbol = rng.choice(["BTCUSDT", "ETHUSDT"])
+        price = rng.uniform(85, 115)
+        expected = []
+        for p in live:
+            if p.symbol != symbol:
+                continue
+            long = p.side == "BUY"
+            if (price <= p.stop_loss_price) if long else (price >= p.stop_loss_price):
+                expected.append((p.position_id, "STOP_LOSS"))
+            if (price >= p.take_profit_price) if long else (price <= p.take_profit_price):
+                expected.append((p.position_id, "TAKE_PROFIT"))
+        assert crossed_ids(index, symbol, price) == sorted(expected)
+
+
+def test_nearest_distance_is_the_closest_level():
+    index = TriggerIndex()
+    index.add(position("BUY", 99.0, 102.5))
+    index.add(position("SELL", 101.5, 97.5))
+
+    assert index.nearest_distance("BTCUSDT", 100.0) == pytest.approx(0.01)
+    assert index.nearest_distance("BTCUSDT", 98.0) < 0  # long stop already crossed
+    assert index.nearest_distance("ETHUSDT", 100.0) is None
@@ -0,0 +1,175 @@
+"""
+Trigger Index - per-symbol sorted stop-loss / take-profit levels.
+Given a new price for a symbol, returns only the positions whose levels were
+crossed (two binary searches per side) instead of testing every open position.
+"""
+
+import bisect
+import threading
+from operator import itemgetter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from models import Position
+
+_level = itemgetter(0)
+
+
+def _first_at_or_above(levels: List[Tuple[float, Hashable]], price: float) -> int:
+    return bisect.bisect_left(levels, price, key=_level)
+
+
+def _past_at_or_below(levels: List[Tuple[float, Hashable]], price: float) -> int:
+    return bisect.bisect_right(levels, price, key=_level)
+
+
+class _SymbolLevels:
+    """
+    Sorted (level, key) lists for one symbol:
+
+        long stops     fire when price <= level  ->  suffix from bisect_left(price)
+        long targets   fire when price >= level  ->  prefix up to bisect_right(price)
+        short stops    fire when price >= level  ->  prefix up to bisect_right(price)
+        short targets  fire when price <= level  ->  suffix from bisect_left(price)
+    """
+
+    __slots__ = ('long_stops', 'long_targets', 'short_stops', 'short_targets')
+
+    def __init__(self):
+        self.long_stops: List[Tuple[float, Hashable]] = []
+        self.long_targets: List[Tuple[float, Hashable]] = []
+        self.short_stops: List[Tuple[float, Hashable]] = []
+        self.short_targets: List[Tuple[float, Hashable]] = []
+
+    def lists_for(self, side: str):
+        """(stop list, target list) for a position side."""
+        if side == "SELL":
+            return self.short_stops, self.short_targets
+        return self.long_stops, self.long_targets
+
+    def __len__(self):
+        return len(self.long_stops) + len(self.short_stops)
+
+
+def _remove(levels: List[Tuple[float, Hashable]], entry: Tuple[float, Hashable]):
+    i = bisect.bisect_left(levels, entry)
+    if i < len(levels) and levels[i] == entry:
+        del levels[i]
+
+
+class TriggerIndex:
+    """Sorted SL/TP levels per symbol, updated incrementally as positions open and close."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, _SymbolLevels] = {}
+        self._positions: Dict[Hashable, Position] = {}
+
+    @staticmethod
+    def position_key(position: Position) -> Hashable:
+        """Identity of a position within the index."""
+        return position.position_id
+
+    def add(self, position: Position):
+        """
+        Index an open position.
+
+        Args:
+            position: Open position
+        """
+        key = self.position_key(position)
+        with self._lock:
+            if key in self._positions:
+                self._remove_locked(key)
+            levels = self._symbols.setdefault(position.symbol, _SymbolLevels())
+            stops, targets = levels.lists_for(position.side)
+            bisect.insort(stops, (position.stop_loss_price, key))
+            bisect.insort(targets, (position.take_profit_price, key))
+            self._positions[key] = position
+
+    def remove(self, position: Position):
+        """Drop a position from the index (no-op if not indexed)."""
+        with self._lock:
+            self._remove_locked(self.position_key(position))
+
+    def _remove_locked(self, key: Hashable):
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        levels = self._symbols[position.symbol]
+        stops, targets = levels.lists_for(position.side)
+        _remove(stops, (position.stop_loss_price, key))
+        _remove(targets, (position.take_profit_price, key))
+        if not len(levels):
+            del self._symbols[position.symbol]
+
+    def clear(self):
+        """Drop every indexed position."""
+        with self._lock:
+            self._symbols.clear()
+            self._positions.clear()
+
+    def crossed(self, symbol: str, price: float) -> List[Tuple[Position, str]]:
+        """
+        Positions whose stop-loss or take-profit is crossed at price.
+
+        Args:
+            symbol: Trading pair
+            price: Latest price
+
+        Returns:
+            List of (position, "STOP_LOSS" | "TAKE_PROFIT")
+        """
+        with self._lock:
+            levels = self._symbols.get(symbol)
+            if levels is None:
+                return []
+
+            long_stops = levels.long_stops[_first_at_or_above(levels.long_stops, price):]
+            short_stops = levels.short_stops[:_past_at_or_below(levels.short_stops, price)]
+            long_targets = levels.long_targets[:_past_at_or_below(levels.long_targets, price)]
+            short_targets = levels.short_targets[_first_at_or_above(levels.short_targets, price):]
+
+            hits: List[Tuple[Hashable, str]] = []
+            hits.extend((key, "STOP_LOSS") for _, key in long_stops + short_stops)
+            hits.extend((key, "TAKE_PROFIT") for _, key in long_targets + short_targets)
+            return [(self._positions[key], exit_type) for key, exit_type in hits]
+
+    def nearest_distance(self, symbol: str, price: float) -> Optional[float]:
+        """
+        Relative distance from price to the closest stop-loss or take-profit on a symbol.
+        O(1): the closest level of each list is at one of its ends.
+
+        Args:
+            symbol: Trading pair
+            price: Latest price
+
+        Returns:
+            min |price - level| / price over the symbol's levels (<= 0 if one is
+            already crossed), or None if the symbol has no positions
+        """
+        with self._lock:
+            levels = self._symbols.get(symbol)
+            if levels is None or price <= 0:
+                return None
+            gaps = []
+            if levels.long_stops:
+                gaps.append(price - levels.long_stops[-1][0])
+            if levels.long_targets:
+                gaps.append(levels.long_targets[0][0] - price)
+            if levels.short_stops:
+                gaps.append(levels.short_stops[0][0] - price)
+            if levels.short_targets:
+                gaps.append(price - levels.short_targets[-1][0])
+            return min(gaps) / price
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one indexed position."""
+        with self._lock:
+            return list(self._symbols)
+
+    def get(self, key: Hashable) -> Optional[Position]:
+        """Indexed position by key, or None."""
+        return self._positions.get(key)
+
+    def __len__(self):
+        return len(self._positions)
@@ -0,0 +1,139 @@
+"""
+WebSocket Stream - reconnecting websocket consumer shared by the streaming caches.
+Runs as a task on the app's event loop when one is running, otherwise on its
+own background thread, so it also works from plain scripts.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional
+
+import websockets
+
+from csv_logger import logger
+
+
+class StreamWorker:
+    """Base class: connect, hand every JSON message to on_message, reconnect on failure."""
+
+    # Seconds to wait before reconnecting (doubles up to the max)
+    RECONNECT_DELAY = 1
+    MAX_RECONNECT_DELAY = 30
+
+    def __init__(self, name: str):
+        """
+        Initialize stream worker.
+
+        Args:
+            name: Label used in log messages
+        """
+        self.name = name
+        self.running = False
+        self.connected = False
+        self.thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ws = None
+
+        self.connects = 0
+        self.messages = 0
+
+    # ----- hooks for subclasses -----
+
+    async def get_url(self) -> str:
+        """Websocket URL to connect to (awaited before every connect; must not block the loop)."""
+        raise NotImplementedError
+
+    async def on_open(self):
+        """Called after every (re)connect, e.g. to send subscriptions."""
+
+    def on_message(self, message: Dict[str, Any]):
+        """Called for every decoded JSON message. Must not block."""
+        raise NotImplementedError
+
+    # ----- lifecycle -----
+
+    def start(self):
+        """Start consuming - on the running event loop if there is one, else on a thread."""
+        if self.running:
+            logger.log_info(f"{self.name} already running")
+            return
+
+        self.running = True
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._task = self._loop.create_task(self._run())
+        except RuntimeError:
+            self.thread = threading.Thread(target=self._thread_main, daemon=True)
+            self.thread.start()
+        logger.log_info(f"{self.name} started")
+
+    def stop(self):
+        """Stop consuming and close the connection."""
+        self.running = False
+        if self._loop and self._task and not self._task.done():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self.thread:
+            self.thread.join(timeout=5)
+        logger.log_info(f"{self.name} stopped")
+
+    def _thread_main(self):
+        """Own event loop for use outside of the app."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._run())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        """Connect/consume/reconnect until stopped."""
+        delay = self.RECONNECT_DELAY
+        while self.running:
+            try:
+                async with websockets.connect(await self.get_url(), ping_interval=20) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    self.connects += 1
+                    delay = self.RECONNECT_DELAY
+                    await self.on_open()
+
+                    async for raw in ws:
+                        self.messages += 1
+                        try:
+                            self.on_message(json.loads(raw))
+                        except Exception as e:
+                            logger.log_error(f"{self.name}: bad message: {e}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                if self.running:
+                    logger.log_error(f"{self.name} disconnected: {e} (retry in {delay}s)")
+            finally:
+                self._ws = None
+                self.connected = False
+
+            if self.running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    # ----- sending -----
+
+    async def send(self, payload: Dict[str, Any]):
+        """Send a JSON payload if connected (dropped otherwise; on_open resends state)."""
+        if self._ws is not None:
+            try:
+                await self._ws.send(json.dumps(payload))
+            except Exception as e:
+                logger.log_error(f"{self.name}: send failed: {e}")
+
+    def send_threadsafe(self, payload: Dict[str, Any]):
+        """Queue a payload for sending from any thread, without waiting."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(
+            lambda: self._loop.create_task(self.send(payload))
+        )